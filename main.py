@@ -8,19 +8,27 @@ with detailed error reporting and validation features.
 
 import sys
 import os
-import tkinter as tk
 from pathlib import Path
 
 # Add the src directory to Python path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-from src.gui.main_window import MainWindow
-
 
 def main():
     """Main entry point for the application."""
+    if len(sys.argv) > 1:
+        # Command line modes (git, ...) run without the GUI
+        from src.cli import main as cli_main
+
+        sys.exit(cli_main(sys.argv[1:]))
+
     try:
+        # Imported here so command line modes start without loading tkinter
+        import tkinter as tk
+
+        from src.gui.main_window import MainWindow
+
         # Create the main tkinter window
         root = tk.Tk()
 
@@ -0,0 +1,580 @@
+"""
+Command line interface for non-interactive conversion modes.
+
+``python main.py`` without arguments starts the GUI; any arguments are
+handled here instead.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from .converter.engine import EXECUTORS, Python2to3Converter
+from .converter.git_source import GitChangeConverter
+from .converter.mirror import MirrorConverter
+from .converter.source_io import read_source, write_source
+from .reporter.logger import ConversionReporter
+
+
+def _make_converter(args, chunk_cache=None) -> Python2to3Converter:
+    """Create a converter from the global command line options."""
+    from .converter.plugins import discover_plugins
+
+    return Python2to3Converter(
+        use_fissix_second_stage=not args.no_fissix,
+        fixer_plugins=discover_plugins(args.fixer_path),
+        chunk_cache=chunk_cache,
+    )
+
+
+def _log_results(
+    reporter: ConversionReporter, converter: Python2to3Converter, results
+) -> int:
+    """Record results in the reporter and return the number of failures."""
+    for result in results:
+        reporter.log_file_conversion(
+            result.file_path, result.success, result.changes_made, result.error
+        )
+
+    if converter.io_metrics:
+        reporter.log_metrics("I/O", converter.io_metrics)
+
+    if converter.executor_metrics:
+        reporter.log_metrics("Executor", converter.executor_metrics)
+
+    fast_lane = converter.get_fast_lane_stats()
+    if fast_lane:
+        reporter.log_metrics(
+            "Fast lane",
+            {
+                "Files converted from tokens": fast_lane["fast_lane"],
+                "Files needing the full engine": fast_lane["full_engine"],
+            },
+        )
+
+    recovery = converter.get_recovery_stats()
+    if recovery["attempted"]:
+        reporter.log_metrics(
+            "Parse recovery",
+            {
+                "Parse failures retried": recovery["attempted"],
+                "Recovered by preprocessing": recovery["recovered"],
+                "Still failing": recovery["still_failing"],
+                "Recovery rate": f"{recovery['recovery_rate']:.1%}",
+            },
+        )
+
+    plugin_timings = converter.get_plugin_timings()
+    if plugin_timings:
+        reporter.log_metrics(
+            "Fixer plugins",
+            {name: f"{seconds:.3f}s" for name, seconds in plugin_timings.items()},
+        )
+
+    reporter.log_completion()
+    return sum(1 for r in results if not r.success)
+
+
+def run_convert(args) -> int:
+    """Convert a directory in place, optionally validating the results."""
+    converter = _make_converter(args)
+    python_files = converter.find_python_files(args.directory)
+
+    reporter = ConversionReporter(args.log_dir)
+    reporter.log_start(args.directory, len(python_files))
+    results = converter.convert_directory(
+        args.directory,
+        not args.no_backup,
+        io_workers=args.io_workers,
+        workers=args.workers,
+        executor=args.executor,
+    )
+
+    invalid = 0
+    if args.validate:
+        from .tester.result_cache import ValidationResultCache
+        from .tester.validator import ConvertedCodeValidator
+
+        result_cache = None if args.no_result_cache else ValidationResultCache()
+        # Validate the converted text already in memory instead of re-reading
+        validator = ConvertedCodeValidator(
+            converter.module_index, result_cache=result_cache
+        )
+        validations = validator.iter_validate_directory(
+            args.directory,
+            converter.get_converted_sources(),
+            workers=args.validate_workers,
+        )
+        # Before the runtime imports, so they load the pycs
+        if args.precompile:
+            from .tester.bytecode import BytecodeCompiler
+
+            validations = list(validations)
+            compiler = BytecodeCompiler(
+                validator.module_cache, max(1, args.validate_workers)
+            )
+            validator.precompile_bytecode(compiler)
+            stats = dict(compiler.stats)
+            stats["compile_time"] = round(stats["compile_time"], 3)
+            reporter.log_metrics("Bytecode", stats)
+
+        if args.runtime_imports:
+            from .tester.runtime_imports import RuntimeImportChecker
+
+            validations = list(validations)
+            with RuntimeImportChecker(
+                max(1, args.validate_workers), timeout=args.import_timeout
+            ) as checker:
+                validator.check_runtime_imports(checker)
+            reporter.log_metrics("Runtime imports", dict(checker.stats))
+
+        for validation in validations:
+            errors = validation.import_errors + validation.builtin_errors
+            if validation.syntax_error:
+                errors.insert(0, validation.syntax_error)
+            if validation.compile_error:
+                errors.append(f"Compile failed: {validation.compile_error}")
+            if validation.import_traceback:
+                last_line = validation.import_traceback.strip().splitlines()[-1]
+                errors.append(f"Runtime import failed: {last_line}")
+            reporter.log_file_validation(
+                validation.file_path, validation.overall_valid, errors
+            )
+        invalid = validator.get_summary()["invalid"]
+        reporter.log_metrics("Parse cache", dict(validator.module_cache.stats))
+        if result_cache is not None:
+            result_cache.close()
+            reporter.log_metrics("Result cache", dict(result_cache.stats))
+
+    failed = _log_results(reporter, converter, results)
+    return 1 if failed or invalid else 0
+
+
+def run_git(args) -> int:
+    """Convert the Python files changed in a revision range or the index."""
+    converter = _make_converter(args)
+    git_converter = GitChangeConverter(args.repo, converter)
+
+    results = git_converter.convert_changes(args.revision_range, args.staged)
+
+    reporter = ConversionReporter(args.log_dir)
+    reporter.log_start(git_converter.repo_dir, len(results))
+    failed = _log_results(reporter, converter, results)
+
+    if args.patch:
+        patch = git_converter.make_patch(results)
+        if args.patch == "-":
+            sys.stdout.write(patch)
+        else:
+            with open(args.patch, "w", encoding="utf-8") as f:
+                f.write(patch)
+    else:
+        git_converter.write_to_worktree(results)
+        for file_path in git_converter.skipped:
+            print(
+                f"{file_path}: not written, the worktree has uncommitted edits",
+                file=sys.stderr,
+            )
+
+    return 1 if failed or git_converter.skipped else 0
+
+
+def run_mirror(args) -> int:
+    """Convert a tree into a separate output directory."""
+    converter = _make_converter(args)
+    mirror = MirrorConverter(converter, max_workers=args.workers, hardlink=not args.copy)
+
+    results = mirror.convert_tree(args.source, args.output)
+
+    reporter = ConversionReporter(args.log_dir)
+    reporter.log_start(args.source, len(results))
+    reporter.log_metrics("Mirror", mirror.stats)
+    failed = _log_results(reporter, converter, results)
+
+    return 1 if failed else 0
+
+
+def run_daemon(args) -> int:
+    """Serve conversion requests on a Unix socket until interrupted."""
+    from .converter.daemon import ConversionDaemon
+    from .converter.plugins import discover_plugins
+
+    daemon = ConversionDaemon(
+        args.socket,
+        workers=args.workers,
+        use_fissix_second_stage=not args.no_fissix,
+        fixer_plugins=discover_plugins(args.fixer_path),
+    )
+    try:
+        daemon.start()
+    except RuntimeError as e:
+        print(f"Cannot start daemon: {e}", file=sys.stderr)
+        return 2
+    print(f"Serving on {daemon.socket_path}", file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_client(args) -> int:
+    """Convert or check files through the daemon (in process if none runs)."""
+    from .converter.daemon import request_conversion
+    from .converter.plugins import discover_plugins
+
+    plugins = discover_plugins(args.fixer_path)
+    exit_code = 0
+    for file_path in args.files:
+        _, source = read_source(file_path)
+
+        response = request_conversion(
+            source.text,
+            os.path.abspath(file_path),
+            args.action,
+            args.socket,
+            use_fissix_second_stage=not args.no_fissix,
+            fixer_plugins=plugins,
+        )
+        if not response["success"]:
+            print(f"{file_path}: {response['error']}", file=sys.stderr)
+            exit_code = 2
+        elif args.action == "check":
+            if response["changes_made"]:
+                print(f"{file_path}: needs conversion")
+                exit_code = max(exit_code, 1)
+        elif args.write:
+            if response["changes_made"]:
+                write_source(file_path, response["output"], source)
+        else:
+            sys.stdout.write(response["output"])
+
+        if args.verbose:
+            source_name = "daemon" if response["daemon"] else "in process"
+            print(
+                f"{file_path}: {response['latency_ms']:.1f} ms ({source_name})",
+                file=sys.stderr,
+            )
+
+    return exit_code
+
+
+def run_check(args) -> int:
+    """Report files that still need conversion without writing anything."""
+    import json
+
+    converter = _make_converter(args)
+    results = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            results.extend(
+                converter.check_directory(path, args.workers, not args.plan)
+            )
+        else:
+            results.append(converter.check_file(path, not args.plan))
+
+    if args.json:
+        plan = converter.get_check_plan(results, args.workers or os.cpu_count() or 1)
+        plan["errors"] = {r.file_path: r.error for r in results if r.error}
+        print(json.dumps(plan, indent=2))
+    else:
+        for result in results:
+            if result.error:
+                print(f"{result.file_path}: error - {result.error}", file=sys.stderr)
+            elif result.needs_conversion:
+                hits = ", ".join(
+                    f"{name} ({count})" if args.plan else name
+                    for name, count in result.fixer_hits.items()
+                )
+                print(f"{result.file_path}: needs conversion - {hits}")
+
+        if args.plan:
+            plan = converter.get_check_plan(
+                results, args.workers or os.cpu_count() or 1
+            )
+            print(
+                f"{plan['files_needing_conversion']} of {plan['files_checked']} "
+                f"files need conversion, estimated "
+                f"{plan['estimated_conversion_seconds']:.1f}s",
+            )
+            for name, count in plan["fixer_hits"].items():
+                print(f"  {name}: {count}")
+
+    if any(r.needs_conversion or r.error for r in results):
+        return 1
+    return 0
+
+
+def run_watch(args) -> int:
+    """Re-convert and re-validate files as they change until interrupted."""
+    import time
+
+    from .converter.incremental import ChunkCache
+    from .converter.watcher import WatchSession
+    from .tester.validator import ConvertedCodeValidator
+
+    def show_result(file_path, result, validation):
+        if not result.success:
+            status = f"failed - {result.error}"
+        elif validation is not None and not validation.overall_valid:
+            status = "converted, invalid"
+        else:
+            status = "converted" if result.changes_made else "no changes"
+        print(f"{os.path.relpath(file_path)}: {status}", flush=True)
+
+    reporter = ConversionReporter(args.log_dir)
+    session = WatchSession(
+        args.directory,
+        _make_converter(args, ChunkCache()),
+        ConvertedCodeValidator(),
+        reporter,
+        on_result=show_result,
+        output_dir=args.output,
+        backup=not args.no_backup,
+        debounce=args.debounce,
+        use_inotify=False if args.poll else None,
+    )
+    reporter.log_start(session.directory, 0)
+
+    session.start()
+    print(
+        f"Watching {session.directory} ({session.watcher.backend_name}), "
+        "press Ctrl+C to stop",
+        file=sys.stderr,
+    )
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        session.stop()
+        reporter.log_completion()
+    return 0
+
+
+def run_smoke(args) -> int:
+    """Generate smoke tests for a directory and run them in parallel."""
+    from .tester.validator import ConversionTestGenerator
+
+    # Kept apart from the project's own tests, which a generated
+    # test_<module>.py could otherwise replace
+    test_dir = args.tests or os.path.join(args.directory, "generated_tests")
+    generator = ConversionTestGenerator()
+    generator.generate_tests_for_directory(args.directory, test_dir)
+
+    exit_code = 0
+    for result in generator.run_smoke_tests(test_dir, args.workers):
+        name = os.path.relpath(result.test_file)
+        if result.status == "unchanged":
+            print(f"{name}: unchanged, skipped", flush=True)
+            continue
+        print(
+            f"{name}: {result.status} ({result.tests_run} tests, "
+            f"{result.duration:.2f}s)",
+            flush=True,
+        )
+        if not result.success:
+            exit_code = 1
+            print(result.output, file=sys.stderr)
+    return exit_code
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cc-py2to3", description="Python 2 to 3 Converter"
+    )
+    parser.add_argument(
+        "--log-dir", default="logs", help="Directory for logs and reports"
+    )
+    parser.add_argument(
+        "--no-fissix",
+        action="store_true",
+        help="Skip the fissix enhancement stage",
+    )
+    parser.add_argument(
+        "--fixer-path",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Directory or fix_*.py file with custom fixers (repeatable)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser(
+        "convert", help="Convert a directory in place (like the GUI)"
+    )
+    convert_parser.add_argument("directory", help="Python 2 source directory")
+    convert_parser.add_argument(
+        "--no-backup", action="store_true", help="Do not create .py2bak files"
+    )
+    convert_parser.add_argument(
+        "--validate", action="store_true", help="Validate the converted files"
+    )
+    convert_parser.add_argument(
+        "--runtime-imports",
+        action="store_true",
+        help="With --validate, also import each module in sandboxed workers",
+    )
+    convert_parser.add_argument(
+        "--no-result-cache",
+        action="store_true",
+        help="Validate every file instead of reusing results of unchanged ones",
+    )
+    convert_parser.add_argument(
+        "--precompile",
+        action="store_true",
+        help="With --validate, also write __pycache__ bytecode",
+    )
+    convert_parser.add_argument(
+        "--import-timeout",
+        type=float,
+        default=10.0,
+        help="Seconds allowed for each runtime import",
+    )
+    convert_parser.add_argument(
+        "--validate-workers",
+        type=int,
+        default=1,
+        help="Validate files on this many worker processes",
+    )
+    convert_parser.add_argument(
+        "--io-workers",
+        type=int,
+        default=8,
+        help="Threads reading files ahead of the converter",
+    )
+    convert_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Convert files on this many worker threads or processes",
+    )
+    convert_parser.add_argument(
+        "--executor",
+        choices=EXECUTORS,
+        default="auto",
+        help="Worker kind; auto uses threads on free-threaded builds",
+    )
+    convert_parser.set_defaults(func=run_convert)
+
+    git_parser = subparsers.add_parser(
+        "git", help="Convert only the Python files changed in git"
+    )
+    source = git_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "revision_range",
+        nargs="?",
+        help="Revision range as accepted by git diff (e.g. main..HEAD)",
+    )
+    source.add_argument(
+        "--staged", action="store_true", help="Convert files staged in the index"
+    )
+    git_parser.add_argument("--repo", default=".", help="Repository directory")
+    git_parser.add_argument(
+        "--patch",
+        metavar="FILE",
+        help="Write a patch instead of updating the worktree ('-' for stdout)",
+    )
+    git_parser.set_defaults(func=run_git)
+
+    mirror_parser = subparsers.add_parser(
+        "mirror", help="Convert into a separate output directory"
+    )
+    mirror_parser.add_argument("source", help="Python 2 source directory")
+    mirror_parser.add_argument("output", help="Output directory for the mirror")
+    mirror_parser.add_argument(
+        "--workers", type=int, default=8, help="Threads used for filesystem work"
+    )
+    mirror_parser.add_argument(
+        "--copy",
+        action="store_true",
+        help="Never hardlink unchanged files (reflink or copy instead)",
+    )
+    mirror_parser.set_defaults(func=run_mirror)
+
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Keep warmed converters in memory behind a Unix socket"
+    )
+    daemon_parser.add_argument("--socket", help="Socket path")
+    daemon_parser.add_argument(
+        "--workers", type=int, default=4, help="Number of warmed converters"
+    )
+    daemon_parser.set_defaults(func=run_daemon)
+
+    client_parser = subparsers.add_parser(
+        "client", help="Convert or check single files through the daemon"
+    )
+    client_parser.add_argument("action", choices=["convert", "check"])
+    client_parser.add_argument("files", nargs="+", help="Python files")
+    client_parser.add_argument("--socket", help="Socket path")
+    client_parser.add_argument(
+        "--write", action="store_true", help="Write converted files in place"
+    )
+    client_parser.add_argument(
+        "--verbose", action="store_true", help="Print per-request latency"
+    )
+    client_parser.set_defaults(func=run_client)
+
+    check_parser = subparsers.add_parser(
+        "check", help="List files that still need conversion (writes nothing)"
+    )
+    check_parser.add_argument("paths", nargs="+", help="Python files or directories")
+    check_parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Count every fixer hit and estimate the conversion time",
+    )
+    check_parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: CPU count)"
+    )
+    check_parser.add_argument(
+        "--json", action="store_true", help="Print the plan as JSON"
+    )
+    check_parser.set_defaults(func=run_check)
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Re-convert and re-validate files as they change"
+    )
+    watch_parser.add_argument("directory", help="Directory to watch")
+    watch_parser.add_argument(
+        "--output", help="Write converted files into this mirror directory"
+    )
+    watch_parser.add_argument(
+        "--no-backup", action="store_true", help="Do not create .py2bak files"
+    )
+    watch_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        help="Seconds to wait for a burst of events to settle",
+    )
+    watch_parser.add_argument(
+        "--poll", action="store_true", help="Poll instead of using inotify"
+    )
+    watch_parser.set_defaults(func=run_watch)
+
+    smoke_parser = subparsers.add_parser(
+        "smoke", help="Generate smoke tests and run them in parallel"
+    )
+    smoke_parser.add_argument("directory", help="Converted source directory")
+    smoke_parser.add_argument(
+        "--tests", help="Test directory (default: DIRECTORY/generated_tests)"
+    )
+    smoke_parser.add_argument(
+        "--workers", type=int, help="Test modules run at once (default: CPU count)"
+    )
+    smoke_parser.set_defaults(func=run_smoke)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a command line conversion mode and return the exit code."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
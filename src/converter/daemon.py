@@ -0,0 +1,280 @@
+"""
+Long-lived conversion daemon for low-latency single-file requests.
+
+Loading the 2to3 and fissix fixers dominates the cost of converting one
+file. The daemon keeps a small pool of warmed converters in memory and
+answers requests on a Unix socket, one JSON object per line:
+
+    {"command": "convert", "source": "...", "path": "module.py"}
+    {"command": "check", "source": "...", "path": "module.py"}
+    {"command": "stats"}
+
+Every response carries ``latency_ms``, the time spent serving the request.
+``request_conversion()`` is the thin client: it talks to the daemon when
+one is running and converts in process otherwise.
+"""
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .incremental import ChunkCache
+
+SOCKET_ENV = "CC_PY2TO3_SOCKET"
+
+
+def default_socket_path() -> str:
+    """Socket path from the environment, or a per-user default."""
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(runtime_dir, f"cc-py2to3-{uid}.sock")
+
+
+def _build_response(converter, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Serve a convert/check request with the given converter."""
+    command = request.get("command", "convert")
+    if command == "check":
+        # Stops at the first fixer that applies; nothing is generated
+        check = converter.check_source(
+            request["source"], request.get("path", "<string>")
+        )
+        return {
+            "success": not check.error,
+            "changes_made": check.needs_conversion,
+            "fixer": next(iter(check.fixer_hits), ""),
+            "error": check.error,
+        }
+
+    result = converter.convert_source(
+        request["source"], request.get("path", "<string>")
+    )
+    return {
+        "success": result.success,
+        "changes_made": result.changes_made,
+        "output": result.output,
+        "error": result.error,
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # A connection may carry any number of requests, one per line
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"success": False, "error": "Invalid JSON request"}
+            else:
+                response = self.server.conversion_daemon.handle_request(request)
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class _ThreadingUnixServer(
+        socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+    ):
+        daemon_threads = True
+
+
+class ConversionDaemon:
+    """Serve conversion requests from a pool of warmed converters."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        workers: int = 4,
+        use_fissix_second_stage: bool = True,
+        fixer_plugins=None,
+    ):
+        self.socket_path = socket_path or default_socket_path()
+        self.workers = workers
+        self.use_fissix_second_stage = use_fissix_second_stage
+        self.fixer_plugins = fixer_plugins
+        self._converters: "queue.Queue" = queue.Queue()
+        # Editors send the same files over and over; share converted chunks
+        self.chunk_cache = ChunkCache()
+        self._server = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+    def _create_converter(self):
+        from .engine import Python2to3Converter
+
+        converter = Python2to3Converter(
+            use_fissix_second_stage=self.use_fissix_second_stage,
+            fixer_plugins=self.fixer_plugins,
+            chunk_cache=self.chunk_cache,
+        )
+        converter.engine.warm_up()
+        return converter
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def start(self):
+        """Warm the converters and bind the socket."""
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise RuntimeError("Unix sockets not supported on this platform")
+        for _ in range(self.workers):
+            self._converters.put(self._create_converter())
+
+        self._remove_stale_socket()
+        self._server = _ThreadingUnixServer(self.socket_path, _RequestHandler)
+        self._server.conversion_daemon = self
+
+    def serve_forever(self):
+        """Start (if needed) and serve until shutdown() is called."""
+        if self._server is None:
+            self.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def serve_in_background(self) -> threading.Thread:
+        """Start serving on a background thread and return it."""
+        if self._server is None:
+            self.start()
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Serve a single decoded request and return the response."""
+        start = time.perf_counter()
+        command = request.get("command", "convert")
+
+        if command in ("convert", "check"):
+            converter = self._converters.get()
+            try:
+                response = _build_response(converter, request)
+            except Exception as e:
+                response = {"success": False, "error": str(e)}
+            finally:
+                self._converters.put(converter)
+        elif command == "stats":
+            response = {"success": True, **self.get_stats()}
+        elif command == "ping":
+            response = {"success": True}
+        else:
+            response = {"success": False, "error": f"Unknown command: {command}"}
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        response["latency_ms"] = round(latency_ms, 3)
+        with self._stats_lock:
+            self._stats["requests"] += 1
+            self._stats["total_ms"] += latency_ms
+            self._stats["max_ms"] = max(self._stats["max_ms"], latency_ms)
+        return response
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get request count and latency statistics."""
+        with self._stats_lock:
+            requests = self._stats["requests"]
+            return {
+                **self.chunk_cache.stats,
+                "requests": requests,
+                "mean_ms": round(self._stats["total_ms"] / requests, 3)
+                if requests
+                else 0.0,
+                "max_ms": round(self._stats["max_ms"], 3),
+            }
+
+
+class DaemonClient:
+    """Send requests to a running ConversionDaemon."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request; raises OSError when no daemon is listening."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        return json.loads(line)
+
+
+# In-process converters, by converter options
+_fallback_converters: Dict[Any, Any] = {}
+
+
+def request_conversion(
+    source: str,
+    path: str = "<string>",
+    command: str = "convert",
+    socket_path: Optional[str] = None,
+    use_fissix_second_stage: bool = True,
+    fixer_plugins=None,
+) -> Dict[str, Any]:
+    """Convert or check source via the daemon, or in process if none is running.
+
+    The converter options are those the daemon was started with; the
+    in-process fallback uses them too. The response has the daemon's
+    format plus ``"daemon": True/False``.
+    """
+    payload = {"command": command, "source": source, "path": path}
+    if hasattr(socket, "AF_UNIX"):
+        try:
+            response = DaemonClient(socket_path).request(payload)
+            response["daemon"] = True
+            return response
+        except OSError:
+            pass
+
+    start = time.perf_counter()
+    plugins = list(fixer_plugins or [])
+    key = (
+        use_fissix_second_stage,
+        tuple((plugin.name, plugin.fixer_class) for plugin in plugins),
+    )
+    converter = _fallback_converters.get(key)
+    if converter is None:
+        from .engine import Python2to3Converter
+
+        converter = Python2to3Converter(
+            use_fissix_second_stage=use_fissix_second_stage,
+            fixer_plugins=plugins,
+        )
+        _fallback_converters[key] = converter
+
+    response = _build_response(converter, payload)
+    response["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    response["daemon"] = False
+    return response
@@ -1,12 +1,26 @@
 import os
 import shutil
-import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Callable
+from typing import Any, List, Dict, Tuple, Optional, Callable
 import tempfile
 import traceback
 
+from .fastlane import FastLaneConverter
+from .incremental import ChunkCache
+from .module_index import ProjectModuleIndex
+from .prefetch import PrefetchedFile, PrefetchingReader
+from .preprocessor import Python2SyntaxPreprocessor
+from .refactoring import RefactoringEngine
+from .shared_buffers import MIN_SEGMENT_SIZE, SharedBufferPool, attach, write_texts
+from .source_io import decode_source, read_source, write_source
+
 
 class ConversionResult:
     def __init__(
@@ -21,7 +35,111 @@ class ConversionResult:
         self.success = success
         self.output = output
         self.error = error
+        self.original_content = original_content
         self.changes_made = bool(output and output.strip() != original_content.strip())
+        # Set when the 2to3 parse only succeeded after recovery preprocessing
+        self.recovered = False
+        # Seconds convert_file() spent on this file
+        self.elapsed = 0.0
+
+
+class CheckResult:
+    """Result of checking whether a file still needs conversion."""
+
+    def __init__(
+        self,
+        file_path: str,
+        fixer_hits: Optional[Dict[str, int]] = None,
+        error: str = "",
+        elapsed: float = 0.0,
+    ):
+        self.file_path = file_path
+        self.fixer_hits = fixer_hits or {}
+        self.error = error
+        self.elapsed = elapsed
+        self.needs_conversion = bool(self.fixer_hits)
+
+
+# Exceptions of the 2to3 parse step that recovery preprocessing may fix
+_PARSE_ERRORS = ("ParseError", "TokenError", "IndentationError", "TabError")
+
+
+# Executor choices for convert_directory(); "auto" picks threads only on a
+# free-threaded build
+EXECUTORS = ("auto", "thread", "process")
+
+
+def is_free_threaded() -> bool:
+    """Whether this is a free-threaded CPython build running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def resolve_executor(executor: str) -> str:
+    """Map an executor choice to "thread" or "process"."""
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}, use one of {EXECUTORS}")
+    if executor == "auto":
+        return "thread" if is_free_threaded() else "process"
+    return executor
+
+
+# Converter of a conversion worker process, or of each worker thread
+_conversion_worker = threading.local()
+
+
+def _init_conversion_worker(options: Dict[str, Any], module_index):
+    _conversion_worker.converter = Python2to3Converter(**options)
+    _conversion_worker.converter.set_module_index(module_index)
+
+
+def _convert_file_in_worker(
+    file_path: str, backup: bool
+) -> Tuple[ConversionResult, Dict[str, float]]:
+    """Convert a file and return the result and the counters it added."""
+    converter = _conversion_worker.converter
+    before = converter._get_counters()
+    result = converter.convert_file(file_path, backup)
+    after = converter._get_counters()
+    return result, {key: after[key] - before.get(key, 0) for key in after}
+
+
+def _convert_file_to_segment(file_path: str, backup: bool, segment_name: str):
+    """Like _convert_file_in_worker, but return the texts in shared memory.
+
+    The third item is the layout of the output and original content in the
+    segment, or None when they did not fit and are returned inline.
+    """
+    result, counters = _convert_file_in_worker(file_path, backup)
+    texts = [result.output, result.original_content]
+    layout = write_texts(attach(segment_name), texts)
+    if layout is not None:
+        result.output = result.original_content = ""
+    return result, counters, layout
+
+
+def _segment_size(file_path: str) -> int:
+    """Shared memory for a file's output and original content, both as UTF-8."""
+    try:
+        return 3 * os.path.getsize(file_path) + MIN_SEGMENT_SIZE
+    except OSError:
+        return MIN_SEGMENT_SIZE
+
+
+# Converter of a check worker process, created by _init_check_worker
+_worker_converter = None
+
+
+def _init_check_worker(use_fissix_second_stage: bool, fixer_plugins, module_index):
+    global _worker_converter
+    _worker_converter = Python2to3Converter(
+        use_fissix_second_stage=use_fissix_second_stage, fixer_plugins=fixer_plugins
+    )
+    _worker_converter.set_module_index(module_index)
+
+
+def _check_file_in_worker(file_path: str, stop_at_first_hit: bool) -> CheckResult:
+    return _worker_converter.check_file(file_path, stop_at_first_hit)
 
 
 class Python2to3Converter:
@@ -29,15 +147,45 @@ class Python2to3Converter:
         self,
         progress_callback: Optional[Callable[[str, float], None]] = None,
         use_fissix_second_stage: bool = True,
+        fixer_plugins: Optional[List] = None,
+        chunk_cache: Optional[ChunkCache] = None,
+        fast_lane: bool = True,
+        parse_recovery: bool = True,
     ):
         self.progress_callback = progress_callback
         self.conversion_results: List[ConversionResult] = []
+        self.io_metrics: Dict[str, str] = {}
+        self.executor_metrics: Dict[str, Any] = {}
         self.use_fissix_second_stage = use_fissix_second_stage
+        self.fixer_plugins = fixer_plugins
+        self.engine = RefactoringEngine(
+            use_fissix_second_stage, fixer_plugins, chunk_cache
+        )
+        self.module_index: Optional[ProjectModuleIndex] = None
+        # Token-level conversion of files that only need mechanical fixes;
+        # plugin fixers may match anything, so they always get the full engine
+        self.fast_lane: Optional[FastLaneConverter] = None
+        if fast_lane and not fixer_plugins:
+            self.fast_lane = FastLaneConverter(
+                use_fissix_second_stage, self.engine.probably_a_local_import
+            )
+        # Retries files 2to3 cannot parse after the wider preprocessor rewrites
+        self.recovery_preprocessor: Optional[Python2SyntaxPreprocessor] = None
+        if parse_recovery:
+            self.recovery_preprocessor = Python2SyntaxPreprocessor()
+        self.recovery_stats = {"attempted": 0, "recovered": 0}
 
     def find_python_files(self, directory: str) -> List[str]:
-        """Find all Python files in directory recursively."""
+        """Find all Python files in directory recursively.
+
+        The same walk builds ``module_index``, which the import fixer and
+        the validator use instead of probing the filesystem.
+        """
         python_files = []
+        module_index = ProjectModuleIndex(directory)
         for root, dirs, files in os.walk(directory):
+            module_index.add_directory(root, dirs, files)
+
             # Skip common non-source directories
             dirs[:] = [
                 d
@@ -49,242 +197,374 @@ class Python2to3Converter:
                 if file.endswith(".py"):
                     python_files.append(os.path.join(root, file))
 
+        self.set_module_index(module_index)
         return python_files
 
-    def convert_file(self, file_path: str, backup: bool = True) -> ConversionResult:
-        """Convert a single Python file from Python 2 to 3."""
+    def convert_file(
+        self,
+        file_path: str,
+        backup: bool = True,
+        prefetched: Optional[PrefetchedFile] = None,
+    ) -> ConversionResult:
+        """Convert a single Python file from Python 2 to 3.
+
+        The file is read once as bytes and decoded with its PEP 263 encoding;
+        converted files are written back in that encoding with their
+        original line endings. ``prefetched`` holds the bytes and stat when
+        the file was already read by a ``PrefetchingReader``.
+        """
+        original_content = ""
+        start = time.perf_counter()
         try:
-            # Read original content for change detection
-            with open(file_path, "r", encoding="utf-8") as f:
-                original_content = f.read()
+            if prefetched is not None:
+                if prefetched.error is not None:
+                    raise prefetched.error
+                data, stat = prefetched.data, prefetched.stat
+            else:
+                with open(file_path, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    data = f.read()
+
+            source = decode_source(data)
+            original_content = source.text
 
             # Create backup if requested
             if backup:
-                backup_path = f"{file_path}.py2bak"
-                shutil.copy2(file_path, backup_path)
+                self._write_backup(f"{file_path}.py2bak", data, stat)
 
-            # Stage 1: Use 2to3 for core conversion
-            result_2to3 = self._convert_with_2to3(file_path, original_content)
-            if not result_2to3.success:
-                return result_2to3
+            result = self.convert_source(original_content, file_path)
 
-            # Stage 2: Use fissix for enhanced conversion (cmp parameter fix)
-            if self.use_fissix_second_stage:
-                result_fissix = self._convert_with_fissix(file_path, original_content)
-                if result_fissix.success:
-                    # Fissix successful, return its result
-                    return result_fissix
-                else:
-                    # Fissix failed, but 2to3 worked, so return 2to3 result with warning
-                    warning_msg = f"2to3 succeeded but fissix enhancement failed: {result_fissix.error}"
-                    return ConversionResult(
-                        file_path,
-                        True,
-                        result_2to3.output,
-                        warning_msg,
-                        original_content,
-                    )
+            if result.success and result.output != original_content:
+                write_source(file_path, result.output, source)
 
-            return result_2to3
+            result.elapsed = time.perf_counter() - start
+            return result
 
         except Exception as e:
-            # Try to read original content for the error case
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    original_content = f.read()
-            except Exception:
-                original_content = ""
-
             error_msg = (
                 f"Error converting {file_path}: {str(e)}\n{traceback.format_exc()}"
             )
             return ConversionResult(file_path, False, "", error_msg, original_content)
 
-    def _convert_with_2to3(
-        self, file_path: str, original_content: str = ""
+    @staticmethod
+    def _write_backup(backup_path: str, data: bytes, stat: os.stat_result):
+        """Write a backup from bytes already read, keeping mode and times."""
+        with open(backup_path, "wb") as f:
+            f.write(data)
+        os.chmod(backup_path, stat.st_mode & 0o7777)
+        os.utime(backup_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    def convert_source(
+        self, source: str, file_path: str = "<string>"
     ) -> ConversionResult:
-        """Convert file using standalone 2to3 tool."""
-        try:
-            # Read original content if not provided
-            if not original_content:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    original_content = f.read()
-
-            # Find the 2to3 executable
-            import shutil as sh
-            import platform
-
-            tool_2to3 = sh.which("2to3")
-            if not tool_2to3:
-                # Try Windows executable name
-                tool_2to3 = sh.which("2to3.exe")
-
-            if not tool_2to3:
-                # Try to find it in common Python installation paths
-                system = platform.system().lower()
-                if system == "windows":
-                    # Windows paths
-                    import sys
-
-                    python_dir = os.path.dirname(sys.executable)
-                    possible_paths = [
-                        os.path.join(python_dir, "Scripts", "2to3.exe"),
-                        os.path.join(python_dir, "Tools", "scripts", "2to3.py"),
-                        r"C:\Python*\Scripts\2to3.exe",
-                        r"C:\Python*\Tools\scripts\2to3.py",
-                    ]
-                else:
-                    # Unix/Linux/macOS paths
-                    possible_paths = [
-                        "/Library/Frameworks/Python.framework/Versions/3.11/bin/2to3",
-                        "/usr/bin/2to3",
-                        "/usr/local/bin/2to3",
-                    ]
-
-                for path in possible_paths:
-                    if "*" in path:
-                        # Handle wildcard paths for Windows
-                        import glob
-
-                        matches = glob.glob(path)
-                        if matches:
-                            tool_2to3 = matches[0]
-                            break
-                    elif os.path.exists(path):
-                        tool_2to3 = path
-                        break
-
-                if not tool_2to3:
-                    # Last resort: try to find lib2to3 directly
-                    try:
-                        import lib2to3.main
-
-                        tool_2to3 = "lib2to3.main"
-                    except ImportError:
-                        # Debug information for troubleshooting
-                        debug_info = f"Python executable: {sys.executable}\n"
-                        debug_info += (
-                            f"Python directory: {os.path.dirname(sys.executable)}\n"
-                        )
-                        debug_info += f"System: {platform.system()}\n"
-
-                        raise RuntimeError(
-                            f"Could not find 2to3 tool. Debug info:\n{debug_info}\n"
-                            "Please ensure Python is properly installed with the standard library tools."
-                        )
-
-            # Build command
-            if tool_2to3 == "lib2to3.main":
-                # Use lib2to3 directly through Python
-                cmd = [
-                    sys.executable,
-                    "-m",
-                    "lib2to3",
-                    "-w",
-                    "--no-diffs",
-                    os.path.abspath(file_path),
-                ]
-            elif tool_2to3.endswith(".py"):
-                cmd = [
-                    sys.executable,
-                    tool_2to3,
-                    "-w",
-                    "--no-diffs",
-                    os.path.abspath(file_path),
-                ]
+        """Convert Python 2 source in memory using the in-process engine.
+
+        Files the fast lane can handle skip the lib2to3 trees; the result is
+        the same.
+        """
+        if self.fast_lane is not None:
+            converted = self.fast_lane.convert(source, file_path)
+            if converted is not None:
+                output, stage_two_error = converted
+                warning = ""
+                if stage_two_error:
+                    warning = (
+                        "2to3 succeeded but fissix enhancement failed: "
+                        f"fissix conversion error: {stage_two_error}"
+                    )
+                return ConversionResult(file_path, True, output, warning, source)
+
+        # Stage 1: Use 2to3 for core conversion
+        result_2to3 = self._convert_with_2to3(file_path, source)
+        if not result_2to3.success:
+            result_2to3 = self._recover_parse_error(file_path, source, result_2to3)
+            if not result_2to3.success:
+                return result_2to3
+        print_function = result_2to3.recovered
+
+        # Stage 2: Use fissix for enhanced conversion (cmp parameter fix)
+        if self.use_fissix_second_stage:
+            result_fissix = self._convert_with_fissix(
+                file_path, source, result_2to3.output, print_function
+            )
+            if result_fissix.success:
+                # Fissix successful, return its result
+                result_fissix.error = result_2to3.error
+                result_fissix.recovered = result_2to3.recovered
+                return result_fissix
             else:
-                cmd = [tool_2to3, "-w", "--no-diffs", os.path.abspath(file_path)]
+                # Fissix failed, but 2to3 worked, so return 2to3 result with warning
+                warning_msg = f"2to3 succeeded but fissix enhancement failed: {result_fissix.error}"
+                if result_2to3.error:
+                    warning_msg = f"{result_2to3.error}; {warning_msg}"
+                result = ConversionResult(
+                    file_path,
+                    True,
+                    result_2to3.output,
+                    warning_msg,
+                    source,
+                )
+                result.recovered = result_2to3.recovered
+                return result
+
+        return result_2to3
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
+    def _recover_parse_error(
+        self, file_path: str, source: str, failed: ConversionResult
+    ) -> ConversionResult:
+        """Retry a 2to3 parse failure once on the recovery-preprocessed source.
+
+        The preprocessor rewrites every print statement (and exec, backquote,
+        ``raise E, V``, old octal and mixed-tab syntax) in memory, so the
+        retry parses without the print statement, which also accepts print
+        calls with keyword arguments. Other failures are returned as is.
+        """
+        if self.recovery_preprocessor is None or not failed.error.startswith(
+            tuple(f"2to3 conversion error: {name}:" for name in _PARSE_ERRORS)
+        ):
+            return failed
+
+        self.recovery_stats["attempted"] += 1
+        try:
+            preprocessed = self.recovery_preprocessor.recover(source)
+            output = self.engine.refactor_stage_one(
+                preprocessed, file_path, print_function=True
             )
+        except Exception as e:
+            failed.error += f" (recovery failed: {e.__class__.__name__}: {str(e)})"
+            return failed
+
+        self.recovery_stats["recovered"] += 1
+        result = ConversionResult(
+            file_path,
+            True,
+            output,
+            f"Recovered from {failed.error} by preprocessing",
+            source,
+        )
+        result.recovered = True
+        return result
 
-            if result.returncode != 0:
-                # Handle errors
-                error_msg = f"2to3 failed: {result.stderr}"
-                return ConversionResult(
-                    file_path, False, "", error_msg, original_content
-                )
+    def _convert_with_2to3(
+        self, file_path: str, original_content: Optional[str] = None
+    ) -> ConversionResult:
+        """Run the 2to3 stage with the in-process engine."""
+        try:
+            # Read original content if not provided
+            if original_content is None:
+                original_content = read_source(file_path)[1].text
 
-            # Read converted content
-            with open(file_path, "r", encoding="utf-8") as f:
-                converted_content = f.read()
+            converted_content = self.engine.refactor_stage_one(
+                original_content, file_path
+            )
 
             return ConversionResult(
                 file_path, True, converted_content, "", original_content
             )
 
         except Exception as e:
-            error_msg = f"2to3 conversion error: {str(e)}"
-            return ConversionResult(file_path, False, "", error_msg, original_content)
+            error_msg = f"2to3 conversion error: {e.__class__.__name__}: {str(e)}"
+            return ConversionResult(
+                file_path, False, "", error_msg, original_content or ""
+            )
 
     def _convert_with_fissix(
-        self, file_path: str, original_content: str = ""
+        self,
+        file_path: str,
+        original_content: Optional[str] = None,
+        stage_one_output: Optional[str] = None,
+        print_function: bool = False,
     ) -> ConversionResult:
-        """Convert file using fissix tool for enhanced conversion."""
+        """Run the fissix stage (including plugin fixers) in process.
+
+        The fissix stage refactors the 2to3 output when it is given, and the
+        original content otherwise; changes are always measured against the
+        original content. ``print_function`` parses without the print
+        statement, as for recovered files.
+        """
         try:
             # Read original content if not provided
-            if not original_content:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    original_content = f.read()
-
-            # Use the current Python environment to run fissix
-            python_executable = sys.executable
-
-            cmd = [
-                python_executable,
-                "-m",
-                "fissix",
-                "-w",
-                "--no-diffs",
-                os.path.abspath(file_path),
-            ]
+            if original_content is None:
+                original_content = read_source(file_path)[1].text
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
+            source = (
+                original_content if stage_one_output is None else stage_one_output
+            )
+            converted_content = self.engine.refactor_stage_two(
+                source, file_path, print_function
             )
-
-            if result.returncode != 0:
-                # Handle errors
-                error_msg = f"fissix failed: {result.stderr}"
-                return ConversionResult(
-                    file_path, False, "", error_msg, original_content
-                )
-
-            # Read converted content
-            with open(file_path, "r", encoding="utf-8") as f:
-                converted_content = f.read()
 
             return ConversionResult(
                 file_path, True, converted_content, "", original_content
             )
 
         except Exception as e:
-            error_msg = f"fissix conversion error: {str(e)}"
-            return ConversionResult(file_path, False, "", error_msg, original_content)
+            error_msg = f"fissix conversion error: {e.__class__.__name__}: {str(e)}"
+            return ConversionResult(
+                file_path, False, "", error_msg, original_content or ""
+            )
 
-    def convert_directory(
-        self, directory: str, backup: bool = True
-    ) -> List[ConversionResult]:
-        """Convert all Python files in a directory."""
-        python_files = self.find_python_files(directory)
-        results = []
+    def set_module_index(self, module_index: Optional[ProjectModuleIndex]):
+        """Use module_index for import decisions (None probes the disk)."""
+        self.module_index = module_index
+        self.engine.module_index = module_index
 
-        total_files = len(python_files)
+    def check_source(
+        self, source: str, file_path: str = "<string>", stop_at_first_hit: bool = True
+    ) -> CheckResult:
+        """Check whether source needs conversion without producing output.
 
-        for i, file_path in enumerate(python_files):
-            if self.progress_callback:
-                progress = (i / total_files) * 100
-                self.progress_callback(
-                    f"Converting {os.path.basename(file_path)}", progress
+        By default this stops at the first fixer that would change anything;
+        with ``stop_at_first_hit=False`` every fixer hit is counted.
+        """
+        start = time.perf_counter()
+        try:
+            hits = self.engine.count_fixer_hits(source, file_path, stop_at_first_hit)
+        except Exception as e:
+            hits = self._recover_check(source, file_path, stop_at_first_hit, e)
+            if hits is None:
+                return CheckResult(
+                    file_path,
+                    error=f"2to3 conversion error: {e.__class__.__name__}: {str(e)}",
+                    elapsed=time.perf_counter() - start,
                 )
+        return CheckResult(file_path, hits, elapsed=time.perf_counter() - start)
+
+    def _recover_check(
+        self, source: str, file_path: str, stop_at_first_hit: bool, error: Exception
+    ) -> Optional[Dict[str, int]]:
+        """Count fixer hits on a parse failure the way conversion recovers it.
+
+        Like ``_recover_parse_error`` this parses the recovery-preprocessed
+        source without the print statement, so already converted code such
+        as ``print(x, end="")`` passes. Rewrites made by the preprocessor
+        count as a ``recovery_preprocessor`` hit. Returns None if the
+        failure cannot be recovered.
+        """
+        if (
+            self.recovery_preprocessor is None
+            or error.__class__.__name__ not in _PARSE_ERRORS
+        ):
+            return None
+        try:
+            preprocessed = self.recovery_preprocessor.recover(source)
+            hits = self.engine.count_fixer_hits(
+                preprocessed, file_path, stop_at_first_hit, print_function=True
+            )
+        except Exception:
+            return None
+        if preprocessed != source:
+            hits = {"recovery_preprocessor": 1, **hits}
+        return hits
+
+    def check_file(self, file_path: str, stop_at_first_hit: bool = True) -> CheckResult:
+        """Check a single file; nothing is written."""
+        try:
+            source = read_source(file_path)[1].text
+        except Exception as e:
+            return CheckResult(file_path, error=f"Error reading {file_path}: {e}")
+        return self.check_source(source, file_path, stop_at_first_hit)
+
+    def check_directory(
+        self,
+        directory: str,
+        workers: Optional[int] = None,
+        stop_at_first_hit: bool = True,
+    ) -> List[CheckResult]:
+        """Check all Python files in a directory, in parallel worker processes."""
+        python_files = self.find_python_files(directory)
+        workers = workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(python_files) < 2:
+            return [self.check_file(f, stop_at_first_hit) for f in python_files]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_check_worker,
+            initargs=(
+                self.use_fissix_second_stage,
+                self.fixer_plugins,
+                self.module_index,
+            ),
+        ) as pool:
+            return list(
+                pool.map(
+                    partial(_check_file_in_worker, stop_at_first_hit=stop_at_first_hit),
+                    python_files,
+                    chunksize=max(1, len(python_files) // (workers * 4)),
+                )
+            )
 
-            result = self.convert_file(file_path, backup)
-            results.append(result)
+    @staticmethod
+    def get_check_plan(results: List[CheckResult], workers: int = 1) -> Dict[str, Any]:
+        """Summarize check results as a conversion plan.
+
+        Conversion time is estimated from the time spent checking the files
+        that need conversion, which is only accurate for results collected
+        with ``stop_at_first_hit=False``.
+        """
+        needing = [r for r in results if r.needs_conversion]
+        fixer_hits: Dict[str, int] = {}
+        for result in needing:
+            for name, count in result.fixer_hits.items():
+                fixer_hits[name] = fixer_hits.get(name, 0) + count
+
+        return {
+            "files_checked": len(results),
+            "files_needing_conversion": len(needing),
+            "files_with_errors": sum(1 for r in results if r.error),
+            "fixer_hits": dict(
+                sorted(fixer_hits.items(), key=lambda item: item[1], reverse=True)
+            ),
+            "estimated_conversion_seconds": round(
+                sum(r.elapsed for r in needing) / max(1, workers), 2
+            ),
+            "files": {r.file_path: r.fixer_hits for r in needing},
+        }
+
+    def convert_directory(
+        self,
+        directory: str,
+        backup: bool = True,
+        io_workers: int = 8,
+        workers: int = 1,
+        executor: str = "auto",
+    ) -> List[ConversionResult]:
+        """Convert all Python files in a directory.
+
+        With one worker, files are read ahead on ``io_workers`` threads while
+        the current file is converted; the I/O statistics end up in
+        ``io_metrics``. With more, files are converted on a pool of
+        ``workers`` threads or processes (see ``resolve_executor``), each
+        with its own refactoring tools. ``executor_metrics`` holds the
+        executor used and the measured speedup.
+        """
+        python_files = self.find_python_files(directory)
+        start = time.perf_counter()
+
+        transfer_metrics: Dict[str, Any] = {}
+        if workers > 1 and len(python_files) > 1:
+            kind = resolve_executor(executor)
+            results, transfer_metrics = self._convert_files_in_pool(
+                python_files, backup, workers, kind
+            )
+        else:
+            kind, workers = "serial", 1
+            results = self._convert_files_serially(python_files, backup, io_workers)
+
+        wall_time = time.perf_counter() - start
+        busy_time = sum(r.elapsed for r in results)
+        speedup = busy_time / wall_time if wall_time else 1.0
+        self.executor_metrics = {
+            "Executor": kind,
+            "Free-threaded build": is_free_threaded(),
+            "Workers": workers,
+            "Wall time": f"{wall_time:.2f}s",
+            "Conversion time": f"{busy_time:.2f}s",
+            "Speedup": f"{speedup:.2f}x",
+            "Efficiency": f"{speedup / workers:.0%}",
+            **transfer_metrics,
+        }
 
         if self.progress_callback:
             self.progress_callback("Conversion complete", 100)
@@ -292,6 +572,132 @@ class Python2to3Converter:
         self.conversion_results = results
         return results
 
+    def _report_progress(self, file_path: str, done: int, total: int):
+        if self.progress_callback:
+            self.progress_callback(
+                f"Converting {os.path.basename(file_path)}", (done / total) * 100
+            )
+
+    def _convert_files_serially(
+        self, python_files: List[str], backup: bool, io_workers: int
+    ) -> List[ConversionResult]:
+        results = []
+        with PrefetchingReader(python_files, max_workers=io_workers) as reader:
+            for i, prefetched in enumerate(reader):
+                self._report_progress(prefetched.path, i, len(python_files))
+                results.append(self.convert_file(prefetched.path, backup, prefetched))
+
+        self.io_metrics = reader.get_metrics()
+        return results
+
+    def _convert_files_in_pool(
+        self, python_files: List[str], backup: bool, workers: int, kind: str
+    ) -> Tuple[List[ConversionResult], Dict[str, Any]]:
+        """Convert files on worker threads or processes, in input order.
+
+        Workers read and write the files themselves; their fast-lane,
+        recovery and plugin counters are added to this converter's. Process
+        workers hand back the converted and original text in recycled
+        shared memory segments (see ``shared_buffers.py``) instead of
+        pickling them, so at most ``2 * workers`` files are in flight.
+        Returns the results and the shared memory statistics.
+        """
+        options = {
+            "use_fissix_second_stage": self.use_fissix_second_stage,
+            "fixer_plugins": self.fixer_plugins,
+            "fast_lane": self.fast_lane is not None,
+            "parse_recovery": self.recovery_preprocessor is not None,
+        }
+        if kind == "thread":
+            results = []
+            with ThreadPoolExecutor(
+                max_workers=workers,
+                initializer=_init_conversion_worker,
+                initargs=(options, self.module_index),
+            ) as pool:
+                converted = pool.map(
+                    partial(_convert_file_in_worker, backup=backup), python_files
+                )
+                for i, (result, counters) in enumerate(converted):
+                    self._report_progress(result.file_path, i, len(python_files))
+                    self._add_counters(counters)
+                    results.append(result)
+            return results, {}
+
+        results = []
+        # Created first so the workers share its resource tracker
+        with SharedBufferPool() as buffers, ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_conversion_worker,
+            initargs=(options, self.module_index),
+        ) as pool:
+
+            def submit(file_path: str):
+                segment = buffers.lease(_segment_size(file_path))
+                future = pool.submit(
+                    _convert_file_to_segment, file_path, backup, segment.name
+                )
+                return future, segment
+
+            files = iter(python_files)
+            pending = deque(submit(f) for f in islice(files, 2 * workers))
+            while pending:
+                future, segment = pending.popleft()
+                result, counters, layout = future.result()
+                if layout is None:
+                    buffers.stats["inline"] += 1
+                else:
+                    texts = buffers.read_texts(segment, layout)
+                    result.output, result.original_content = texts
+                buffers.release(segment)
+
+                next_file = next(files, None)
+                if next_file is not None:
+                    pending.append(submit(next_file))
+
+                self._report_progress(result.file_path, len(results), len(python_files))
+                self._add_counters(counters)
+                results.append(result)
+
+        return results, {
+            "Shared memory segments": buffers.stats["created"],
+            "Segment reuses": buffers.stats["reused"],
+            "Shared memory transfer": f"{buffers.stats['bytes_shared'] / 1e6:.1f}MB",
+            "Inline transfers": buffers.stats["inline"],
+        }
+
+    def _get_counters(self) -> Dict[str, float]:
+        """Fast-lane, recovery and plugin counters as one flat dict."""
+        counters: Dict[str, float] = {}
+        if self.fast_lane is not None:
+            counters.update(self.fast_lane.stats)
+        for key, value in self.recovery_stats.items():
+            counters[f"recovery:{key}"] = value
+        for name, seconds in self.engine.plugin_timings.items():
+            counters[f"plugin:{name}"] = seconds
+        return counters
+
+    def _add_counters(self, counters: Dict[str, float]):
+        """Add counters collected by a worker (see ``_get_counters``)."""
+        for key, value in counters.items():
+            if key.startswith("recovery:"):
+                self.recovery_stats[key[len("recovery:") :]] += value
+            elif key.startswith("plugin:"):
+                name = key[len("plugin:") :]
+                timings = self.engine.plugin_timings
+                timings[name] = timings.get(name, 0.0) + value
+            elif self.fast_lane is not None:
+                self.fast_lane.stats[key] += value
+
+    def get_converted_sources(self) -> Dict[str, str]:
+        """Converted text of each successful result, keyed by file path.
+
+        The validator takes this instead of reading the files back.
+        """
+        return {
+            r.file_path: r.output for r in self.conversion_results if r.success
+        }
+
     def get_summary(self) -> Dict[str, int]:
         """Get summary statistics of the conversion."""
         total = len(self.conversion_results)
@@ -309,6 +715,27 @@ class Python2to3Converter:
             "unchanged": successful - modified,
         }
 
+    def get_fast_lane_stats(self) -> Dict[str, int]:
+        """Files converted by the fast lane and by the full engine so far."""
+        if self.fast_lane is None:
+            return {}
+        return dict(self.fast_lane.stats)
+
+    def get_recovery_stats(self) -> Dict[str, Any]:
+        """Parse failures retried after recovery preprocessing, and the outcome."""
+        attempted = self.recovery_stats["attempted"]
+        recovered = self.recovery_stats["recovered"]
+        return {
+            "attempted": attempted,
+            "recovered": recovered,
+            "still_failing": attempted - recovered,
+            "recovery_rate": round(recovered / attempted, 3) if attempted else 0.0,
+        }
+
+    def get_plugin_timings(self) -> Dict[str, float]:
+        """Get the seconds spent in each custom fixer plugin so far."""
+        return dict(self.engine.plugin_timings)
+
     def get_failed_conversions(self) -> List[ConversionResult]:
         """Get list of files that failed to convert."""
         return [r for r in self.conversion_results if not r.success]
@@ -0,0 +1,791 @@
+"""
+Token-stream fast lane for files that only need mechanical fixes.
+
+Most files only need print statements, ``except X, e``, ``has_key()``,
+``iteritems()``/``iterkeys()``/``itervalues()``, ``u""``/``ur""`` literals
+and ``<>`` rewritten. ``FastLaneConverter`` does that in one pass over the
+``tokenize`` stream instead of parsing the file into a lib2to3 tree twice.
+
+The output is meant to be identical to the two-stage engine, quirks
+included (stage two wraps ``print(x.y)`` as ``print((x.y))`` and
+``iter(d.items())`` as ``iter(list(d.items()))``, and cannot parse stage-one
+output with ``end=``/``file=`` arguments). A file takes the fast lane only
+when the trigger scan finds nothing else a fixer could act on and every
+occurrence of a fast-lane pattern is in a context the rewriter knows;
+otherwise ``convert()`` returns None and the full engine converts it. The
+rewritten text must also parse as Python 3.
+"""
+
+import ast
+import io
+import keyword
+import tokenize
+import warnings
+from functools import lru_cache
+from token import EQUAL
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from .preprocessor import Python2SyntaxPreprocessor
+
+# Names some fixer outside the fast lane matches on (or might)
+_TRIGGER_NAMES = {
+    "__future__", "__metaclass__", "__nonzero__", "apply", "basestring",
+    "exec", "execfile", "exitfunc", "filter", "getcwdu", "input", "intern",
+    "isinstance", "items", "keys", "values", "viewitems", "viewkeys",
+    "viewvalues", "long", "map", "next", "range", "raw_input", "reduce",
+    "reload", "sort", "sorted", "StandardError", "throw", "unichr",
+    "unicode", "xrange", "xreadlines", "zip", "maxint", "exc_type",
+    "exc_value", "exc_traceback", "im_func", "im_self", "im_class",
+    "func_closure", "func_code", "func_defaults", "func_dict", "func_doc",
+    "func_globals", "func_name", "isCallable", "sequenceIncludes",
+    "isSequenceType", "isMappingType", "isNumberType", "repeat", "irepeat",
+    "imap", "ifilter", "ifilterfalse", "izip", "izip_longest",
+    # Python 3 syntax the lib2to3 grammar rejects
+    "nonlocal", "async", "await",
+}  # fmt: skip
+
+# Builtins whose fixers only match calls of the bare name, not attributes
+_BUILTIN_CALLS = {
+    "apply", "execfile", "filter", "input", "intern", "isinstance", "long",
+    "map", "range", "raw_input", "reduce", "reload", "xrange", "zip",
+}  # fmt: skip
+
+_ITER_METHODS = {"iteritems": "items", "iterkeys": "keys", "itervalues": "values"}
+
+# fixer_util.consuming_calls; fix_dict leaves d.keys() alone in these
+_CONSUMING_CALLS = {
+    "sorted", "list", "set", "any", "all", "tuple", "sum", "min", "max",
+    "enumerate",
+}  # fmt: skip
+
+_COMPOUND_KEYWORDS = {
+    "if", "elif", "else", "for", "while", "try", "except", "finally", "with",
+    "def", "class",
+}  # fmt: skip
+
+# Names that cannot start or continue a power node (print and exec are
+# keywords in the Python 2 grammar)
+_KEYWORDS = (set(keyword.kwlist) - {"True", "False", "None"}) | {"print", "exec"}
+
+_OPENERS = {"(", "[", "{"}
+_CLOSERS = {")", "]", "}"}
+_AUGASSIGN = {
+    "+=", "-=", "*=", "/=", "//=", "%=", "**=", ">>=", "<<=", "&=", "^=",
+    "|=", "@=",
+}  # fmt: skip
+
+# Tokens after which has_key()'s replacement needs no parentheses, and the
+# tokens that may follow it: fix_has_key parenthesizes the comparison when
+# its parent is an operator or power node
+_HAS_KEY_BEFORE = {
+    "(", "[", "{", ",", ":", "=", ";", "and", "or", "if", "elif", "while",
+    "return", "assert", "else", "yield",
+} | _AUGASSIGN  # fmt: skip
+_HAS_KEY_AFTER = {
+    ")", "]", "}", ",", ":", ";", "and", "or", "if", "else", "for",
+}  # fmt: skip
+# Arguments fix_has_key would parenthesize
+_HAS_KEY_ARG_STOP = {
+    "<", ">", "==", ">=", "<=", "!=", "<>", "in", "not", "is", "and", "or", "if",
+    "lambda", "for", "=", ",", "*", "**", "yield",
+}  # fmt: skip
+
+_BOUNDARY_TYPES = {tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT}
+
+
+@lru_cache(maxsize=None)
+def _trigger_names() -> FrozenSet[str]:
+    """``_TRIGGER_NAMES`` plus the modules fix_imports and friends rename."""
+    from fissix.fixes import fix_imports, fix_imports2, fix_urllib
+
+    names = set(_TRIGGER_NAMES)
+    for mapping in (fix_imports.MAPPING, fix_imports2.MAPPING, fix_urllib.MAPPING):
+        for module in mapping:
+            names.update(module.split("."))
+    return frozenset(names)
+
+
+def fix_unicode_literal(value: str) -> str:
+    """What fix_unicode does to a string literal (without unicode_literals)."""
+    if value[0] in "'\"" and "\\" in value:
+        value = r"\\".join(
+            [
+                v.replace("\\u", r"\\u").replace("\\U", r"\\U")
+                for v in value.split(r"\\")
+            ]
+        )
+    if value[0] in "uU":
+        value = value[1:]
+    return value
+
+
+class _Token(NamedTuple):
+    type: int
+    string: str
+    start: int
+    end: int
+
+
+class _Edit(NamedTuple):
+    start: int
+    end: int
+    # Replacement text, or a function of the render function for edits
+    # that move text containing other edits
+    text: object
+    # Offset of the first keyword argument '=' in text, if any
+    equals: int = -1
+
+
+class _Fallback(Exception):
+    """The file needs the full engine."""
+
+
+class FastLaneConverter(Python2SyntaxPreprocessor):
+    """Convert files that only need the mechanical fixes, without lib2to3.
+
+    ``local_import(file_name, module_name)`` answers fix_import's question
+    for the imports of a file; without it, files with imports take the full
+    engine.
+    """
+
+    def __init__(
+        self,
+        second_stage: bool = True,
+        local_import: Optional[Callable[[str, str], bool]] = None,
+    ):
+        super().__init__()
+        self.second_stage = second_stage
+        self.local_import = local_import
+        self.stats: Dict[str, int] = {"fast_lane": 0, "full_engine": 0}
+
+    def preprocess(self, content: str) -> str:
+        """Rewrite fast-lane files fully, others with the basic preprocessor."""
+        converted = self.convert(content)
+        if converted is None:
+            return super().preprocess(content)
+        return converted[0]
+
+    def convert(
+        self, source: str, name: str = "<string>"
+    ) -> Optional[Tuple[str, str]]:
+        """Convert source like the two-stage engine would.
+
+        Returns the output and, when the engine's fissix stage would fail to
+        parse the 2to3 output, its error message (otherwise ""). Returns
+        None when the file needs the full engine.
+        """
+        try:
+            result = self._convert(source, name)
+        except _Fallback:
+            result = None
+        self.stats["full_engine" if result is None else "fast_lane"] += 1
+        return result
+
+    def _convert(self, source: str, name: str) -> Tuple[str, str]:
+        if "\r" in source or "\0" in source or source.startswith("\ufeff"):
+            raise _Fallback()
+
+        tokens = self._tokenize(source)
+        rewriter = _Rewriter(self, source, tokens, name)
+        output, equals = rewriter.rewrite()
+
+        if not self._parses(output):
+            raise _Fallback()
+
+        stage_two_error = ""
+        if equals >= 0:
+            line_start = output.rfind("\n", 0, equals) + 1
+            context = ("", (output.count("\n", 0, equals) + 1, equals - line_start))
+            stage_two_error = (
+                f"ParseError: bad input: type={EQUAL!r}, value='=', "
+                f"context={context!r}"
+            )
+        return output, stage_two_error
+
+    @staticmethod
+    def _parses(output: str) -> bool:
+        with warnings.catch_warnings():
+            # Invalid escape sequences warn; the fixers do not care
+            warnings.simplefilter("ignore")
+            try:
+                ast.parse(output)
+            except (SyntaxError, ValueError, RecursionError, MemoryError):
+                return False
+        return True
+
+    @staticmethod
+    def _tokenize(source: str) -> List[_Token]:
+        """Significant tokens with absolute offsets.
+
+        ``ur""`` is one STRING and ``<>`` one OP, as the C tokenizer of
+        Python 3.12+ already makes it.
+
+        Stops at the first name a fixer outside the fast lane matches on.
+        """
+        line_offsets = [0]
+        position = source.find("\n")
+        while position >= 0:
+            line_offsets.append(position + 1)
+            position = source.find("\n", position + 1)
+        line_offsets.append(len(source))
+
+        triggers = _trigger_names()
+        tokens: List[_Token] = []
+        try:
+            for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+                if tok.type in (tokenize.COMMENT, tokenize.NL):
+                    continue
+                if tok.type == tokenize.ERRORTOKEN:
+                    # Backticks, stray characters, unterminated strings
+                    raise _Fallback()
+                if tok.type == tokenize.NAME and tok.string in triggers:
+                    if not (
+                        tok.string in _BUILTIN_CALLS
+                        and tokens
+                        and tokens[-1].string == "."
+                    ):
+                        raise _Fallback()
+                start = line_offsets[tok.start[0] - 1] + tok.start[1]
+                end = line_offsets[tok.end[0] - 1] + tok.end[1]
+                if (
+                    tok.type == tokenize.STRING
+                    and tokens
+                    and tokens[-1].type == tokenize.NAME
+                    and tokens[-1].string.lower() == "ur"
+                    and tokens[-1].end == start
+                ):
+                    prefix = tokens.pop()
+                    tokens.append(
+                        _Token(tok.type, prefix.string + tok.string, prefix.start, end)
+                    )
+                    continue
+                if (
+                    tok.string == ">"
+                    and tokens
+                    and tokens[-1].string == "<"
+                    and tokens[-1].end == start
+                ):
+                    tokens[-1] = _Token(tok.type, "<>", tokens[-1].start, end)
+                    continue
+                tokens.append(_Token(tok.type, tok.string, start, end))
+        except (tokenize.TokenError, SyntaxError):
+            raise _Fallback()
+        return tokens
+
+
+class _Rewriter:
+    """One fast-lane rewrite of a token list."""
+
+    def __init__(
+        self,
+        converter: FastLaneConverter,
+        source: str,
+        tokens: List[_Token],
+        name: str,
+    ):
+        self.converter = converter
+        self.source = source
+        self.tokens = tokens
+        self.name = name
+        self.edits: List[_Edit] = []
+        # Spans of print arguments and of has_key()/iteritems() calls, which
+        # must not overlap: the fixers' interplay there is not modelled
+        self.print_spans: List[Tuple[int, int]] = []
+        self.call_spans: List[Tuple[int, int]] = []
+        self.print_kwargs = False
+        # (index of the NAME token, X start index, wrapper kind)
+        self.iter_calls: List[Tuple[int, int, str]] = []
+        self._index_brackets()
+
+    # -- token structure -------------------------------------------------
+
+    def _index_brackets(self):
+        tokens = self.tokens
+        self.match: Dict[int, int] = {}
+        self.depth = [0] * len(tokens)
+        self.statement_start = [False] * len(tokens)
+        stack: List[int] = []
+        line_first = None
+        colon_seen = lambda_seen = False
+        header_colon = -1
+
+        for i, tok in enumerate(tokens):
+            previous = tokens[i - 1] if i else None
+            if previous is None or previous.type in _BOUNDARY_TYPES:
+                if tok.type not in _BOUNDARY_TYPES:
+                    self.statement_start[i] = True
+                    line_first = tok
+                    colon_seen = lambda_seen = False
+                    header_colon = -1
+            elif previous.type == tokenize.OP and not stack:
+                if previous.string == ";" or i - 1 == header_colon:
+                    self.statement_start[i] = tok.type != tokenize.NEWLINE
+
+            if tok.type == tokenize.OP and tok.string in _OPENERS:
+                self.depth[i] = len(stack)
+                stack.append(i)
+            elif tok.type == tokenize.OP and tok.string in _CLOSERS:
+                if not stack:
+                    raise _Fallback()
+                opener = stack.pop()
+                self.match[opener], self.match[i] = i, opener
+                self.depth[i] = len(stack)
+            else:
+                self.depth[i] = len(stack)
+
+            if stack:
+                continue
+            if tok.type == tokenize.NAME and tok.string == "lambda":
+                lambda_seen = True
+            elif tok.type == tokenize.OP and tok.string == ":" and not colon_seen:
+                colon_seen = True
+                if line_first.string in _COMPOUND_KEYWORDS and not lambda_seen:
+                    header_colon = i
+            elif tok.type == tokenize.NEWLINE and line_first is not None:
+                # match/case statements: Python 3 only
+                first, last = line_first.string, tokens[i - 1].string
+                if first in ("match", "case") and last == ":":
+                    raise _Fallback()
+
+    def _is(self, i: int, *strings: str) -> bool:
+        tok = self.tokens[i] if 0 <= i < len(self.tokens) else None
+        return (
+            tok is not None
+            and tok.type in (tokenize.OP, tokenize.NAME)
+            and tok.string in strings
+        )
+
+    def _is_name(self, i: int) -> bool:
+        tok = self.tokens[i] if 0 <= i < len(self.tokens) else None
+        return (
+            tok is not None
+            and tok.type == tokenize.NAME
+            and tok.string not in _KEYWORDS
+        )
+
+    def _is_closer(self, i: int) -> bool:
+        return i >= 0 and self.tokens[i].type == tokenize.OP and i in self.match and (
+            self.tokens[i].string in _CLOSERS
+        )
+
+    def _is_atom(self, first: int, last: int) -> bool:
+        """Whether tokens first..last are one NAME, STRING run or bracket atom.
+
+        This is fix_print's ``atom< '(' [atom|STRING|NAME] ')' >`` test for
+        what is inside the parentheses.
+        """
+        tokens = self.tokens
+        if first == last and tokens[first].type == tokenize.NAME:
+            return True
+        if all(tokens[i].type == tokenize.STRING for i in range(first, last + 1)):
+            return True
+        return tokens[first].string in _OPENERS and self.match.get(first) == last
+
+    def _power_start(self, i: int) -> int:
+        """Index of the first token of the power node whose trailer starts at i."""
+        tokens = self.tokens
+        j = i - 1
+        while j >= 0:
+            tok = tokens[j]
+            if self._is_closer(j):
+                j = self.match[j]
+                if self._is_name(j - 1) or self._is_closer(j - 1) or (
+                    j > 0 and tokens[j - 1].type == tokenize.STRING
+                ):
+                    j -= 1
+                    continue
+                return j
+            if self._is_name(j) or tok.type == tokenize.STRING:
+                if self._is(j - 1, "."):
+                    j -= 2
+                    continue
+                if tok.type == tokenize.STRING and j > 0 and (
+                    tokens[j - 1].type == tokenize.STRING
+                ):
+                    j -= 1
+                    continue
+                return j
+            break
+        raise _Fallback()
+
+    def _statement_end(self, i: int) -> int:
+        """Index of the NEWLINE or ';' ending the statement containing i."""
+        tokens = self.tokens
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                return i
+            if tok.type == tokenize.OP:
+                if tok.string in _OPENERS:
+                    i = self.match[i]
+                elif tok.string == ";":
+                    return i
+            i += 1
+        return i
+
+    # -- the pass --------------------------------------------------------
+
+    def rewrite(self) -> Tuple[str, int]:
+        tokens = self.tokens
+        for i, tok in enumerate(tokens):
+            if tok.type == tokenize.NAME:
+                string = tok.string
+                if string == "print":
+                    if not self.statement_start[i]:
+                        raise _Fallback()
+                    self._print(i)
+                elif string == "except" and self.statement_start[i]:
+                    self._except(i)
+                elif string in ("import", "from") and self.statement_start[i]:
+                    self._imports(i)
+                elif self._is(i - 1, ".") and self._is(i + 1, "("):
+                    if string == "has_key":
+                        self._has_key(i)
+                    elif string in _ITER_METHODS and self._is(i + 2, ")"):
+                        self._iter_method(i)
+
+            elif tok.type == tokenize.OP:
+                if tok.string == "<>":
+                    self.edits.append(_Edit(tok.start, tok.end, "!="))
+                elif tok.string == ":=":
+                    raise _Fallback()
+                elif tok.string == "/" and self._is(i - 1, ",", "("):
+                    # Positional-only parameters
+                    raise _Fallback()
+
+            elif tok.type == tokenize.NUMBER:
+                # Long and old octal literals (10L tokenizes as 10 and L)
+                value = tok.string
+                if (
+                    "_" in value
+                    or (len(value) > 1 and value[0] == "0" and value.isdigit())
+                    or (
+                        i + 1 < len(tokens)
+                        and tokens[i + 1].start == tok.end
+                        and tokens[i + 1].type in (tokenize.NAME, tokenize.NUMBER)
+                    )
+                ):
+                    raise _Fallback()
+
+        for start, end in self.call_spans:
+            if any(s <= start < e for s, e in self.print_spans):
+                raise _Fallback()
+
+        stage_two = self.converter.second_stage and not self.print_kwargs
+        self._finish_iter_methods(stage_two)
+        self._strings(stage_two)
+        return self._render_all()
+
+    # -- fast-lane patterns ----------------------------------------------
+
+    def _print(self, i: int):
+        """fix_print, plus what fix_print does to its output in stage two."""
+        tokens = self.tokens
+        end = self._statement_end(i + 1)
+        source = self.source
+        print_tok = tokens[i]
+
+        if end == i + 1:
+            # Bare print
+            self.edits.append(_Edit(print_tok.end, print_tok.end, "()"))
+            return
+
+        first, last = i + 1, end - 1
+        stop = tokens[last].end
+        self.print_spans.append((print_tok.start, stop))
+        if tokens[first].string in _OPENERS and self.match[first] == last:
+            inner = (first + 1, last - 1)
+            if tokens[first].string == "(" and (
+                inner[0] > inner[1] or self._is_atom(*inner)
+            ):
+                # Already parenthesized: left alone by both stages
+                return
+
+        kwargs = []
+        trailing_comma = self._is(last, ",")
+        if trailing_comma:
+            if last == first:
+                raise _Fallback()
+            last -= 1
+            kwargs.append("end=' '")
+        if self._is(first, ">>"):
+            comma = first + 1
+            while comma <= last and not self._is(comma, ","):
+                if tokens[comma].string in _OPENERS:
+                    comma = self.match[comma]
+                comma += 1
+            if comma == first + 1:
+                raise _Fallback()
+            file_text = source[tokens[first + 1].start : tokens[comma - 1].end]
+            kwargs.append("file=" + file_text)
+            first = comma + 1
+
+        if first > last:
+            if trailing_comma:
+                # print >>f, with nothing to print
+                raise _Fallback()
+            text = "print(" + ", ".join(kwargs) + ")"
+            self.edits.append(_Edit(print_tok.start, stop, text, text.index("=")))
+            self.print_kwargs = True
+            return
+
+        if kwargs:
+            self.print_kwargs = True
+            closing = ", " + ", ".join(kwargs) + ")"
+            self.edits.append(
+                _Edit(print_tok.start, tokens[first].start, "print(")
+            )
+            self.edits.append(
+                _Edit(tokens[last].end, stop, closing, closing.index("="))
+            )
+            return
+
+        # Stage two wraps anything but a single atom, STRING or NAME again
+        # (resolved in _render_all, once it is known whether stage two runs)
+        single = self._is_atom(first, last)
+        self.edits.append(
+            _Edit(print_tok.start, tokens[first].start, ("print(", single))
+        )
+        self.edits.append(_Edit(tokens[last].end, stop, (")", single)))
+
+    def _except(self, i: int):
+        """fix_except for ``except E, name:``."""
+        tokens = self.tokens
+        if self._is(i + 1, "*"):
+            raise _Fallback()
+        commas = []
+        j = i + 1
+        while j < len(tokens) and not self._is(j, ":"):
+            if tokens[j].type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                raise _Fallback()
+            if tokens[j].string in _OPENERS and tokens[j].type == tokenize.OP:
+                j = self.match[j]
+            elif self._is(j, ","):
+                commas.append(j)
+            j += 1
+        if not commas:
+            return
+        comma = commas[0]
+        if len(commas) > 1 or comma == i + 1 or j != comma + 2:
+            # Tuple or attribute targets need a fresh name
+            raise _Fallback()
+        if not self._is_name(comma + 1):
+            raise _Fallback()
+        space = "" if tokens[comma + 1].start > tokens[comma].end else " "
+        self.edits.append(
+            _Edit(tokens[comma - 1].end, tokens[comma].end, " as" + space)
+        )
+
+    def _imports(self, i: int):
+        """Leave implicit relative imports (fix_import) to the full engine."""
+        tokens = self.tokens
+        modules = []
+        j = i + 1
+        if tokens[i].string == "from":
+            if self._is(j, ".", "..."):
+                return
+            modules.append(self._dotted_name(j)[0])
+        else:
+            while True:
+                name, j = self._dotted_name(j)
+                modules.append(name)
+                if self._is(j, "as") and self._is_name(j + 1):
+                    j += 2
+                if not self._is(j, ","):
+                    break
+                j += 1
+
+        local_import = self.converter.local_import
+        if local_import is None:
+            raise _Fallback()
+        if any(local_import(self.name, module) for module in modules):
+            raise _Fallback()
+
+    def _dotted_name(self, j: int) -> Tuple[str, int]:
+        if not self._is_name(j):
+            raise _Fallback()
+        parts = [self.tokens[j].string]
+        j += 1
+        while self._is(j, ".") and self._is_name(j + 1):
+            parts.append(self.tokens[j + 1].string)
+            j += 2
+        return ".".join(parts), j
+
+    def _has_key(self, i: int):
+        """fix_has_key where the comparison needs no parentheses."""
+        tokens = self.tokens
+        opener = i + 1
+        closer = self.match[opener]
+        if closer == opener + 1:
+            raise _Fallback()
+        if "\n" in self.source[tokens[opener].end : tokens[closer].start]:
+            raise _Fallback()
+        j = opener + 1
+        while j < closer:
+            if tokens[j].type in (tokenize.OP, tokenize.NAME) and (
+                tokens[j].string in _HAS_KEY_ARG_STOP
+            ):
+                raise _Fallback()
+            if tokens[j].type == tokenize.OP and tokens[j].string in _OPENERS:
+                j = self.match[j]
+            j += 1
+
+        after = tokens[closer + 1]
+        if not (
+            after.type in (tokenize.NEWLINE, tokenize.ENDMARKER)
+            or self._is(closer + 1, *_HAS_KEY_AFTER)
+        ):
+            raise _Fallback()
+
+        start = self._power_start(i - 1)
+        negated = self._is(start - 1, "not")
+        before = start - 2 if negated else start - 1
+        if not (
+            before < 0
+            or tokens[before].type in _BOUNDARY_TYPES
+            or self._is(before, *_HAS_KEY_BEFORE)
+        ):
+            raise _Fallback()
+
+        arg = (tokens[opener + 1].start, tokens[closer - 1].end)
+        head = (tokens[start].start, tokens[i - 2].end)
+        operator = " not in " if negated else " in "
+
+        def text(render, arg=arg, head=head, operator=operator):
+            return render(*arg) + operator + render(*head)
+
+        first = start - 1 if negated else start
+        self.edits.append(_Edit(tokens[first].start, tokens[closer].end, text))
+        self.call_spans.append((tokens[first].start, tokens[closer].end))
+
+    def _iter_method(self, i: int):
+        """fix_dict for ``X.iteritems()`` and friends, as far as stage one goes."""
+        tokens = self.tokens
+        closer = i + 2
+        if self._is(closer + 1, ".", "(", "[", "**"):
+            raise _Fallback()
+        start = self._power_start(i - 1)
+
+        kind = "iter"
+        if self._is(start - 1, "(") and self.match[start - 1] == closer + 1:
+            func = start - 2
+            if self._is_name(func) and not self._is(func - 1, "."):
+                if tokens[func].string in _CONSUMING_CALLS:
+                    kind = "consumed"
+                elif tokens[func].string == "iter":
+                    kind = "exempt"
+        elif self._is(start - 1, "in"):
+            kind = self._for_context(start - 1, closer + 1)
+
+        self.iter_calls.append((i, start, kind))
+        self.call_spans.append((tokens[start].start, tokens[closer].end))
+
+    def _for_context(self, in_index: int, after: int) -> str:
+        """Wrapper kind for an iter method call right after ``in``."""
+        tokens = self.tokens
+        j = in_index - 1
+        while j >= 0:
+            if self._is_closer(j):
+                j = self.match[j] - 1
+            elif self._is_name(j) or self._is(j, ",", "."):
+                j -= 1
+            else:
+                break
+        if self._is(j, "*"):
+            raise _Fallback()
+        if not self._is(j, "for"):
+            # A comparison
+            return "iter"
+
+        if self.depth[j] == 0:
+            if not self.statement_start[j] or not self._is(after, ":"):
+                raise _Fallback()
+        elif not (
+            self._is(after, "for", "if")
+            or (tokens[after].type == tokenize.OP and tokens[after].string in _CLOSERS)
+        ):
+            raise _Fallback()
+        return "exempt"
+
+    def _finish_iter_methods(self, stage_two: bool):
+        tokens = self.tokens
+        # Stage one: iter(d.items()) unless special; stage two: list() around
+        # d.items() unless it is the argument of a consuming call
+        wrappers = {
+            "consumed": ("", ""),
+            "exempt": ("list(", ")") if stage_two else ("", ""),
+            "iter": ("iter(list(", "))") if stage_two else ("iter(", ")"),
+        }
+        for i, start, kind in self.iter_calls:
+            name = tokens[i]
+            self.edits.append(_Edit(name.start, name.end, _ITER_METHODS[name.string]))
+            opening, closing = wrappers[kind]
+            if opening:
+                begin = tokens[start].start
+                self.edits.append(_Edit(begin, begin, opening))
+                end = tokens[i + 2].end
+                self.edits.append(_Edit(end, end, closing))
+
+    def _strings(self, stage_two: bool):
+        for tok in self.tokens:
+            if tok.type != tokenize.STRING:
+                continue
+            value = fix_unicode_literal(tok.string)
+            if stage_two:
+                value = fix_unicode_literal(value)
+            if value != tok.string:
+                self.edits.append(_Edit(tok.start, tok.end, value))
+
+    # -- output ----------------------------------------------------------
+
+    def _render_all(self) -> Tuple[str, int]:
+        """Apply the edits; returns the text and the first kwarg '=' offset."""
+        stage_two = self.converter.second_stage and not self.print_kwargs
+        edits = []
+        for edit in self.edits:
+            if isinstance(edit.text, tuple):
+                text, single = edit.text
+                if stage_two and not single:
+                    text = "print((" if text == "print(" else "))"
+                edit = edit._replace(text=text)
+            edits.append(edit)
+
+        # Insertions before replacements starting at the same offset, and
+        # outer replacements before the ones nested in them
+        edits.sort(key=lambda e: (e.start, e.end > e.start, -e.end))
+        for previous, edit in zip(edits, edits[1:]):
+            if previous.start == previous.end == edit.start == edit.end:
+                raise _Fallback()
+
+        equals = [-1]
+
+        def render(lo: int, hi: int, top: bool = False) -> str:
+            pieces = []
+            position = lo
+            length = 0
+            covering = None
+            for edit in edits:
+                if edit.start < lo or edit.end > hi:
+                    continue
+                if edit.start < position:
+                    # Rendered by the edit that moved the text around it
+                    if callable(covering.text) and edit.end <= covering.end:
+                        continue
+                    raise _Fallback()
+                pieces.append(self.source[position : edit.start])
+                length += edit.start - position
+                text = edit.text(render) if callable(edit.text) else edit.text
+                if top and edit.equals >= 0 and equals[0] < 0:
+                    equals[0] = length + edit.equals
+                pieces.append(text)
+                length += len(text)
+                position = edit.end
+                if edit.end > edit.start:
+                    covering = edit
+            pieces.append(self.source[position:hi])
+            return "".join(pieces)
+
+        output = render(0, len(self.source), top=True)
+        if not (self.print_kwargs and self.converter.second_stage):
+            return output, -1
+        return output, equals[0]
@@ -0,0 +1,224 @@
+"""
+Git-aware conversion of changed files.
+
+Instead of walking the whole tree, ask git which Python files changed in a
+revision range (or in the staged index) and read just those blobs from the
+object store through one long-lived ``git cat-file --batch`` process.
+"""
+
+import difflib
+import hashlib
+import os
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from .engine import ConversionResult, Python2to3Converter
+from .source_io import DecodedSource, decode_source, write_source
+
+# dst SHA git diff --raw reports for worktree files
+NULL_SHA = "0" * 40
+
+
+class GitError(RuntimeError):
+    """Raised when a git command fails."""
+
+
+class GitBlobReader:
+    """Read blobs through a single ``git cat-file --batch`` process."""
+
+    def __init__(self, repo_dir: str):
+        self.repo_dir = repo_dir
+        self._process: Optional[subprocess.Popen] = None
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=self.repo_dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        return self._process
+
+    def read_blob(self, object_name: str) -> bytes:
+        """Return the raw content of a blob (SHA or ``<rev>:<path>``)."""
+        process = self._ensure_process()
+        process.stdin.write(object_name.encode("utf-8") + b"\n")
+        process.stdin.flush()
+
+        header = process.stdout.readline()
+        if not header:
+            raise GitError("git cat-file exited unexpectedly")
+
+        fields = header.split()
+        if len(fields) != 3:
+            # "<object> missing" or "<object> ambiguous"
+            raise GitError(f"Cannot read {object_name}: {header.decode().strip()}")
+
+        size = int(fields[2])
+        content = process.stdout.read(size)
+        process.stdout.read(1)  # Trailing LF after the content
+        return content
+
+    def close(self):
+        """Stop the cat-file process."""
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+class GitChangeConverter:
+    """Convert only the Python files touched by a revision range or the index."""
+
+    def __init__(
+        self, repo_dir: str = ".", converter: Optional[Python2to3Converter] = None
+    ):
+        self.repo_dir = os.path.abspath(repo_dir)
+        self.converter = converter or Python2to3Converter()
+        # Encoding and line endings of each converted blob, for writing back
+        self._sources: Dict[str, DecodedSource] = {}
+        # Hash of each converted blob, to detect later worktree edits
+        self._digests: Dict[str, str] = {}
+        # Files write_to_worktree() left alone because they were edited
+        self.skipped: List[str] = []
+
+    def _run_git(self, *args: str) -> bytes:
+        result = subprocess.run(
+            ["git", *args], cwd=self.repo_dir, capture_output=True
+        )
+        if result.returncode != 0:
+            raise GitError(
+                f"git {' '.join(args)} failed: {result.stderr.decode().strip()}"
+            )
+        return result.stdout
+
+    def changed_python_files(
+        self, revision_range: Optional[str] = None, staged: bool = False
+    ) -> List[Tuple[str, str]]:
+        """Return (path, blob SHA) for Python files added or modified.
+
+        ``revision_range`` is anything ``git diff`` accepts (``main..HEAD``,
+        ``HEAD^!``); with ``staged=True`` the index is compared to HEAD. A
+        single revision compares it to the worktree, and those files get
+        ``NULL_SHA`` instead of a blob SHA.
+        """
+        args = ["diff", "--raw", "-z", "--no-abbrev", "--diff-filter=ACMR"]
+        if staged:
+            args.append("--cached")
+        elif revision_range:
+            args.append(revision_range)
+        else:
+            raise ValueError("Either a revision range or staged=True is required")
+
+        fields = self._run_git(*args).decode("utf-8").split("\0")
+        changed = []
+        i = 0
+        while i < len(fields) - 1:
+            meta = fields[i].split()
+            status = meta[4]
+            # Renames and copies list the source path before the new path
+            i += 2 if status[0] in "RC" else 1
+            path = fields[i]
+            i += 1
+            if path.endswith(".py"):
+                changed.append((path, meta[3]))
+
+        return changed
+
+    def convert_changes(
+        self, revision_range: Optional[str] = None, staged: bool = False
+    ) -> List[ConversionResult]:
+        """Convert changed Python blobs in memory, without touching the worktree."""
+        changed = self.changed_python_files(revision_range, staged)
+        results = []
+
+        with GitBlobReader(self.repo_dir) as reader:
+            total_files = len(changed)
+            for i, (path, blob_sha) in enumerate(changed):
+                if self.converter.progress_callback:
+                    self.converter.progress_callback(
+                        f"Converting {os.path.basename(path)}", (i / total_files) * 100
+                    )
+
+                file_path = os.path.join(self.repo_dir, path)
+                try:
+                    if blob_sha == NULL_SHA:
+                        with open(file_path, "rb") as f:
+                            data = f.read()
+                    else:
+                        data = reader.read_blob(blob_sha)
+                    source = decode_source(data)
+                except Exception as e:
+                    results.append(
+                        ConversionResult(
+                            file_path, False, "", f"Error reading {path}: {e}"
+                        )
+                    )
+                    continue
+
+                self._sources[file_path] = source
+                self._digests[file_path] = hashlib.sha256(data).hexdigest()
+                results.append(self.converter.convert_source(source.text, file_path))
+
+        if self.converter.progress_callback:
+            self.converter.progress_callback("Conversion complete", 100)
+
+        self.converter.conversion_results = results
+        return results
+
+    def write_to_worktree(self, results: List[ConversionResult]) -> List[str]:
+        """Write converted files into the worktree, returning the paths written.
+
+        Files whose worktree content differs from the converted blob (edits
+        that are not committed or staged) are not overwritten; they are
+        listed in ``skipped`` instead.
+        """
+        written = []
+        self.skipped = []
+        for result in results:
+            if result.success and result.changes_made:
+                try:
+                    with open(result.file_path, "rb") as f:
+                        current = hashlib.sha256(f.read()).hexdigest()
+                except OSError:
+                    current = None
+                if current != self._digests[result.file_path]:
+                    self.skipped.append(result.file_path)
+                    continue
+                write_source(
+                    result.file_path, result.output, self._sources[result.file_path]
+                )
+                written.append(result.file_path)
+        return written
+
+    def make_patch(self, results: List[ConversionResult]) -> str:
+        """Build a unified diff (``git apply`` compatible) from the results."""
+        patch = []
+        for result in results:
+            if not (result.success and result.changes_made):
+                continue
+
+            path = os.path.relpath(result.file_path, self.repo_dir).replace(
+                os.sep, "/"
+            )
+            newline = self._sources[result.file_path].newline
+            diff = difflib.unified_diff(
+                result.original_content.replace("\n", newline).splitlines(True),
+                result.output.replace("\n", newline).splitlines(True),
+                fromfile=f"a/{path}",
+                tofile=f"b/{path}",
+            )
+            for line in diff:
+                if not line.endswith("\n"):
+                    line += "\n\\ No newline at end of file\n"
+                patch.append(line)
+
+        return "".join(patch)
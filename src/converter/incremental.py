@@ -0,0 +1,298 @@
+"""
+Incremental conversion of edited files, one top-level chunk at a time.
+
+A module is parsed once and split into its top-level statements, classes
+and functions (the children of the ``file_input`` node). The converted
+text of each chunk is cached under a hash of its source and of the
+file-wide context the fixers read:
+
+- the file name and the ``__future__`` features
+- every import and ``global`` statement, in order, and how many of them
+  come before the chunk (``fix_imports`` renames module usages after the
+  import that introduced them)
+- which imports look like implicit relative imports (``fix_import``)
+- whether ``next`` is bound at module level (``fix_next``)
+
+When a file is converted again, only the chunks that missed the cache are
+fixed: the fixers start on the whole tree as usual, but the traversal is
+restricted to those chunks and to the import and ``global`` statements
+that feed fixer state. If fixing a chunk reaches outside of it (a fixer
+inserts an import at the top of the module or needs a fresh identifier),
+the file is converted in full instead, so the output is always identical
+to a full conversion.
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+# Names whose fixers keep state that the chunk context does not cover
+_UNSUPPORTED_NAMES = {"exitfunc"}
+
+_KEYWORDS = {"import", "from", "as", "global"}
+
+
+class ChunkCache:
+    """Bounded LRU cache of converted chunks, safe to share between threads."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "chunk_hits": 0,
+            "chunk_misses": 0,
+            "incremental": 0,
+            "full": 0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.stats["chunk_misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self.stats["chunk_hits"] += 1
+            return value
+
+    def put(self, key: tuple, value: str):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def count(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+
+def track_new_names(tool):
+    """Count calls to ``BaseFix.new_name()``, whose results are file-wide."""
+    tool.new_name_calls = 0
+
+    def counting(new_name):
+        def counting_new_name(*args, **kwargs):
+            tool.new_name_calls += 1
+            return new_name(*args, **kwargs)
+
+        return counting_new_name
+
+    for fixer in chain(tool.pre_order, tool.post_order):
+        fixer.new_name = counting(fixer.new_name)
+
+
+def _refactor_module(tool):
+    return sys.modules[type(tool).__module__]
+
+
+def _parse(tool, source: str, name: str):
+    """Parse exactly like ``refactor_string()``, without fixing."""
+    tool.refactor_tree = lambda tree, name: False
+    try:
+        return tool.refactor_string(source + "\n", name)
+    finally:
+        del tool.refactor_tree
+
+
+def _hash(*parts: str) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _local_import_decisions(tool, name: str, context_nodes) -> str:
+    """What fix_import would decide for every name in the import statements."""
+    fixer = next(
+        (
+            f
+            for f in chain(tool.pre_order, tool.post_order)
+            if type(f).__module__.endswith(".fix_import")
+        ),
+        None,
+    )
+    if fixer is None:
+        return ""
+
+    fixer.filename = name
+    decisions = []
+    for node in context_nodes:
+        for leaf in node.leaves():
+            if leaf.type == 1 and leaf.value not in _KEYWORDS:
+                local = fixer.probably_a_local_import(leaf.value)
+                decisions.append("1" if local else "0")
+    return "".join(decisions)
+
+
+def _refactor_nodes(tool, tree, name: str, roots: List) -> None:
+    """``RefactoringTool.refactor_tree()`` restricted to the given subtrees."""
+    refactor = _refactor_module(tool)
+    pytree = refactor.pytree
+
+    for fixer in chain(tool.pre_order, tool.post_order):
+        fixer.start_tree(tree, name)
+
+    tool.traverse_by(
+        tool.bmi_pre_order_heads, chain.from_iterable(r.pre_order() for r in roots)
+    )
+    tool.traverse_by(
+        tool.bmi_post_order_heads, chain.from_iterable(r.post_order() for r in roots)
+    )
+
+    match_set = tool.BM.run(chain.from_iterable(r.leaves() for r in roots))
+
+    while any(match_set.values()):
+        for fixer in tool.BM.fixers:
+            if fixer in match_set and match_set[fixer]:
+                match_set[fixer].sort(key=pytree.Base.depth, reverse=True)
+
+                if fixer.keep_line_order:
+                    match_set[fixer].sort(key=pytree.Base.get_lineno)
+
+                for node in list(match_set[fixer]):
+                    if node in match_set[fixer]:
+                        match_set[fixer].remove(node)
+
+                    try:
+                        refactor.find_root(node)
+                    except ValueError:
+                        continue
+
+                    if node.fixers_applied and fixer in node.fixers_applied:
+                        continue
+
+                    results = fixer.match(node)
+
+                    if results:
+                        new = fixer.transform(node, results)
+                        if new is not None:
+                            node.replace(new)
+                            for node in new.post_order():
+                                if not node.fixers_applied:
+                                    node.fixers_applied = []
+                                node.fixers_applied.append(fixer)
+
+                            new_matches = tool.BM.run(new.leaves())
+                            for fxr in new_matches:
+                                if fxr not in match_set:
+                                    match_set[fxr] = []
+                                match_set[fxr].extend(new_matches[fxr])
+
+    for fixer in chain(tool.pre_order, tool.post_order):
+        fixer.finish_tree(tree, name)
+
+
+def _chunk_context(tool, tree, name: str) -> Tuple[Optional[str], List[List]]:
+    """Fingerprint of the file-wide context and the context nodes per chunk.
+
+    The fingerprint is None when the file uses fixer state the context does
+    not cover.
+    """
+    syms = _refactor_module(tool).pygram.python_symbols
+    context_types = {syms.import_name, syms.import_from, syms.global_stmt}
+    fixer_util = sys.modules[type(tool).__module__.rsplit(".", 1)[0] + ".fixer_util"]
+
+    if getattr(tree, "used_names", set()) & _UNSUPPORTED_NAMES:
+        return None, []
+
+    context_nodes: List[List] = []
+    texts = []
+    for child in tree.children:
+        nodes = [n for n in child.pre_order() if n.type in context_types]
+        for node in nodes:
+            if node.type == syms.global_stmt and "next" in str(node):
+                # fix_next changes behaviour from here on, in traversal order
+                return None, []
+        context_nodes.append(nodes)
+        texts.extend(str(n) for n in nodes)
+
+    all_nodes = list(chain.from_iterable(context_nodes))
+    fingerprint = _hash(
+        name,
+        ",".join(sorted(tree.future_features)),
+        "next-bound" if fixer_util.find_binding("next", tree) else "",
+        _local_import_decisions(tool, name, all_nodes),
+        *texts,
+    )
+    return fingerprint, context_nodes
+
+
+def refactor_incrementally(
+    tool, cache: ChunkCache, stage: str, source: str, name: str
+) -> str:
+    """Refactor source with tool, reusing cached chunks where possible."""
+    tree = _parse(tool, source, name)
+    children = list(tree.children)
+    fingerprint, context_nodes = _chunk_context(tool, tree, name)
+
+    if fingerprint is None:
+        cache.count("full")
+        tool.refactor_tree(tree, name)
+        return str(tree)[:-1] if tree.was_changed else source
+
+    keys = []
+    preceding = 0
+    for child, nodes in zip(children, context_nodes):
+        keys.append((stage, fingerprint, preceding, _hash(str(child))))
+        preceding += len(nodes)
+
+    outputs = [cache.get(key) for key in keys]
+    missing = [i for i, output in enumerate(outputs) if output is None]
+
+    if missing and len(missing) < len(children):
+        roots = []
+        for i, child in enumerate(children):
+            if outputs[i] is None:
+                roots.append(child)
+            else:
+                roots.extend(context_nodes[i])
+
+        new_name_calls = tool.new_name_calls
+        _refactor_nodes(tool, tree, name, roots)
+
+        escaped = (
+            tool.new_name_calls != new_name_calls
+            or len(tree.children) != len(children)
+            or any(
+                tree.children[i] is not children[i]
+                for i in range(len(children))
+                if outputs[i] is not None
+            )
+        )
+        if not escaped:
+            cache.count("incremental")
+            for i in missing:
+                outputs[i] = str(tree.children[i])
+                cache.put(keys[i], outputs[i])
+            return "".join(outputs)[:-1]
+
+        # A fixer reached outside the chunks; start over with a full pass
+        tree = _parse(tool, source, name)
+        children = list(tree.children)
+        missing = list(range(len(children)))
+
+    if not missing:
+        cache.count("incremental")
+        return "".join(outputs)[:-1]
+
+    cache.count("full")
+    new_name_calls = tool.new_name_calls
+    tool.refactor_tree(tree, name)
+    if tool.new_name_calls == new_name_calls and len(tree.children) == len(children):
+        for key, child in zip(keys, tree.children):
+            cache.put(key, str(child))
+    return str(tree)[:-1] if tree.was_changed else source
@@ -0,0 +1,176 @@
+"""
+Out-of-place conversion into a mirrored output tree.
+
+The source tree is never modified. Converted files are written into the
+mirror; unchanged Python files and every non-Python asset are hardlinked
+(or reflinked, or as a last resort copied) so the mirror costs almost no
+extra disk space. Sources are read ahead and filesystem work runs on
+thread pools while the conversions themselves run in the calling thread.
+"""
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .engine import ConversionResult, Python2to3Converter
+from .module_index import ProjectModuleIndex
+from .prefetch import PrefetchingReader
+from .source_io import DecodedSource, decode_source, write_source
+
+# Directories that are never mirrored
+SKIP_DIRS = {".git", "__pycache__", ".pytest_cache", "venv", "env"}
+
+# ioctl request number for FICLONE on Linux (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str):
+    """Create a copy-on-write clone of src at dst (Linux only)."""
+    import fcntl
+
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        try:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        except OSError:
+            dst_file.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def link_or_copy(src: str, dst: str, hardlink: bool = True) -> str:
+    """Place src at dst as cheaply as possible and return the method used."""
+    if os.path.lexists(dst):
+        os.unlink(dst)
+
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return "hardlinked"
+        except OSError:
+            # Cross-device or unsupported filesystem
+            pass
+
+    try:
+        _reflink(src, dst)
+        return "reflinked"
+    except (OSError, ImportError):
+        pass
+
+    shutil.copy2(src, dst)
+    return "copied"
+
+
+class MirrorConverter:
+    """Convert a source tree into a separate output directory."""
+
+    def __init__(
+        self,
+        converter: Optional[Python2to3Converter] = None,
+        max_workers: int = 8,
+        hardlink: bool = True,
+    ):
+        self.converter = converter or Python2to3Converter()
+        self.max_workers = max_workers
+        self.hardlink = hardlink
+        self.stats: Dict[str, int] = {}
+
+    def _write_converted(
+        self, src: str, dst: str, content: str, source: DecodedSource
+    ) -> str:
+        if os.path.lexists(dst):
+            # Never write through a hardlink left by a previous run
+            os.unlink(dst)
+        write_source(dst, content, source)
+        shutil.copystat(src, dst)
+        return "written"
+
+    def convert_tree(self, source_dir: str, output_dir: str) -> List[ConversionResult]:
+        """Mirror source_dir into output_dir, converting Python files.
+
+        Result paths point into the mirror, so they can be validated directly.
+        """
+        source_dir = os.path.abspath(source_dir)
+        output_dir = os.path.abspath(output_dir)
+        if output_dir == source_dir:
+            raise ValueError("Output directory must differ from the source directory")
+
+        python_files = []
+        other_files = []
+        module_index = ProjectModuleIndex(source_dir)
+        for root, dirs, files in os.walk(source_dir):
+            module_index.add_directory(root, dirs, files)
+            dirs[:] = [
+                d
+                for d in dirs
+                if d not in SKIP_DIRS and os.path.join(root, d) != output_dir
+            ]
+
+            target_root = os.path.join(output_dir, os.path.relpath(root, source_dir))
+            os.makedirs(target_root, exist_ok=True)
+
+            for file in files:
+                src = os.path.join(root, file)
+                dst = os.path.join(target_root, file)
+                if file.endswith(".py"):
+                    python_files.append((src, dst))
+                elif not file.endswith(".py2bak"):
+                    other_files.append((src, dst))
+
+        self.converter.set_module_index(module_index)
+        self.stats = {"hardlinked": 0, "reflinked": 0, "copied": 0, "written": 0}
+        results = []
+
+        reader = PrefetchingReader(
+            [src for src, _ in python_files], max_workers=self.max_workers
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool, reader:
+            futures = [
+                pool.submit(link_or_copy, src, dst, self.hardlink)
+                for src, dst in other_files
+            ]
+
+            total_files = len(python_files)
+            for i, prefetched in enumerate(reader):
+                src, dst = python_files[i]
+                if self.converter.progress_callback:
+                    self.converter.progress_callback(
+                        f"Converting {os.path.basename(src)}", (i / total_files) * 100
+                    )
+
+                try:
+                    if prefetched.error is not None:
+                        raise prefetched.error
+                    source = decode_source(prefetched.data)
+                except Exception as e:
+                    results.append(
+                        ConversionResult(dst, False, "", f"Error reading {src}: {e}")
+                    )
+                    futures.append(pool.submit(link_or_copy, src, dst, self.hardlink))
+                    continue
+
+                result = self.converter.convert_source(source.text, src)
+                result.file_path = dst
+                results.append(result)
+
+                if result.success and result.output != source.text:
+                    futures.append(
+                        pool.submit(
+                            self._write_converted, src, dst, result.output, source
+                        )
+                    )
+                else:
+                    futures.append(pool.submit(link_or_copy, src, dst, self.hardlink))
+
+            for future in futures:
+                method = future.result()
+                self.stats[method] += 1
+
+        self.converter.io_metrics = reader.get_metrics()
+
+        if self.converter.progress_callback:
+            self.converter.progress_callback("Conversion complete", 100)
+
+        self.converter.conversion_results = results
+        return results
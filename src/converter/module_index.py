@@ -0,0 +1,88 @@
+"""
+Index of the modules in a project, built from the discovery scan.
+
+The stock ``fix_import`` fixer decides whether ``import foo`` is an
+implicit relative import by probing the filesystem next to the file being
+fixed (``__init__.py``, ``foo.py``, ``foo/``, ``foo.so``, ...) for every
+import. The index answers the same questions from the directory listing
+the scan already produced, so fixing does no ``stat`` calls, and the
+validator uses it to resolve imports of project-local modules.
+"""
+
+import os
+from typing import Iterable, Optional, Set
+
+# Suffixes probed by fix_import's probably_a_local_import(); os.sep stands
+# for a package directory
+MODULE_SUFFIXES = (".py", ".pyc", ".so", ".sl", ".pyd")
+
+
+class ProjectModuleIndex:
+    """Files and directories of a project tree, for import lookups."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.files: Set[str] = set()
+        self.directories: Set[str] = {self.root}
+
+    def add_directory(
+        self, directory: str, dirnames: Iterable[str], filenames: Iterable[str]
+    ):
+        """Record one ``os.walk()`` step (before skipped dirs are pruned)."""
+        directory = os.path.abspath(directory)
+        self.directories.add(directory)
+        self.directories.update(os.path.join(directory, d) for d in dirnames)
+        self.files.update(
+            os.path.join(directory, f)
+            for f in filenames
+            if f.endswith(MODULE_SUFFIXES)
+        )
+
+    @classmethod
+    def scan(cls, root: str) -> "ProjectModuleIndex":
+        """Build an index by walking root."""
+        index = cls(root)
+        for directory, dirnames, filenames in os.walk(root):
+            index.add_directory(directory, dirnames, filenames)
+        return index
+
+    def __len__(self):
+        return len(self.files)
+
+    def covers(self, path: str) -> bool:
+        """Whether path lies inside the indexed tree."""
+        path = os.path.abspath(path)
+        return path == self.root or path.startswith(self.root + os.sep)
+
+    def probably_a_local_import(self, filename: str, imp_name: str) -> bool:
+        """``fix_import``'s check for an implicit relative import, without I/O."""
+        if imp_name.startswith("."):
+            return False
+        imp_name = imp_name.split(".", 1)[0]
+        directory = os.path.dirname(os.path.abspath(filename))
+        # If there is no __init__.py next to the file it's not in a package
+        # so can't be a relative import.
+        if os.path.join(directory, "__init__.py") not in self.files:
+            return False
+
+        return self._resolves_under(directory, imp_name)
+
+    def _resolves_under(self, directory: str, module_name: str) -> bool:
+        path = os.path.join(directory, *module_name.split("."))
+        if path in self.directories:
+            return True
+        return any(path + suffix in self.files for suffix in MODULE_SUFFIXES)
+
+    def has_module(self, module_name: str, from_file: Optional[str] = None) -> bool:
+        """Whether a dotted module name is a module or package of the project.
+
+        Names are resolved against the project root and, like a script run
+        from its own directory, against the directory of ``from_file``.
+        Directories without ``__init__.py`` count as namespace packages.
+        """
+        if self._resolves_under(self.root, module_name):
+            return True
+        if from_file is not None:
+            directory = os.path.dirname(os.path.abspath(from_file))
+            return self._resolves_under(directory, module_name)
+        return False
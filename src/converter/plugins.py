@@ -0,0 +1,214 @@
+"""
+Custom fixer plugins.
+
+Shop-specific fixers are ordinary fissix fixers (subclasses of
+``fissix.fixer_base.BaseFix``) that run in the fissix stage next to the
+stock fixers. They are found in two ways:
+
+- entry points in the ``cc_py2to3.fixers`` group, each pointing at a
+  fixer class
+- ``fix_<name>.py`` modules in directories (or single files) given on the
+  command line or in the ``CC_PY2TO3_FIXER_PATH`` environment variable,
+  using the usual ``FixName`` class naming convention
+
+Compiled fixer patterns are cached per process, so creating more
+refactoring tools in the same worker does not recompile them, and the
+time spent in each plugin is recorded for the run report.
+"""
+
+import importlib.util
+import operator
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from fissix import refactor
+
+ENTRY_POINT_GROUP = "cc_py2to3.fixers"
+FIXER_PATH_ENV = "CC_PY2TO3_FIXER_PATH"
+
+# (fixer class, PATTERN) -> (pattern, pattern_tree), shared by all tools
+# created in this process
+_PATTERN_CACHE: Dict[tuple, tuple] = {}
+
+# Plugin fixer class -> its pattern-caching subclass
+_CACHED_CLASSES: Dict[type, type] = {}
+
+
+class FixerPlugin:
+    """A named custom fixer class."""
+
+    def __init__(self, name: str, fixer_class: type, origin: Optional[str] = None):
+        self.name = name
+        self.fixer_class = fixer_class
+        # Source file of plugins loaded from a path, so worker processes can
+        # load them again instead of unpickling an unimportable class
+        self.origin = origin
+
+    def __repr__(self):
+        return f"FixerPlugin({self.name!r})"
+
+    def __reduce__(self):
+        if self.origin is not None:
+            return (load_plugin_file, (self.origin,))
+        return (FixerPlugin, (self.name, self.fixer_class))
+
+
+class CachedPatternMixin:
+    """Reuse compiled patterns across fixer instances of the same class."""
+
+    def compile_pattern(self):
+        if self.PATTERN is None:
+            return
+
+        key = (type(self), self.PATTERN)
+        cached = _PATTERN_CACHE.get(key)
+        if cached is None:
+            super().compile_pattern()
+            _PATTERN_CACHE[key] = (self.pattern, self.pattern_tree)
+        else:
+            self.pattern, self.pattern_tree = cached
+
+
+def with_pattern_cache(fixer_class: type) -> type:
+    """Return a subclass of fixer_class that uses the pattern cache."""
+    if issubclass(fixer_class, CachedPatternMixin):
+        return fixer_class
+
+    cached_class = _CACHED_CLASSES.get(fixer_class)
+    if cached_class is None:
+        cached_class = type(
+            fixer_class.__name__,
+            (CachedPatternMixin, fixer_class),
+            {"__module__": fixer_class.__module__},
+        )
+        _CACHED_CLASSES[fixer_class] = cached_class
+    return cached_class
+
+
+def _fixer_class_name(module_name: str) -> str:
+    """Map ``fix_set_wrapper`` to ``FixSetWrapper`` like RefactoringTool does."""
+    fix_name = module_name
+    if fix_name.startswith(refactor.RefactoringTool.FILE_PREFIX):
+        fix_name = fix_name[len(refactor.RefactoringTool.FILE_PREFIX) :]
+    return refactor.RefactoringTool.CLASS_PREFIX + "".join(
+        part.title() for part in fix_name.split("_")
+    )
+
+
+def load_plugin_file(file_path: str) -> FixerPlugin:
+    """Load the fixer class from a ``fix_<name>.py`` file."""
+    module_name = os.path.splitext(os.path.basename(file_path))[0]
+    spec = importlib.util.spec_from_file_location(
+        f"cc_py2to3_plugins.{module_name}", file_path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    class_name = _fixer_class_name(module_name)
+    try:
+        fixer_class = getattr(module, class_name)
+    except AttributeError:
+        raise refactor.FixerError(
+            f"Can't find {class_name} in {file_path}"
+        ) from None
+    return FixerPlugin(module_name, fixer_class, os.path.abspath(file_path))
+
+
+def load_path_plugins(path: str) -> List[FixerPlugin]:
+    """Load plugins from a fixer file or a directory of ``fix_*.py`` files."""
+    if os.path.isfile(path):
+        return [load_plugin_file(path)]
+
+    plugins = []
+    for file in sorted(os.listdir(path)):
+        if file.startswith(refactor.RefactoringTool.FILE_PREFIX) and file.endswith(
+            ".py"
+        ):
+            plugins.append(load_plugin_file(os.path.join(path, file)))
+    return plugins
+
+
+def load_entry_point_plugins() -> List[FixerPlugin]:
+    """Load plugins registered in the ``cc_py2to3.fixers`` entry point group."""
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        group = entry_points.select(group=ENTRY_POINT_GROUP)
+    else:
+        # Python 3.8/3.9 return a dict of groups
+        group = entry_points.get(ENTRY_POINT_GROUP, [])
+
+    return [FixerPlugin(ep.name, ep.load()) for ep in group]
+
+
+def discover_plugins(
+    paths: Optional[Iterable[str]] = None, use_entry_points: bool = True
+) -> List[FixerPlugin]:
+    """Collect plugins from entry points, the given paths and the environment."""
+    plugins = load_entry_point_plugins() if use_entry_points else []
+
+    search_paths = list(paths or [])
+    env_paths = os.environ.get(FIXER_PATH_ENV, "")
+    search_paths.extend(p for p in env_paths.split(os.pathsep) if p)
+
+    for path in search_paths:
+        plugins.extend(load_path_plugins(path))
+
+    return plugins
+
+
+class PluginRefactoringTool(refactor.RefactoringTool):
+    """fissix RefactoringTool that also runs plugin fixers and times them."""
+
+    def __init__(
+        self,
+        fixer_names,
+        options=None,
+        explicit=None,
+        plugins: Iterable[FixerPlugin] = (),
+        timings: Optional[Dict[str, float]] = None,
+    ):
+        # get_fixers() runs inside the base initializer
+        self.plugins = list(plugins)
+        self.plugin_timings = timings if timings is not None else {}
+        super().__init__(fixer_names, options, explicit)
+
+    def get_fixers(self):
+        pre_order_fixers, post_order_fixers = super().get_fixers()
+
+        for plugin in self.plugins:
+            fixer = with_pattern_cache(plugin.fixer_class)(
+                self.options, self.fixer_log
+            )
+            self._time_fixer(plugin.name, fixer)
+            if fixer.order == "pre":
+                pre_order_fixers.append(fixer)
+            elif fixer.order == "post":
+                post_order_fixers.append(fixer)
+            else:
+                raise refactor.FixerError(f"Illegal fixer order: {fixer.order!r}")
+
+        key_func = operator.attrgetter("run_order")
+        pre_order_fixers.sort(key=key_func)
+        post_order_fixers.sort(key=key_func)
+        return pre_order_fixers, post_order_fixers
+
+    def _time_fixer(self, name: str, fixer):
+        """Wrap the fixer hooks so their runtime is added to plugin_timings."""
+        self.plugin_timings.setdefault(name, 0.0)
+        timings = self.plugin_timings
+
+        def timed(method):
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    timings[name] += time.perf_counter() - start
+
+            return wrapper
+
+        for hook in ("start_tree", "match", "transform", "finish_tree"):
+            setattr(fixer, hook, timed(getattr(fixer, hook)))
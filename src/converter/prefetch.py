@@ -0,0 +1,110 @@
+"""
+Prefetching file reader for slow (network) filesystems.
+
+On NFS every ``open``, ``read`` and ``stat`` is a round-trip to the server.
+``PrefetchingReader`` reads the files of a scan on a small thread pool,
+a bounded window ahead of the file currently being converted, so the
+round-trips overlap with conversion work. Each file is opened once; its
+bytes and ``fstat`` result are handed to the converter (which also writes
+backups from them) and the converted text is reused by the validator, so
+no stage reads the same file again.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional
+
+
+class PrefetchedFile:
+    """Contents and metadata of a file read ahead of time."""
+
+    def __init__(
+        self,
+        path: str,
+        data: bytes = b"",
+        stat: Optional[os.stat_result] = None,
+        error: Optional[OSError] = None,
+    ):
+        self.path = path
+        self.data = data
+        self.stat = stat
+        self.error = error
+
+
+class PrefetchingReader:
+    """Read files in scan order on a thread pool, ``window`` files ahead."""
+
+    def __init__(self, paths: Iterable[str], max_workers: int = 8, window: int = 32):
+        self.paths = list(paths)
+        self.window = max(1, window)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prefetch"
+        )
+        self._pending: "deque" = deque()
+        self._next = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {
+            "files_read": 0,
+            "bytes_read": 0,
+            "read_seconds": 0.0,
+            "wait_seconds": 0.0,
+        }
+
+    def _read(self, path: str) -> PrefetchedFile:
+        start = time.perf_counter()
+        try:
+            with open(path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                data = f.read()
+        except OSError as e:
+            return PrefetchedFile(path, error=e)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stats["read_seconds"] += elapsed
+
+        with self._lock:
+            self.stats["files_read"] += 1
+            self.stats["bytes_read"] += len(data)
+        return PrefetchedFile(path, data, stat)
+
+    def _fill(self):
+        while self._next < len(self.paths) and len(self._pending) < self.window:
+            path = self.paths[self._next]
+            self._pending.append(self._pool.submit(self._read, path))
+            self._next += 1
+
+    def __iter__(self) -> Iterator[PrefetchedFile]:
+        """Yield the files in order; time spent blocked counts as I/O wait."""
+        self._fill()
+        while self._pending:
+            future = self._pending.popleft()
+            start = time.perf_counter()
+            prefetched = future.result()
+            self.stats["wait_seconds"] += time.perf_counter() - start
+            self._fill()
+            yield prefetched
+
+    def close(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_metrics(self) -> Dict[str, str]:
+        """I/O statistics formatted for ``ConversionReporter.log_metrics()``."""
+        return {
+            "Files read": str(int(self.stats["files_read"])),
+            "Bytes read": str(int(self.stats["bytes_read"])),
+            "Read time (all threads)": f"{self.stats['read_seconds']:.3f}s",
+            "Pipeline I/O wait": f"{self.stats['wait_seconds']:.3f}s",
+        }
@@ -2,92 +2,509 @@
 Preprocessor for Python 2 syntax to make files parseable by Python 3 tools like fissix.
 
 This module handles basic Python 2 syntax that prevents parsing by Python 3 parsers:
-- Print statements -> print() function calls
+- Print statements -> print() function calls (including ``print >>f, x``
+  and a trailing comma)
 - Exception handling syntax
-- Other minimal syntax fixes
+- Other minimal syntax fixes; ``recover()`` adds exec statements, backquotes,
+  ``raise E, V``, old octal literals and mixed tab indentation
 
 This is NOT a complete Python 2to3 converter, just a minimal preprocessor to enable
 parsing by modern tools like fissix.
+
+The source is read through the tokenizer in one pass, one logical line at a
+time: only the physical lines of the current statement are held in memory,
+lines that need no rewrite are passed through untouched, and string
+literals (docstrings included) are never changed. Backquotes, old octal
+literals and tab indentation are rewritten line by line before the
+tokenizer sees them, since the tokenizer of Python 3.12+ rejects or
+reshapes them.
 """
 
-import re
 import ast
-from typing import List, Tuple
+import io
+import keyword
+import re
+import tokenize
+from typing import AbstractSet, Callable, Iterable, Iterator, List, Optional, Tuple
+
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+_COMPOUND_KEYWORDS = {
+    "if", "elif", "else", "for", "while", "try", "except", "finally", "with",
+    "def", "class",
+}  # fmt: skip
+# Tokens after ``print`` that show it is used as a name (Python 3 code)
+_NOT_PRINT_ARGUMENTS = {
+    "=", ".", ")", "]", "}", ",", ":", ";", "+=", "-=", "*=", "/=", "%=",
+    "**=", "//=", "|=", "&=", "^=", ">>=", "<<=", "@=",
+}  # fmt: skip
+# Rewrites that start at the first token of a simple statement
+_STATEMENT_REWRITES = {"print", "except", "exec", "raise"}
+# Tokens that may appear in the exception class of ``raise E, V``
+_EXCEPTION_OPERATORS = {".", "(", ")", "[", "]"}
+_SKIPPED_TOKENS = {tokenize.COMMENT, tokenize.NL, tokenize.INDENT, tokenize.DEDENT}
+# Rewrites done on physical lines before tokenizing
+_LINE_REWRITES = {"backquote", "octal", "tabs"}
+# 0777 and 0777L; 00 is valid Python 3
+_OLD_OCTAL = re.compile(r"(?<![\w.])0([0-7]*[1-7][0-7]*)[lL]?(?![\w.])")
+
+
+def _mixes_tabs_and_spaces(content: str) -> bool:
+    """Whether any indentation uses tabs while other indentation uses spaces."""
+    kinds = set()
+    for line in content.splitlines():
+        indent = line[: len(line) - len(line.lstrip(" \t"))]
+        if indent and line.strip():
+            kinds.update(indent)
+            if len(kinds) == 2:
+                return True
+    return False
+
+
+class _LineScanner:
+    """Find the code outside strings and comments, one physical line at a time.
+
+    Only string delimiters, escapes and comments are recognized, so lines
+    the tokenizer rejects can be scanned too.
+    """
+
+    def __init__(self):
+        # Delimiter of a string continued from the previous line
+        self.quote = ""
+
+    def code_spans(self, line: str) -> Tuple[bool, List[Tuple[int, int]]]:
+        """Whether the line starts inside a string, and its code spans."""
+        starts_in_string = bool(self.quote)
+        spans = []
+        start: Optional[int] = None if self.quote else 0
+        continued = False
+        i = 0
+        while i < len(line):
+            char = line[i]
+            if self.quote:
+                if char == "\\":
+                    continued = line[i + 1 : i + 2] in ("\n", "\r")
+                    i += 2
+                elif line.startswith(self.quote, i):
+                    i += len(self.quote)
+                    self.quote = ""
+                    start = i
+                else:
+                    i += 1
+            elif char == "#":
+                break
+            elif char in "'\"":
+                spans.append((start, i))
+                triple = line[i : i + 3]
+                self.quote = triple if triple in ('"""', "'''") else char
+                i += len(self.quote)
+            else:
+                i += 1
+        if not self.quote:
+            spans.append((start, i))
+        elif len(self.quote) == 1 and not continued:
+            # Unterminated single-quoted string
+            self.quote = ""
+        return starts_in_string, [(a, b) for a, b in spans if a < b]
 
 
 class Python2SyntaxPreprocessor:
     """Preprocesses Python 2 files to make them parseable by Python 3 tools."""
 
-    def __init__(self):
-        # Regex patterns for Python 2 syntax that prevents parsing
-
-        # Match print statements (not print function calls)
-        # This is a simplified pattern - doesn't handle all edge cases but covers most common ones
-        self.print_statement_pattern = re.compile(
-            r"^(\s*)print\s+([^(].*?)$", re.MULTILINE
-        )
+    # Rewrites applied by preprocess()
+    BASIC_REWRITES = frozenset({"print", "except"})
+    # Wider set used to recover files the 2to3 parser rejects
+    RECOVERY_REWRITES = BASIC_REWRITES | {"exec", "raise", "backquote", "octal", "tabs"}
 
-        # Match except clauses with comma syntax: except Exception, e:
-        self.except_clause_pattern = re.compile(
-            r"^(\s*)except\s+([^,]+),\s*([^:]+):(.*)$", re.MULTILINE
+    def __init__(self):
+        # Physical lines changed by the last preprocessing run
+        self.lines_rewritten = 0
+
+    def preprocess_lines(
+        self, lines: Iterable[str], rewrites: AbstractSet[str] = BASIC_REWRITES
+    ) -> Iterator[str]:
+        """Yield the preprocessed lines of a Python 2 source, in one pass.
+
+        Lines are consumed lazily; each logical line is yielded as soon as the
+        tokenizer reaches its end. If the source cannot be tokenized, the
+        remaining lines are yielded unchanged. ``rewrites`` selects the
+        rewrites to apply (see ``RECOVERY_REWRITES``).
+        """
+        self.lines_rewritten = 0
+        lines = iter(lines)
+        line_rewrites = _LINE_REWRITES & rewrites
+        scanner = _LineScanner()
+        # Lines of the current statement as read and after line rewrites
+        originals: List[str] = []
+        pending: List[str] = []
+        first_row = 1
+
+        def readline() -> str:
+            line = next(lines, "")
+            if line:
+                originals.append(line)
+                if line_rewrites:
+                    line = self._rewrite_line(line, scanner, line_rewrites)
+                pending.append(line)
+            return line
+
+        def flush(count: int, rewritten: Iterable[str]) -> List[str]:
+            rewritten = list(rewritten)
+            self.lines_rewritten += sum(
+                1 for old, new in zip(originals, rewritten) if old != new
+            ) + abs(count - len(rewritten))
+            del originals[:count]
+            del pending[:count]
+            return rewritten
+
+        statement: List[tokenize.TokenInfo] = []
+        try:
+            for tok in tokenize.generate_tokens(readline):
+                if tok.type in (tokenize.NEWLINE, tokenize.ENDMARKER) or (
+                    tok.type == tokenize.NL and not statement
+                ):
+                    count = tok.end[0] - first_row + 1
+                    if tok.type == tokenize.ENDMARKER:
+                        count = len(pending)
+                    chunk = pending[:count]
+                    yield from flush(
+                        count,
+                        self._rewrite_statement(chunk, first_row, statement, rewrites),
+                    )
+                    first_row += count
+                    statement = []
+                elif tok.type not in _SKIPPED_TOKENS and not (
+                    # Python 3 reports the space before a backquote as an error
+                    tok.type == tokenize.ERRORTOKEN and tok.string.isspace()
+                ):
+                    statement.append(tok)
+        except (tokenize.TokenError, SyntaxError):
+            # Unbalanced brackets, bad dedent: only line rewrites for the rest
+            yield from flush(len(pending), pending[:])
+            for line in lines:
+                if line_rewrites:
+                    rewritten = self._rewrite_line(line, scanner, line_rewrites)
+                    self.lines_rewritten += rewritten != line
+                    line = rewritten
+                yield line
+
+    @staticmethod
+    def _rewrite_line(
+        line: str, scanner: _LineScanner, rewrites: AbstractSet[str]
+    ) -> str:
+        """Rewrite backquotes, old octal literals and tab indentation in a line."""
+        in_string, spans = scanner.code_spans(line)
+        edits: List[Tuple[int, int, str]] = []
+        if "tabs" in rewrites and not in_string:
+            indent = line[: len(line) - len(line.lstrip(" \t"))]
+            if "\t" in indent:
+                # Python 2 put tab stops every 8 columns
+                edits.append((0, len(indent), indent.expandtabs(8)))
+        if "backquote" in rewrites:
+            quotes = [i for a, b in spans for i in range(a, b) if line[i] == "`"]
+            if len(quotes) % 2 == 0:
+                for opening, closing in zip(quotes[::2], quotes[1::2]):
+                    edits.append((opening, opening + 1, "repr("))
+                    edits.append((closing, closing + 1, ")"))
+        if "octal" in rewrites:
+            for a, b in spans:
+                for match in _OLD_OCTAL.finditer(line, a, b):
+                    edits.append((match.start(), match.end(), "0o" + match.group(1)))
+        if not edits:
+            return line
+
+        pieces = []
+        position = 0
+        for start, end, replacement in sorted(edits):
+            pieces.append(line[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(line[position:])
+        return "".join(pieces)
+
+    def _rewrite_statement(
+        self,
+        chunk: List[str],
+        first_row: int,
+        tokens: List[tokenize.TokenInfo],
+        rewrites: AbstractSet[str],
+    ) -> Iterator[str]:
+        """Rewrite the physical lines of one logical line, if needed."""
+        wanted = _STATEMENT_REWRITES & rewrites
+        starts = [
+            start
+            for start in self._statement_starts(tokens)
+            if tokens[start].type == tokenize.NAME
+            and tokens[start].string in wanted
+            and (start == 0 or tokens[start].string != "except")
+        ]
+        if not starts:
+            yield from chunk
+            return
+
+        offsets = [0]
+        for line in chunk:
+            offsets.append(offsets[-1] + len(line))
+        text = "".join(chunk)
+
+        def offset(position: Tuple[int, int]) -> int:
+            return offsets[position[0] - first_row] + position[1]
+
+        edits: List[Tuple[Tuple[int, int], Tuple[int, int], str]] = []
+        for start in starts:
+            name = tokens[start].string
+            if name == "print":
+                edits.extend(self._print_edits(tokens, start, text, offset))
+            elif name == "except":
+                edits.extend(self._except_edits(tokens, start))
+            elif name == "exec":
+                edits.extend(self._exec_edits(tokens, start))
+            else:
+                edits.extend(self._raise_edits(tokens, start))
+        if not edits:
+            yield from chunk
+            return
+
+        pieces = []
+        position = 0
+        for start, end, replacement in sorted(edits):
+            pieces.append(text[position : offset(start)])
+            pieces.append(replacement)
+            position = offset(end)
+        pieces.append(text[position:])
+        yield from io.StringIO("".join(pieces)).readlines()
+
+    @staticmethod
+    def _matching(tokens: List[tokenize.TokenInfo], i: int) -> int:
+        """Index of the bracket closing the one at i."""
+        depth = 0
+        for j in range(i, len(tokens)):
+            if tokens[j].type != tokenize.OP:
+                continue
+            if tokens[j].string in _OPENERS:
+                depth += 1
+            elif tokens[j].string in _OPENERS.values():
+                depth -= 1
+                if depth == 0:
+                    return j
+        return len(tokens) - 1
+
+    def _statement_starts(self, tokens: List[tokenize.TokenInfo]) -> List[int]:
+        """Indexes of the first token of each simple statement in a line."""
+        if not tokens:
+            return []
+        starts = [0]
+        compound = tokens[0].string in _COMPOUND_KEYWORDS
+        colon_seen = False
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok.type == tokenize.OP and tok.string in _OPENERS:
+                i = self._matching(tokens, i) + 1
+                continue
+            if tok.type == tokenize.NAME and tok.string == "lambda":
+                compound = False
+            elif tok.type == tokenize.OP and tok.string == ";":
+                starts.append(i + 1)
+            elif tok.type == tokenize.OP and tok.string == ":" and not colon_seen:
+                colon_seen = True
+                if compound:
+                    starts.append(i + 1)
+            i += 1
+        return [s for s in starts if s < len(tokens)]
+
+    def _statement_end(self, tokens: List[tokenize.TokenInfo], i: int) -> int:
+        """Index just past the last token of the simple statement at i."""
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok.type == tokenize.OP and tok.string in _OPENERS:
+                i = self._matching(tokens, i)
+            elif tok.type == tokenize.OP and tok.string == ";":
+                return i
+            i += 1
+        return i
+
+    def _print_edits(
+        self,
+        tokens: List[tokenize.TokenInfo],
+        start: int,
+        text: str,
+        offset: Callable[[Tuple[int, int]], int],
+    ):
+        """Edits turning the print statement at start into a call."""
+        print_tok = tokens[start]
+        end = self._statement_end(tokens, start + 1)
+        if end == start + 1:
+            return [(print_tok.end, print_tok.end, "()")]
+
+        first, last = start + 1, end - 1
+        if tokens[first].type == tokenize.OP:
+            if tokens[first].string in _NOT_PRINT_ARGUMENTS:
+                return []
+            if tokens[first].string == "(" and self._matching(tokens, first) == last:
+                # print(...) already looks like a call
+                return []
+
+        kwargs = []
+        trailing_comma = tokens[last].string == ","
+        if trailing_comma:
+            last -= 1
+            kwargs.append("end=' '")
+        if tokens[first].string == ">>":
+            comma = first + 1
+            while comma <= last and tokens[comma].string != ",":
+                if tokens[comma].string in _OPENERS:
+                    comma = self._matching(tokens, comma)
+                comma += 1
+            if comma == first + 1:
+                return []
+            target = text[offset(tokens[first + 1].start) : offset(tokens[comma - 1].end)]
+            kwargs.append("file=" + target)
+            first = comma + 1
+
+        if first > last:
+            # Only a file (and maybe a trailing comma)
+            closing = ", ".join(kwargs) + ")"
+            return [(print_tok.start, tokens[end - 1].end, "print(" + closing)]
+
+        closing = "".join(", " + kwarg for kwarg in kwargs) + ")"
+        return [
+            (print_tok.start, tokens[first].start, "print("),
+            (tokens[last].end, tokens[end - 1].end, closing),
+        ]
+
+    def _except_edits(self, tokens: List[tokenize.TokenInfo], start: int):
+        """Edits turning ``except E, e:`` into ``except E as e:``."""
+        commas = []
+        i = start + 1
+        while i < len(tokens) and tokens[i].string != ":":
+            if tokens[i].type == tokenize.OP and tokens[i].string in _OPENERS:
+                i = self._matching(tokens, i)
+            elif tokens[i].string == ",":
+                commas.append(i)
+            i += 1
+        if len(commas) != 1 or commas[0] == start + 1 or i != commas[0] + 2:
+            return []
+        comma = commas[0]
+        if tokens[comma + 1].type != tokenize.NAME:
+            return []
+        return [(tokens[comma - 1].end, tokens[comma + 1].start, " as ")]
+
+    def _exec_edits(self, tokens: List[tokenize.TokenInfo], start: int):
+        """Edits turning ``exec code in g, l`` into ``exec(code, g, l)``."""
+        end = self._statement_end(tokens, start + 1)
+        first, last = start + 1, end - 1
+        if first > last or tokens[first].string in _NOT_PRINT_ARGUMENTS:
+            return []
+        if tokens[first].string == "(" and self._matching(tokens, first) == last:
+            return []
+        edits = [(tokens[start].end, tokens[first].start, "(")]
+        i = first
+        while i <= last:
+            if tokens[i].type == tokenize.OP and tokens[i].string in _OPENERS:
+                i = self._matching(tokens, i)
+            elif tokens[i].type == tokenize.NAME and tokens[i].string == "in":
+                # ``expr`` cannot contain a bare ``in``, so this separates
+                # the code from the namespaces
+                if i in (first, last):
+                    return []
+                edits.append((tokens[i - 1].end, tokens[i + 1].start, ", "))
+                break
+            i += 1
+        edits.append((tokens[last].end, tokens[last].end, ")"))
+        return edits
+
+    def _raise_edits(self, tokens: List[tokenize.TokenInfo], start: int):
+        """Edits turning ``raise E, V[, T]`` into ``raise E(V)[.with_traceback(T)]``."""
+        end = self._statement_end(tokens, start + 1)
+        commas = []
+        i = start + 1
+        while i < end:
+            if tokens[i].type == tokenize.OP and tokens[i].string in _OPENERS:
+                i = self._matching(tokens, i)
+            elif tokens[i].string == ",":
+                commas.append(i)
+            i += 1
+        if len(commas) not in (1, 2) or commas[0] == start + 1:
+            return []
+        for tok in tokens[start + 1 : commas[0]]:
+            # Only a (dotted, subscripted or called) name as the class
+            if tok.type == tokenize.OP and tok.string not in _EXCEPTION_OPERATORS:
+                return []
+            if tok.type not in (tokenize.NAME, tokenize.OP) or keyword.iskeyword(
+                tok.string
+            ):
+                return []
+        stops = commas[1:] + [end]
+        value_first, value_last = commas[0] + 1, stops[0] - 1
+        if value_first > value_last:
+            return []
+
+        exception_end = tokens[commas[0] - 1].end
+        if tokens[value_first].string == "(" and (
+            self._matching(tokens, value_first) == value_last
+        ):
+            # raise E, (a, b) passes the tuple items as arguments
+            edits = [(exception_end, tokens[value_first].start, "")]
+            closing = ""
+        else:
+            edits = [(exception_end, tokens[value_first].start, "(")]
+            closing = ")"
+        if len(commas) == 1:
+            edits.append((tokens[value_last].end, tokens[value_last].end, closing))
+            return edits
+        if commas[1] + 1 >= end:
+            return []
+        edits.append(
+            (
+                tokens[value_last].end,
+                tokens[commas[1] + 1].start,
+                closing + ".with_traceback(",
+            )
         )
+        edits.append((tokens[end - 1].end, tokens[end - 1].end, ")"))
+        return edits
 
     def preprocess_print_statements(self, content: str) -> str:
         """Convert print statements to print() function calls."""
-
-        def replace_print_statement(match):
-            indent = match.group(1)
-            args = match.group(2).strip()
-
-            # Handle special cases
-            if not args:
-                # Just 'print' with no arguments
-                return f"{indent}print()"
-
-            # Handle multiple arguments separated by commas
-            # This is a basic implementation - might need refinement for complex cases
-            if args.endswith(","):
-                # Print statement ending with comma (no newline)
-                args = args[:-1].strip()
-                if args:
-                    return f"{indent}print({args}, end=' ')"
-                else:
-                    return f"{indent}print(end=' ')"
-            else:
-                # Regular print statement
-                return f"{indent}print({args})"
-
-        return self.print_statement_pattern.sub(replace_print_statement, content)
+        return "".join(self.preprocess_lines(io.StringIO(content), {"print"}))
 
     def preprocess_except_clauses(self, content: str) -> str:
         """Convert old except syntax to new syntax."""
-
-        def replace_except_clause(match):
-            indent = match.group(1)
-            exception_type = match.group(2).strip()
-            variable = match.group(3).strip()
-            rest = match.group(4)
-
-            return f"{indent}except {exception_type} as {variable}:{rest}"
-
-        return self.except_clause_pattern.sub(replace_except_clause, content)
+        return "".join(self.preprocess_lines(io.StringIO(content), {"except"}))
 
     def preprocess(self, content: str) -> str:
         """Apply all preprocessing steps to make Python 2 code parseable by Python 3."""
+        return "".join(self.preprocess_lines(io.StringIO(content)))
 
-        # Apply transformations in order
-        content = self.preprocess_print_statements(content)
-        content = self.preprocess_except_clauses(content)
+    def recover(self, content: str) -> str:
+        """Apply the wider recovery rewrites to a file 2to3 could not parse.
 
-        return content
+        Besides print statements and except clauses this rewrites exec
+        statements, backquotes, ``raise E, V`` and old octal literals, and
+        expands tabs in the indentation of files mixing tabs and spaces.
+        The result has no print statements left.
+        """
+        rewrites = self.RECOVERY_REWRITES
+        if not _mixes_tabs_and_spaces(content):
+            rewrites = rewrites - {"tabs"}
+        return "".join(self.preprocess_lines(io.StringIO(content), rewrites))
 
     def preprocess_file(self, file_path: str) -> str:
         """Preprocess a file and return the modified content."""
-        with open(file_path, "r", encoding="utf-8") as f:
-            original_content = f.read()
+        # tokenize.open() honours the PEP 263 coding cookie
+        with tokenize.open(file_path) as f:
+            return "".join(self.preprocess_lines(f))
+
+    def write_preprocessed_file(self, file_path: str, output_path: str) -> int:
+        """Stream a preprocessed copy of a file to output_path.
 
-        preprocessed_content = self.preprocess(original_content)
-        return preprocessed_content
+        Memory use is bounded by the longest statement, not the file size.
+        Returns the number of rewritten lines.
+        """
+        with tokenize.open(file_path) as source:
+            with open(output_path, "w", encoding=source.encoding) as output:
+                output.writelines(self.preprocess_lines(source))
+        return self.lines_rewritten
 
     def can_parse_as_python3(self, content: str) -> bool:
         """Check if content can be parsed as valid Python 3 syntax."""
@@ -101,19 +518,24 @@ class Python2SyntaxPreprocessor:
 def test_preprocessor():
     """Test the preprocessor with some sample Python 2 code."""
 
-    sample_py2_code = """
+    sample_py2_code = '''
 def test_function():
+    """Docstrings are left alone:
+    print "not a statement"
+    """
     print "Hello, World!"
     print "Multiple", "arguments"
     print
-    
+    print >>sys.stderr, "Warning:", (1,
+                                     2)
+
     try:
         x = 1 / 0
     except ZeroDivisionError, e:
         print "Error:", e
-    
+
     print "Done",
-"""
+'''
 
     preprocessor = Python2SyntaxPreprocessor()
 
@@ -0,0 +1,281 @@
+"""
+In-process refactoring engine.
+
+Runs the same two stages as the command line tools used by
+``Python2to3Converter`` (2to3, then fissix) on source strings, without
+starting a subprocess or touching the filesystem. Fixer loading is the
+expensive part, so the refactoring tools are created lazily and reused.
+"""
+
+import warnings
+from itertools import chain
+from typing import Dict, List, Optional
+
+from .incremental import refactor_incrementally, track_new_names
+
+
+def _load_stage_one_package():
+    """Return the refactor module and fixer package used for stage 1."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            from lib2to3 import refactor
+
+        return refactor, "lib2to3.fixes"
+    except ImportError:
+        # lib2to3 was removed in Python 3.13; fissix ships the same fixers
+        from fissix import refactor
+
+        return refactor, "fissix.fixes"
+
+
+def _load_stage_two_package():
+    """Return the refactor module and fixer package used for stage 2."""
+    from fissix import refactor
+
+    return refactor, "fissix.fixes"
+
+
+class FixerHit(Exception):
+    """Raised to stop refactoring at the first fixer that changes the tree."""
+
+    def __init__(self, fixer_name: str):
+        super().__init__(fixer_name)
+        self.fixer_name = fixer_name
+
+
+def get_fixer_name(fixer) -> str:
+    """Module name of a fixer instance, e.g. ``fix_print``."""
+    return type(fixer).__module__.rsplit(".", 1)[-1]
+
+
+def _count_fixer_hits(tool):
+    """Wrap every fixer's transform to count the ones that change the tree.
+
+    Counting is off (``tool.hit_counts is None``) during normal conversions.
+    """
+    tool.hit_counts = None
+    tool.stop_at_first_hit = False
+
+    def counting(name, transform):
+        def counting_transform(node, results):
+            was_changed = node.was_changed
+            new = transform(node, results)
+            # Some fixers (fix_unicode) return an identical replacement
+            if tool.hit_counts is not None and (
+                (new is not None and str(new) != str(node))
+                or (node.was_changed and not was_changed)
+            ):
+                tool.hit_counts[name] = tool.hit_counts.get(name, 0) + 1
+                if tool.stop_at_first_hit:
+                    raise FixerHit(name)
+            return new
+
+        return counting_transform
+
+    for fixer in chain(tool.pre_order, tool.post_order):
+        fixer.transform = counting(get_fixer_name(fixer), fixer.transform)
+
+
+def _use_module_index(tool, engine):
+    """Let fix_import ask the engine's module index instead of the filesystem."""
+    for fixer in chain(tool.pre_order, tool.post_order):
+        if get_fixer_name(fixer) != "fix_import":
+            continue
+
+        def probably_a_local_import(
+            imp_name, fixer=fixer, probe=fixer.probably_a_local_import
+        ):
+            index = engine.module_index
+            if index is None or not index.covers(fixer.filename):
+                return probe(imp_name)
+            return index.probably_a_local_import(fixer.filename, imp_name)
+
+        fixer.probably_a_local_import = probably_a_local_import
+
+
+class RefactoringEngine:
+    """Two-stage 2to3 + fissix refactoring of source strings.
+
+    Custom fixer plugins (see ``plugins.py``) run in the fissix stage.
+    """
+
+    def __init__(
+        self, use_fissix_second_stage: bool = True, plugins=None, chunk_cache=None
+    ):
+        self.use_fissix_second_stage = use_fissix_second_stage
+        self.plugins: List = list(plugins or [])
+        self.plugin_timings: Dict[str, float] = {}
+        # ProjectModuleIndex used by fix_import instead of probing the disk
+        self.module_index = None
+        # ChunkCache for incremental conversion (see incremental.py); plugin
+        # fixers may keep any state, so the fissix stage only uses it
+        # without plugins
+        self.chunk_cache = chunk_cache
+        self._stage_one_tool = None
+        self._stage_two_tool = None
+
+    def _create_tool(self, loader, plugins: Optional[List] = None):
+        refactor, fixer_pkg = loader()
+        # Same fixer selection as the command line tools without -f/-x:
+        # every fixer in the package except the explicit-only ones
+        fixer_names = sorted(refactor.get_fixers_from_package(fixer_pkg))
+        if plugins:
+            from .plugins import PluginRefactoringTool
+
+            tool = PluginRefactoringTool(
+                fixer_names, {}, [], plugins, self.plugin_timings
+            )
+        else:
+            tool = refactor.RefactoringTool(fixer_names, {}, [])
+        _count_fixer_hits(tool)
+        _use_module_index(tool, self)
+        track_new_names(tool)
+        # Grammar for sources already using the print function
+        tool.print_function_grammar = refactor.pygram.python_grammar_no_print_statement
+        return tool
+
+    def stage_one_tool(self):
+        """Get the (cached) 2to3 refactoring tool."""
+        if self._stage_one_tool is None:
+            self._stage_one_tool = self._create_tool(_load_stage_one_package)
+        return self._stage_one_tool
+
+    def stage_two_tool(self):
+        """Get the (cached) fissix refactoring tool."""
+        if self._stage_two_tool is None:
+            self._stage_two_tool = self._create_tool(
+                _load_stage_two_package, self.plugins
+            )
+        return self._stage_two_tool
+
+    def warm_up(self):
+        """Load all fixers up front instead of on the first conversion."""
+        self.stage_one_tool()
+        if self.use_fissix_second_stage:
+            self.stage_two_tool()
+
+    def probably_a_local_import(self, file_name: str, imp_name: str) -> bool:
+        """fix_import's decision on whether an import in file_name is relative."""
+        index = self.module_index
+        if index is not None and index.covers(file_name):
+            return index.probably_a_local_import(file_name, imp_name)
+        tool = self.stage_one_tool()
+        for fixer in chain(tool.pre_order, tool.post_order):
+            if get_fixer_name(fixer) == "fix_import":
+                fixer.filename = file_name
+                return fixer.probably_a_local_import(imp_name)
+        return False
+
+    @staticmethod
+    def refactor_with(tool, source: str, name: str) -> str:
+        """Refactor source with a single tool, raising on parse errors."""
+        # The command line tools append a newline before parsing and strip
+        # it again afterwards; do the same so the output is identical.
+        tree = tool.refactor_string(source + "\n", name)
+        if not tree.was_changed:
+            return source
+        return str(tree)[:-1]
+
+    @classmethod
+    def refactor_print_function(cls, tool, source: str, name: str) -> str:
+        """Refactor source parsed without the print statement.
+
+        This is how a ``from __future__ import print_function`` file is
+        parsed, so ``print(x, end="")`` is accepted.
+        """
+        grammar = tool.grammar
+        tool.grammar = tool.driver.grammar = tool.print_function_grammar
+        try:
+            return cls.refactor_with(tool, source, name)
+        finally:
+            tool.grammar = tool.driver.grammar = grammar
+
+    def refactor_stage_one(
+        self, source: str, name: str = "<string>", print_function: bool = False
+    ) -> str:
+        """Run the 2to3 stage on source.
+
+        ``print_function`` parses source as if it imported print_function.
+        """
+        if print_function:
+            return self.refactor_print_function(self.stage_one_tool(), source, name)
+        if self.chunk_cache is not None:
+            return refactor_incrementally(
+                self.stage_one_tool(), self.chunk_cache, "stage-one", source, name
+            )
+        return self.refactor_with(self.stage_one_tool(), source, name)
+
+    def refactor_stage_two(
+        self, source: str, name: str = "<string>", print_function: bool = False
+    ) -> str:
+        """Run the fissix stage on source."""
+        if print_function:
+            return self.refactor_print_function(self.stage_two_tool(), source, name)
+        if self.chunk_cache is not None and not self.plugins:
+            return refactor_incrementally(
+                self.stage_two_tool(), self.chunk_cache, "stage-two", source, name
+            )
+        return self.refactor_with(self.stage_two_tool(), source, name)
+
+    def _refactor_counting(
+        self,
+        tool,
+        source: str,
+        name: str,
+        hits: Dict[str, int],
+        stop: bool,
+        print_function: bool = False,
+    ) -> str:
+        tool.hit_counts = hits
+        tool.stop_at_first_hit = stop
+        try:
+            if print_function:
+                return self.refactor_print_function(tool, source, name)
+            return self.refactor_with(tool, source, name)
+        finally:
+            tool.hit_counts = None
+            tool.stop_at_first_hit = False
+
+    def count_fixer_hits(
+        self,
+        source: str,
+        name: str = "<string>",
+        stop_at_first_hit: bool = False,
+        print_function: bool = False,
+    ) -> Dict[str, int]:
+        """Count the fixer transforms that would change source.
+
+        With ``stop_at_first_hit`` refactoring stops at the first fixer that
+        changes anything, which is all a check needs. Parse errors in the
+        2to3 stage are raised; like ``convert_source``, a fissix stage that
+        cannot parse the 2to3 output is skipped. ``print_function`` parses
+        without the print statement, as for recovered files.
+        """
+        hits: Dict[str, int] = {}
+        try:
+            output = self._refactor_counting(
+                self.stage_one_tool(),
+                source,
+                name,
+                hits,
+                stop_at_first_hit,
+                print_function,
+            )
+            if self.use_fissix_second_stage:
+                try:
+                    self._refactor_counting(
+                        self.stage_two_tool(),
+                        output,
+                        name,
+                        hits,
+                        stop_at_first_hit,
+                        print_function,
+                    )
+                except FixerHit:
+                    raise
+                except Exception:
+                    pass
+        except FixerHit:
+            pass
+        return hits
@@ -0,0 +1,61 @@
+"""
+Byte-level reading and writing of Python source files.
+
+Files are read as bytes once. The encoding comes from the BOM or the
+PEP 263 coding cookie (``tokenize.detect_encoding``), and line endings are
+normalized to ``\\n`` for the fixers, which only ever insert ``\\n``. The
+converted text is written back in the original encoding with the original
+line endings.
+"""
+
+import io
+import tokenize
+from typing import Tuple
+
+
+class DecodedSource:
+    """Source text plus what is needed to write it back unchanged."""
+
+    def __init__(self, text: str, encoding: str = "utf-8", newline: str = "\n"):
+        self.text = text
+        self.encoding = encoding
+        self.newline = newline
+
+    def encode(self, text: str) -> bytes:
+        """Encode converted text like the original file."""
+        if self.newline != "\n":
+            text = text.replace("\n", self.newline)
+        return text.encode(self.encoding)
+
+
+def detect_newline(data: bytes) -> str:
+    """Line ending of the first line (``\\n`` when there is none)."""
+    end = data.find(b"\n")
+    if end > 0 and data[end - 1 : end] == b"\r":
+        return "\r\n"
+    if end < 0 and b"\r" in data:
+        return "\r"
+    return "\n"
+
+
+def decode_source(data: bytes) -> DecodedSource:
+    """Decode source bytes; raises SyntaxError for a bad coding cookie."""
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    newline = detect_newline(data)
+    text = data.decode(encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return DecodedSource(text, encoding, newline)
+
+
+def read_source(file_path: str) -> Tuple[bytes, DecodedSource]:
+    """Read a file once and return its bytes and decoded source."""
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return data, decode_source(data)
+
+
+def write_source(file_path: str, text: str, source: DecodedSource):
+    """Write converted text in the encoding and line endings of source."""
+    with open(file_path, "wb") as f:
+        f.write(source.encode(text))
@@ -0,0 +1,308 @@
+"""
+Watch mode: re-convert and re-validate Python files as they change.
+
+``FileWatcher`` reports changed ``.py`` files under a directory, using
+inotify on Linux and polling elsewhere, and debounces bursts of events so
+an editor save triggers one callback. ``WatchSession`` converts and
+validates each changed file on its own, revalidates the project modules
+importing it, and pushes the results to the reporter and an optional
+callback (the GUI results panel), without rescanning the tree.
+"""
+
+import hashlib
+import os
+import select
+import shutil
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .engine import ConversionResult, Python2to3Converter
+from .incremental import ChunkCache
+from .source_io import read_source
+
+SKIP_DIRS = {".git", "__pycache__", ".pytest_cache", "venv", "env"}
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _walk_directories(directory: str):
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        yield root, files
+
+
+class _InotifyBackend:
+    """Recursive inotify watch through libc (Linux only)."""
+
+    def __init__(self, directory: str):
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self._watches: Dict[int, str] = {}
+        self._add_tree(directory)
+
+    def _add_tree(self, directory: str):
+        for root, _ in _walk_directories(directory):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(root), WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = root
+
+    def read_events(self, timeout: float) -> List[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        data = os.read(self.fd, 64 * 1024)
+        paths = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name.decode() not in SKIP_DIRS:
+                    # New directories (and anything already in them) need watches
+                    self._add_tree(path)
+                    for root, files in _walk_directories(path):
+                        paths.extend(os.path.join(root, f) for f in files)
+                continue
+            paths.append(path)
+
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """Portable fallback that compares file mtimes and sizes."""
+
+    def __init__(self, directory: str, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for root, files in _walk_directories(self.directory):
+            for file in files:
+                if file.endswith(".py"):
+                    path = os.path.join(root, file)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def read_events(self, timeout: float) -> List[str]:
+        time.sleep(min(timeout, self.interval))
+        snapshot = self._scan()
+        changed = [
+            path
+            for path, signature in snapshot.items()
+            if self._snapshot.get(path) != signature
+        ]
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class FileWatcher:
+    """Call back with each changed Python file once its events settle."""
+
+    def __init__(
+        self,
+        directory: str,
+        callback: Callable[[str], None],
+        debounce: float = 0.3,
+        use_inotify: Optional[bool] = None,
+        poll_interval: float = 1.0,
+    ):
+        self.directory = os.path.abspath(directory)
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        self.use_inotify = use_inotify
+        self.backend_name = ""
+        self._backend = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _create_backend(self):
+        if self.use_inotify:
+            try:
+                self.backend_name = "inotify"
+                return _InotifyBackend(self.directory)
+            except (OSError, AttributeError, TypeError):
+                # No libc inotify (or no watches left); poll instead
+                pass
+        self.backend_name = "polling"
+        return _PollingBackend(self.directory, self.poll_interval)
+
+    def start(self):
+        """Start watching on a background thread."""
+        self._backend = self._create_backend()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching and wait for the watcher thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        pending: Dict[str, float] = {}
+        try:
+            while not self._stop_event.is_set():
+                if pending:
+                    oldest = min(pending.values())
+                    timeout = max(0.0, oldest + self.debounce - time.monotonic())
+                else:
+                    timeout = 0.5
+
+                for path in self._backend.read_events(timeout):
+                    if path.endswith(".py"):
+                        pending[path] = time.monotonic()
+
+                now = time.monotonic()
+                ready = [p for p, t in pending.items() if now - t >= self.debounce]
+                for path in sorted(ready):
+                    del pending[path]
+                    try:
+                        self.callback(path)
+                    except Exception as e:
+                        print(f"Watch callback failed for {path}: {e}")
+        finally:
+            self._backend.close()
+
+
+class WatchSession:
+    """Convert and validate single files as the watcher reports them."""
+
+    def __init__(
+        self,
+        directory: str,
+        converter: Optional[Python2to3Converter] = None,
+        validator=None,
+        reporter=None,
+        on_result: Optional[Callable] = None,
+        output_dir: Optional[str] = None,
+        backup: bool = True,
+        debounce: float = 0.3,
+        use_inotify: Optional[bool] = None,
+    ):
+        self.directory = os.path.abspath(directory)
+        # Edits usually touch one function, so convert chunk by chunk
+        self.converter = converter or Python2to3Converter(chunk_cache=ChunkCache())
+        self.validator = validator
+        self.reporter = reporter
+        self.on_result = on_result
+        self.output_dir = os.path.abspath(output_dir) if output_dir else None
+        self.backup = backup
+        # Hashes of content this session wrote, so its own writes are ignored
+        self._written: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.watcher = FileWatcher(
+            self.directory, self.process_file, debounce, use_inotify
+        )
+
+    def start(self):
+        if self.validator is not None and self.validator.import_graph is None:
+            self.validator.build_import_graph(self.output_dir or self.directory)
+        self.watcher.start()
+
+    def stop(self):
+        self.watcher.stop()
+
+    def _target_path(self, file_path: str) -> str:
+        if self.output_dir is None:
+            return file_path
+        relative = os.path.relpath(file_path, self.directory)
+        return os.path.join(self.output_dir, relative)
+
+    def process_file(self, file_path: str) -> Optional[ConversionResult]:
+        """Convert and validate one file; returns None if nothing was done."""
+        if self.output_dir and file_path.startswith(self.output_dir + os.sep):
+            return None
+
+        try:
+            data, source = read_source(file_path)
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            # Deleted or still being written; a later event will catch up
+            return None
+
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if self._written.get(file_path) == digest:
+                return None
+
+            result = self.converter.convert_source(source.text, file_path)
+            target = self._target_path(file_path)
+
+            if result.success and (self.output_dir or result.output != source.text):
+                if self.output_dir:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    if os.path.lexists(target):
+                        # Mirror trees hardlink unchanged files to the sources
+                        os.unlink(target)
+                elif self.backup and not os.path.exists(f"{file_path}.py2bak"):
+                    shutil.copy2(file_path, f"{file_path}.py2bak")
+
+                output = source.encode(result.output)
+                with open(target, "wb") as f:
+                    f.write(output)
+                if target == file_path:
+                    self._written[file_path] = hashlib.sha256(output).hexdigest()
+
+            validation = None
+            dependents = []
+            if result.success and self.validator is not None:
+                validation, *dependents = self.validator.revalidate_changed([target])
+
+        if self.reporter is not None:
+            self.reporter.update_file_conversion(
+                file_path, result.success, result.changes_made, result.error
+            )
+            for checked in ([validation] if validation else []) + dependents:
+                errors = checked.import_errors + checked.builtin_errors
+                if checked.syntax_error:
+                    errors.insert(0, checked.syntax_error)
+                self.reporter.log_file_validation(
+                    checked.file_path, checked.overall_valid, errors
+                )
+
+        if self.on_result is not None:
+            self.on_result(file_path, result, validation)
+
+        return result
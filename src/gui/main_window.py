@@ -6,6 +6,10 @@ from pathlib import Path
 import webbrowser
 
 from ..converter.engine import Python2to3Converter, ConversionResult
+from ..converter.incremental import ChunkCache
+from ..converter.plugins import discover_plugins
+from ..converter.watcher import WatchSession
+from ..tester.validator import ConvertedCodeValidator
 from ..reporter.logger import ConversionReporter
 
 
@@ -24,6 +28,7 @@ class MainWindow:
         # Initialize components
         self.converter = None
         self.reporter = None
+        self.watch_session = None
 
         # Setup GUI
         self.setup_gui()
@@ -125,6 +130,11 @@ class MainWindow:
         )
         self.restore_button.pack(side=tk.LEFT, padx=5)
 
+        self.watch_button = ttk.Button(
+            button_frame, text="Watch for Changes", command=self.toggle_watch
+        )
+        self.watch_button.pack(side=tk.LEFT, padx=5)
+
         self.view_logs_button = ttk.Button(
             button_frame, text="View Logs", command=self.view_logs, state="normal"
         )  # Always enabled
@@ -303,6 +313,7 @@ class MainWindow:
             self.converter = Python2to3Converter(
                 progress_callback=self.update_progress,
                 use_fissix_second_stage=self.use_fissix_enhancement.get(),
+                fixer_plugins=discover_plugins(),
             )
 
             # Find Python files
@@ -343,6 +354,14 @@ class MainWindow:
 
             # Show summary
             summary = self.converter.get_summary()
+            if self.converter.io_metrics:
+                self.reporter.log_metrics("I/O", self.converter.io_metrics)
+            plugin_timings = self.converter.get_plugin_timings()
+            if plugin_timings:
+                self.reporter.log_metrics(
+                    "Fixer plugins",
+                    {name: f"{secs:.3f}s" for name, secs in plugin_timings.items()},
+                )
             self.reporter.log_completion()
 
             self.log_to_results("\n" + "=" * 50, "INFO")
@@ -382,6 +401,66 @@ class MainWindow:
             self.fissix_checkbox.config(state="normal")
             self.update_progress("Conversion complete", 100)
 
+    def toggle_watch(self):
+        """Start or stop re-converting files as they change."""
+        if self.watch_session is not None:
+            self.watch_session.stop()
+            self.watch_session = None
+            self.reporter.log_completion()
+            self.watch_button.config(text="Watch for Changes")
+            self.convert_button.config(state="normal")
+            self.log_to_results("Stopped watching for changes", "INFO")
+            self.update_status("Ready")
+            return
+
+        if not self.validate_directory():
+            return
+
+        directory = self.selected_directory.get()
+        self.reporter = ConversionReporter()
+        self.converter = Python2to3Converter(
+            use_fissix_second_stage=self.use_fissix_enhancement.get(),
+            fixer_plugins=discover_plugins(),
+            chunk_cache=ChunkCache(),
+        )
+        self.watch_session = WatchSession(
+            directory,
+            self.converter,
+            ConvertedCodeValidator(),
+            self.reporter,
+            on_result=self.on_watch_result,
+            backup=self.create_backup.get(),
+        )
+        self.reporter.log_start(directory, 0)
+        self.watch_session.start()
+
+        self.watch_button.config(text="Stop Watching")
+        self.convert_button.config(state="disabled")
+        backend = self.watch_session.watcher.backend_name
+        self.log_to_results(f"Watching {directory} for changes ({backend})", "INFO")
+        self.update_status(f"Watching {directory}")
+
+    def on_watch_result(self, file_path, result, validation):
+        """Called from the watcher thread; hand the result to the Tk thread."""
+        self.root.after(0, self.show_watch_result, file_path, result, validation)
+
+    def show_watch_result(self, file_path, result, validation):
+        """Show the result of re-converting a single changed file."""
+        name = os.path.basename(file_path)
+        if not result.success:
+            self.log_to_results(f"✗ Failed: {name} - {result.error}", "ERROR")
+        elif validation is not None and not validation.overall_valid:
+            errors = [validation.syntax_error] if validation.syntax_error else []
+            errors.extend(validation.import_errors + validation.builtin_errors)
+            self.log_to_results(f"⚠ Invalid: {name} - {'; '.join(errors)}", "WARNING")
+        elif result.changes_made:
+            self.log_to_results(f"✓ Converted: {name}", "SUCCESS")
+        else:
+            self.log_to_results(f"○ No changes: {name}", "INFO")
+
+        if self.create_backup.get():
+            self.restore_button.config(state="normal")
+
     def restore_backups(self):
         """Restore backup files."""
         if not self.converter:
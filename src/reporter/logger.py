@@ -51,6 +51,8 @@ class ConversionReporter:
             "errors": [],
             "warnings": [],
             "file_details": [],
+            "validation": {},
+            "metrics": {},
         }
 
     def log_start(self, directory: str, total_files: int):
@@ -96,6 +98,49 @@ class ConversionReporter:
             }
         )
 
+    def update_file_conversion(
+        self, file_path: str, success: bool, changes_made: bool = False, error: str = ""
+    ):
+        """Log a new result for a file, replacing any earlier one (watch mode)."""
+        relative_path = os.path.relpath(file_path)
+
+        for detail in self.conversion_data["file_details"]:
+            if detail["file_path"] != relative_path:
+                continue
+            if detail["success"]:
+                self.conversion_data["successful_conversions"] -= 1
+                if detail["changes_made"]:
+                    self.conversion_data["files_modified"] -= 1
+                else:
+                    self.conversion_data["files_unchanged"] -= 1
+            else:
+                self.conversion_data["failed_conversions"] -= 1
+
+        self.conversion_data["file_details"] = [
+            d
+            for d in self.conversion_data["file_details"]
+            if d["file_path"] != relative_path
+        ]
+        self.conversion_data["errors"] = [
+            e for e in self.conversion_data["errors"] if e["file"] != relative_path
+        ]
+        self.log_file_conversion(file_path, success, changes_made, error)
+
+    def log_file_validation(self, file_path: str, valid: bool, errors: List[str]):
+        """Log the validation result of a converted file."""
+        relative_path = os.path.relpath(file_path)
+
+        if valid:
+            self.logger.info(f"✓ Valid: {relative_path}")
+        else:
+            self.logger.warning(f"✗ Invalid: {relative_path} - {'; '.join(errors)}")
+
+        self.conversion_data["validation"][relative_path] = {
+            "valid": valid,
+            "errors": errors,
+            "timestamp": datetime.now().isoformat(),
+        }
+
     def log_warning(self, message: str, file_path: str = ""):
         """Log a warning message."""
         full_message = f"{message}" + (f" in {file_path}" if file_path else "")
@@ -108,6 +153,12 @@ class ConversionReporter:
             }
         )
 
+    def log_metrics(self, section: str, metrics: Dict[str, Any]):
+        """Record a named group of run metrics (timings, counters, ...)."""
+        details = ", ".join(f"{key}={value}" for key, value in metrics.items())
+        self.logger.info(f"{section}: {details}")
+        self.conversion_data["metrics"][section] = metrics
+
     def log_completion(self):
         """Log the completion of conversion process."""
         self.conversion_data["end_time"] = datetime.now().isoformat()
@@ -213,6 +264,18 @@ class ConversionReporter:
     </div>
 """
 
+        # Add run metrics recorded by the conversion modes
+        for section, metrics in self.conversion_data["metrics"].items():
+            html_content += f"""
+    <div class="file-list">
+        <h2>{section}</h2>
+        <table>
+            <tr><th>Metric</th><th>Value</th></tr>
+"""
+            for key, value in metrics.items():
+                html_content += f"<tr><td>{key}</td><td>{value}</td></tr>"
+            html_content += "</table></div>"
+
         # Add failed conversions section with VS Code links
         if self.conversion_data["errors"]:
             html_content += """
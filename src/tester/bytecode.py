@@ -0,0 +1,146 @@
+"""
+Bytecode precompilation of a converted project.
+
+The first run of a converted project's tests compiles every module. The
+``BytecodeCompiler`` writes the ``__pycache__`` files ahead of time the
+way ``compileall`` does (timestamp-based pycs, skipping files whose pyc
+is current), but compiles the ASTs the validator already parsed instead
+of reading and parsing each file again. With several workers the files
+are compiled on a process pool; workers get only the paths and parse
+their share of the files themselves, since the parsed-module cache would
+otherwise be pickled to every worker under spawn and forkserver.
+"""
+
+import importlib.util
+import marshal
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from .module_cache import ParsedModuleCache
+
+
+class CompileResult:
+    """Outcome of compiling one file (``skipped`` if its pyc was current)."""
+
+    def __init__(
+        self,
+        file_path: str,
+        pyc_path: str,
+        ok: bool,
+        elapsed: float = 0.0,
+        error: str = "",
+        skipped: bool = False,
+    ):
+        self.file_path = file_path
+        self.pyc_path = pyc_path
+        self.ok = ok
+        self.elapsed = elapsed
+        self.error = error
+        self.skipped = skipped
+
+
+def _pyc_header(mtime: float, size: int) -> bytes:
+    return (
+        importlib.util.MAGIC_NUMBER
+        + (0).to_bytes(4, "little")
+        + (int(mtime) & 0xFFFFFFFF).to_bytes(4, "little")
+        + (size & 0xFFFFFFFF).to_bytes(4, "little")
+    )
+
+
+def compile_file(file_path: str, module_cache: ParsedModuleCache) -> CompileResult:
+    """Write the pyc of one file, compiling its cached AST."""
+    pyc_path = importlib.util.cache_from_source(file_path)
+    start = time.perf_counter()
+    try:
+        stat = os.stat(file_path)
+        header = _pyc_header(stat.st_mtime, stat.st_size)
+        try:
+            with open(pyc_path, "rb") as f:
+                if f.read(len(header)) == header:
+                    return CompileResult(file_path, pyc_path, True, skipped=True)
+        except OSError:
+            pass
+
+        module = module_cache.get(file_path)
+        if module.error is not None:
+            raise module.error
+        # Also raises the errors ast.parse() lets through (misplaced
+        # nonlocal, return outside a function, ...)
+        code = compile(module.tree, file_path, "exec", dont_inherit=True)
+
+        directory = os.path.dirname(pyc_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header + marshal.dumps(code))
+            os.replace(temp_path, pyc_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except SyntaxError as e:
+        error = f"Syntax error at line {e.lineno}: {e.msg}"
+        return CompileResult(
+            file_path, pyc_path, False, time.perf_counter() - start, error
+        )
+    except Exception as e:
+        return CompileResult(
+            file_path, pyc_path, False, time.perf_counter() - start, str(e)
+        )
+    return CompileResult(file_path, pyc_path, True, time.perf_counter() - start)
+
+
+# Parsed-module cache of a process-pool worker
+_worker_cache: Optional[ParsedModuleCache] = None
+
+
+def _init_compile_worker():
+    global _worker_cache
+    # Each file is compiled once, so only the entry in use is kept
+    _worker_cache = ParsedModuleCache(max_bytes=0)
+
+
+def _compile_in_worker(file_path: str) -> CompileResult:
+    return compile_file(file_path, _worker_cache)
+
+
+class BytecodeCompiler:
+    """Compile files to ``__pycache__`` serially or on a process pool."""
+
+    def __init__(
+        self, module_cache: Optional[ParsedModuleCache] = None, workers: int = 1
+    ):
+        if module_cache is None:
+            module_cache = ParsedModuleCache()
+        self.module_cache = module_cache
+        self.workers = workers
+        self.stats = {"compiled": 0, "skipped": 0, "failed": 0, "compile_time": 0.0}
+
+    def compile_files(self, file_paths: Iterable[str]) -> Iterator[CompileResult]:
+        """Compile files, yielding results in input order."""
+        file_paths = list(file_paths)
+        if self.workers <= 1 or len(file_paths) < 2:
+            results = (compile_file(f, self.module_cache) for f in file_paths)
+            yield from map(self._count, results)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_compile_worker,
+        ) as pool:
+            results = pool.map(_compile_in_worker, file_paths, chunksize=16)
+            yield from map(self._count, results)
+
+    def _count(self, result: CompileResult) -> CompileResult:
+        if result.skipped:
+            self.stats["skipped"] += 1
+        elif result.ok:
+            self.stats["compiled"] += 1
+        else:
+            self.stats["failed"] += 1
+        self.stats["compile_time"] += result.elapsed
+        return result
@@ -0,0 +1,218 @@
+"""
+Import graph of the modules in a converted project.
+
+Every project file is a node named by its dotted module path below the
+project root (``utils/string_helper.py`` is ``utils.string_helper``).
+Each file records the project module names its imports could refer to,
+whether or not they exist yet, so the files that depend on a module can
+be found after it changed, was added or was deleted. Internal imports are
+resolved against the graph, including the names a ``from ... import``
+takes from a project module.
+"""
+
+import ast
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def top_level_names(tree: ast.Module) -> Optional[Set[str]]:
+    """Names bound at module level, or None if they cannot be known statically."""
+    names: Set[str] = set()
+
+    def bind(target: ast.AST):
+        for node in ast.walk(target):
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+
+    def visit(body: List[ast.stmt]) -> bool:
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.add(node.name)
+                if node.name == "__getattr__":
+                    return False
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                for alias in node.names:
+                    if alias.name == "*":
+                        return False
+                    names.add(alias.asname or alias.name.split(".")[0])
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                for target in getattr(node, "targets", None) or [node.target]:
+                    bind(target)
+            elif isinstance(node, (ast.For, ast.AsyncFor)):
+                bind(node.target)
+            elif isinstance(node, (ast.With, ast.AsyncWith)):
+                for item in node.items:
+                    if item.optional_vars is not None:
+                        bind(item.optional_vars)
+            elif isinstance(node, ast.Try):
+                for handler in node.handlers:
+                    if handler.name:
+                        names.add(handler.name)
+                    if not visit(handler.body):
+                        return False
+            # Bodies of compound statements run at module level too
+            for field in ("body", "orelse", "finalbody"):
+                block = getattr(node, field, None)
+                if isinstance(block, list) and not isinstance(
+                    node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+                ):
+                    if not visit(block):
+                        return False
+        return True
+
+    if not visit(tree.body):
+        return None
+    # Functions may assign module globals too
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Global):
+            names.update(node.names)
+    return names
+
+
+class ProjectImportGraph:
+    """Project modules and the imports between them."""
+
+    def __init__(self, root: str, parse: Callable[[str], Optional[ast.Module]]):
+        self.root = os.path.abspath(root)
+        # Returns the AST of a project file (None if it does not parse)
+        self.parse = parse
+        self.modules: Dict[str, str] = {}
+        # File -> module names its imports may refer to, and the reverse
+        self.imports: Dict[str, Set[str]] = {}
+        self.importers: Dict[str, Set[str]] = {}
+
+    def module_name(self, file_path: str) -> Optional[str]:
+        """Dotted module name of a project file."""
+        relative = os.path.relpath(os.path.abspath(file_path), self.root)
+        if relative.startswith(os.pardir) or not relative.endswith(".py"):
+            return None
+        parts = relative[: -len(".py")].split(os.sep)
+        if parts[-1] == "__init__":
+            parts.pop()
+        return ".".join(parts) if parts else None
+
+    def covers(self, file_path: str) -> bool:
+        return self.module_name(file_path) is not None
+
+    def add_file(self, file_path: str):
+        """Register a project file so imports of it resolve."""
+        name = self.module_name(file_path)
+        if name is not None:
+            self.modules[name] = os.path.abspath(file_path)
+
+    def remove_file(self, file_path: str):
+        """Forget a deleted file; files importing it stay recorded."""
+        file_path = os.path.abspath(file_path)
+        name = self.module_name(file_path)
+        if self.modules.get(name) == file_path:
+            del self.modules[name]
+        self.set_imports(file_path, set())
+
+    def set_imports(self, file_path: str, names: Set[str]):
+        """Replace the module names a file's imports may refer to."""
+        file_path = os.path.abspath(file_path)
+        for name in self.imports.pop(file_path, set()) - names:
+            self.importers.get(name, set()).discard(file_path)
+        if names:
+            self.imports[file_path] = names
+        for name in names:
+            self.importers.setdefault(name, set()).add(file_path)
+
+    def _package(self, file_path: str, level: int) -> Optional[str]:
+        """Package a relative import of the given level starts from."""
+        name = self.module_name(file_path) or ""
+        parts = name.split(".") if name else []
+        if not file_path.endswith("__init__.py"):
+            parts = parts[:-1]
+        if level - 1 > len(parts):
+            return None
+        return ".".join(parts[: len(parts) - (level - 1)])
+
+    def candidates(
+        self, module: Optional[str], file_path: str, level: int = 0
+    ) -> List[str]:
+        """Project module names an import could refer to, most likely first.
+
+        Absolute names are tried against the project root and, like a
+        script run from its own directory, against the file's directory.
+        """
+        if level:
+            package = self._package(file_path, level)
+            if package is None:
+                return []
+            return [".".join(p for p in (package, module) if p)]
+        if not module:
+            return []
+        names = [module]
+        package = self._package(file_path, 1)
+        if package:
+            names.append(f"{package}.{module}")
+        return names
+
+    def is_package_dir(self, name: str) -> bool:
+        """Whether a module name is a directory (package or namespace) of the project."""
+        return os.path.isdir(os.path.join(self.root, *name.split(".")))
+
+    def resolve(
+        self, module: Optional[str], file_path: str, level: int = 0
+    ) -> Optional[str]:
+        """The project module name an import refers to, if it is internal."""
+        for name in self.candidates(module, file_path, level):
+            if name in self.modules or self.is_package_dir(name):
+                return name
+        return None
+
+    def update(self, file_path: str, tree: ast.Module):
+        """Record the imports of a (re)parsed project file."""
+        file_path = os.path.abspath(file_path)
+        self.add_file(file_path)
+        names: Set[str] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    names.update(self.candidates(alias.name, file_path))
+            elif isinstance(node, ast.ImportFrom):
+                bases = self.candidates(node.module, file_path, node.level)
+                names.update(bases)
+                for base in bases:
+                    names.update(f"{base}.{alias.name}" for alias in node.names)
+        self.set_imports(file_path, names)
+
+    def check_import_from(
+        self, node: ast.ImportFrom, file_path: str
+    ) -> Tuple[bool, List[str]]:
+        """Resolve ``from M import a, b`` against the graph.
+
+        Returns whether M is a project module and the imported names that
+        are neither submodules nor bound at the top level of M.
+        """
+        module = self.resolve(node.module, file_path, node.level)
+        if module is None:
+            return False, []
+        target = self.modules.get(module)
+        tree = self.parse(target) if target is not None else None
+        exported = top_level_names(tree) if tree is not None else None
+
+        missing = []
+        for alias in node.names:
+            if alias.name == "*" or f"{module}.{alias.name}" in self.modules:
+                continue
+            if self.is_package_dir(f"{module}.{alias.name}"):
+                continue
+            if exported is not None and alias.name not in exported:
+                missing.append(alias.name)
+        return True, missing
+
+    def dependents(self, file_paths: Iterable[str]) -> Set[str]:
+        """Files importing any of file_paths, directly or indirectly."""
+        seen: Set[str] = set()
+        queue = [os.path.abspath(f) for f in file_paths]
+        while queue:
+            name = self.module_name(queue.pop())
+            if name is None:
+                continue
+            for importer in self.importers.get(name, ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    queue.append(importer)
+        return seen - {os.path.abspath(f) for f in file_paths}
@@ -0,0 +1,282 @@
+"""
+Import resolution index for the validator.
+
+``importlib.util.find_spec`` probes every ``sys.path`` entry for each
+import and imports the parent packages of dotted names. The index instead
+lists each ``sys.path`` entry once (modules, packages, namespace packages
+and extension modules, including zipped entries) and adds the builtin and
+standard library module names. Lookups never import anything: submodules
+are found by listing the package directory, and names below a plain
+module (``os.path``) are assumed to resolve, as they can only be checked
+by importing.
+
+The top-level names are saved as JSON in the cache directory under a
+fingerprint of the interpreter and of ``sys.path`` (including each
+entry's mtime, which changes when packages are installed or removed), so
+later runs load them instead of scanning.
+"""
+
+import hashlib
+import importlib.machinery
+import json
+import os
+import sys
+import tempfile
+import zipfile
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CACHE_DIR_ENV = "CC_PY2TO3_CACHE_DIR"
+
+# Kinds of names, in the order the path finder prefers them within one
+# directory
+_KIND_RANK = {"package": 0, "extension": 1, "module": 1, "namespace": 2}
+
+# Finders whose results the directory scan already covers
+_STANDARD_FINDERS = (
+    importlib.machinery.BuiltinImporter,
+    importlib.machinery.FrozenImporter,
+    importlib.machinery.PathFinder,
+)
+
+
+def default_cache_dir() -> str:
+    """Directory for persistent caches (``CC_PY2TO3_CACHE_DIR`` overrides)."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return cache_dir
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "cc-py2to3")
+
+
+class ImportResolutionIndex:
+    """Importable top-level names of an interpreter, from one sys.path scan."""
+
+    VERSION = 1
+
+    def __init__(self, search_path: Optional[Sequence[str]] = None):
+        self.search_path = list(sys.path if search_path is None else search_path)
+        # name -> (kind, paths without suffix); namespace packages may have
+        # several
+        self.top_level: Dict[str, Tuple[str, List[str]]] = {}
+        self._listings: Dict[str, Dict[str, str]] = {}
+        self._answers: Dict[str, bool] = {}
+        self.stats = {"lookups": 0, "memoized": 0, "loaded": False}
+
+    def fingerprint(self) -> str:
+        """Hash of the interpreter and of sys.path with its entries' mtimes."""
+        parts = [sys.executable, sys.version, str(self.VERSION)]
+        for entry in self.search_path:
+            path = os.path.abspath(entry or os.curdir)
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime_ns = -1
+            parts.append(f"{path}\0{mtime_ns}")
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+
+    @classmethod
+    def load(
+        cls,
+        cache_dir: Optional[str] = None,
+        search_path: Optional[Sequence[str]] = None,
+    ) -> "ImportResolutionIndex":
+        """Load the saved index for this interpreter, or build and save it."""
+        index = cls(search_path)
+        cache_path = os.path.join(
+            cache_dir or default_cache_dir(), f"import-index-{index.fingerprint()}.json"
+        )
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            index.top_level = {
+                name: (kind, locations) for name, (kind, locations) in data.items()
+            }
+            index.stats["loaded"] = True
+            return index
+        except (OSError, ValueError, TypeError):
+            pass
+
+        index.build()
+        try:
+            index.save(cache_path)
+        except OSError:
+            # A read-only home directory only costs the warm start
+            pass
+        return index
+
+    def save(self, cache_path: str):
+        """Write the top-level names atomically."""
+        directory = os.path.dirname(cache_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.top_level, f)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def build(self):
+        """Scan sys.path; earlier entries win, except over namespace packages."""
+        self.top_level = {}
+        for entry in self.search_path:
+            location = os.path.abspath(entry or os.curdir)
+            if os.path.isdir(location):
+                names = self._list_directory(location)
+            elif zipfile.is_zipfile(location):
+                names = self._list_zip(location)
+            else:
+                continue
+            for name, kind in names.items():
+                path = os.path.join(location, name)
+                known = self.top_level.get(name)
+                if known is None:
+                    self.top_level[name] = (kind, [path])
+                elif known[0] == "namespace":
+                    if kind == "namespace":
+                        known[1].append(path)
+                    else:
+                        self.top_level[name] = (kind, [path])
+
+        for name in sys.builtin_module_names:
+            self.top_level.setdefault(name, ("builtin", []))
+        # Also names of other platforms (winreg, msvcrt, ...)
+        for name in getattr(sys, "stdlib_module_names", ()):
+            self.top_level.setdefault(name, ("stdlib", []))
+
+    @staticmethod
+    def _add_name(names: Dict[str, str], name: str, kind: str):
+        if name.isidentifier() and (
+            name not in names or _KIND_RANK[kind] < _KIND_RANK[names[name]]
+        ):
+            names[name] = kind
+
+    def _classify_file(self, names: Dict[str, str], filename: str):
+        for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+            if filename.endswith(suffix):
+                self._add_name(names, filename[: -len(suffix)], "extension")
+                return
+        for suffix in importlib.machinery.SOURCE_SUFFIXES + [".pyc"]:
+            if filename.endswith(suffix):
+                self._add_name(names, filename[: -len(suffix)], "module")
+                return
+
+    def _list_directory(self, directory: str) -> Dict[str, str]:
+        """Importable names in one directory."""
+        names: Dict[str, str] = {}
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return names
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if not is_dir:
+                self._classify_file(names, entry.name)
+            elif any(
+                os.path.isfile(os.path.join(entry.path, "__init__" + suffix))
+                for suffix in importlib.machinery.all_suffixes()
+            ):
+                self._add_name(names, entry.name, "package")
+            else:
+                self._add_name(names, entry.name, "namespace")
+        return names
+
+    def _list_zip(self, archive: str) -> Dict[str, str]:
+        """Top-level importable names in a zip file on sys.path."""
+        names: Dict[str, str] = {}
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                members = zf.namelist()
+        except (OSError, zipfile.BadZipFile):
+            return names
+        for member in members:
+            first, _, rest = member.partition("/")
+            if not rest:
+                self._classify_file(names, first)
+            elif rest.startswith("__init__."):
+                self._add_name(names, first, "package")
+            else:
+                self._add_name(names, first, "namespace")
+        return names
+
+    def _listing(self, directory: str) -> Dict[str, str]:
+        listing = self._listings.get(directory)
+        if listing is None:
+            listing = self._listings[directory] = self._list_directory(directory)
+        return listing
+
+    def can_import(self, module_name: str) -> bool:
+        """Whether a dotted module name resolves, without importing anything."""
+        self.stats["lookups"] += 1
+        answer = self._answers.get(module_name)
+        if answer is not None:
+            self.stats["memoized"] += 1
+            return answer
+        answer = self._answers[module_name] = self._resolve(module_name)
+        return answer
+
+    def _resolve(self, module_name: str) -> bool:
+        if module_name in sys.modules:
+            return True
+        first, *rest = module_name.split(".")
+        known = self.top_level.get(first)
+        if known is None:
+            return self._found_by_other_finders(first)
+
+        kind, locations = known
+        for part in rest:
+            if kind not in ("package", "namespace") or not all(
+                os.path.isdir(location) for location in locations
+            ):
+                # Submodules of modules only exist after an import, and
+                # zipped packages are not listed
+                return True
+            found = None
+            for location in locations:
+                sub_kind = self._listing(location).get(part)
+                if sub_kind is None:
+                    continue
+                path = os.path.join(location, part)
+                if found is None:
+                    found = (sub_kind, [path])
+                elif found[0] == "namespace" and sub_kind == "namespace":
+                    found[1].append(path)
+            if found is None:
+                return False
+            kind, locations = found
+        return True
+
+    @staticmethod
+    def _found_by_other_finders(name: str) -> bool:
+        """Ask import hooks such as editable installs about a top-level name."""
+        for finder in sys.meta_path:
+            if isinstance(finder, type) and issubclass(finder, _STANDARD_FINDERS):
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            try:
+                if find_spec(name, None) is not None:
+                    return True
+            except Exception:
+                continue
+        return False
+
+
+# Indexes loaded in this process, by sys.path
+_shared: Dict[Tuple[str, ...], ImportResolutionIndex] = {}
+
+
+def shared_import_index() -> ImportResolutionIndex:
+    """The index for the current sys.path, loaded once per process."""
+    key = tuple(sys.path)
+    index = _shared.get(key)
+    if index is None:
+        index = _shared[key] = ImportResolutionIndex.load()
+    return index
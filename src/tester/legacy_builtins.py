@@ -0,0 +1,172 @@
+"""
+Detector for Python 2 builtins left in converted code.
+
+Converted code can parse and still fail with NameError when it reaches
+``cmp(...)``, ``unicode(...)`` or ``reduce(...)``. A name only refers to
+the removed builtin if nothing in scope binds it: not a local, parameter
+or enclosing function variable, and not a module-level definition (such
+as the common ``unicode = str`` compatibility shim). Scopes come from
+``symtable``, built from the cached source; the AST supplies the line
+numbers. Files whose text mentions none of the names, which is most of
+them, are dismissed by one regular expression search, and only files
+whose AST loads one of the names build a symbol table, so the check
+costs a small fraction of a parse.
+"""
+
+import ast
+import re
+import symtable
+from typing import Dict, List, Set, Tuple
+
+REMOVED_BUILTINS = frozenset(
+    {
+        "apply",
+        "basestring",
+        "buffer",
+        "cmp",
+        "coerce",
+        "execfile",
+        "file",
+        "intern",
+        "long",
+        "raw_input",
+        "reduce",
+        "unichr",
+        "unicode",
+        "xrange",
+    }
+)
+
+# Names that are also English words only count when used like a value,
+# so comments and docstrings rarely send a file through the AST walk
+_WORDS = frozenset({"apply", "buffer", "file", "intern", "long"})
+_MENTION = re.compile(
+    r"(?<![.\w])(?:(?:%s)\b|(?:%s)\s*[(),\]])"
+    % ("|".join(sorted(REMOVED_BUILTINS - _WORDS)), "|".join(sorted(_WORDS)))
+)
+
+# AST nodes that open a symbol table, with the table name they get
+_SCOPE_NAMES = {
+    ast.Lambda: "lambda",
+    ast.ListComp: "listcomp",
+    ast.SetComp: "setcomp",
+    ast.DictComp: "dictcomp",
+    ast.GeneratorExp: "genexpr",
+}
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, *_SCOPE_NAMES)
+
+
+def _split_scope(node: ast.AST) -> Tuple[List[ast.AST], List[ast.AST]]:
+    """Children evaluated in the enclosing scope, and those in node's own."""
+    if isinstance(node, ast.ClassDef):
+        return node.decorator_list + node.bases + node.keywords, node.body
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+        args = node.args
+        outer = args.defaults + [d for d in args.kw_defaults if d is not None]
+        if isinstance(node, ast.Lambda):
+            return outer, [node.body]
+        annotations = [
+            arg.annotation
+            for arg in args.posonlyargs + args.args + args.kwonlyargs
+            + [args.vararg, args.kwarg]
+            if arg is not None and arg.annotation is not None
+        ]
+        returns = [node.returns] if node.returns is not None else []
+        return node.decorator_list + outer + annotations + returns, node.body
+    # Comprehensions: the first iterable is evaluated outside
+    first, *rest = node.generators
+    inner = [first.target, *first.ifs, *rest]
+    if isinstance(node, ast.DictComp):
+        inner += [node.key, node.value]
+    else:
+        inner.append(node.elt)
+    return [first.iter], inner
+
+
+def _module_bindings(top: symtable.SymbolTable, tables) -> Set[str]:
+    """Names a module defines, including through ``global`` in functions."""
+    names = {
+        symbol.get_name()
+        for symbol in top.get_symbols()
+        if symbol.is_assigned() or symbol.is_imported() or symbol.is_namespace()
+    }
+    for table in tables:
+        for symbol in table.get_symbols():
+            if symbol.is_declared_global() and symbol.is_assigned():
+                names.add(symbol.get_name())
+    return names
+
+
+def _all_tables(top: symtable.SymbolTable) -> List[symtable.SymbolTable]:
+    tables, queue = [], [top]
+    while queue:
+        table = queue.pop()
+        tables.append(table)
+        queue.extend(table.get_children())
+    return tables
+
+
+def find_legacy_builtins(
+    tree: ast.Module, source: str, file_path: str = "<unknown>"
+) -> List[Tuple[int, str]]:
+    """(line, name) of each reference to a removed Python 2 builtin."""
+    if not _MENTION.search(source):
+        return []
+    candidates = []
+    scope_of: Dict[ast.AST, ast.AST] = {}
+    enclosing: Dict[ast.AST, ast.AST] = {}
+
+    def visit(node: ast.AST, scope: ast.AST):
+        if isinstance(node, ast.Name):
+            if node.id in REMOVED_BUILTINS and isinstance(node.ctx, ast.Load):
+                candidates.append(node)
+                scope_of[node] = scope
+            return
+        if node is not scope and isinstance(node, _SCOPE_NODES):
+            outer, inner = _split_scope(node)
+            enclosing[node] = scope
+            for child in outer:
+                visit(child, scope)
+            for child in inner:
+                visit(child, node)
+            return
+        for child in ast.iter_child_nodes(node):
+            visit(child, scope)
+
+    visit(tree, tree)
+    if not candidates:
+        return []
+
+    top = symtable.symtable(source, file_path, "exec")
+    tables = _all_tables(top)
+    by_key: Dict[Tuple[int, str], List[symtable.SymbolTable]] = {}
+    for table in tables:
+        by_key.setdefault((table.get_lineno(), table.get_name()), []).append(table)
+    module_names = _module_bindings(top, tables)
+
+    found = []
+    for node in candidates:
+        if node.id in module_names:
+            continue
+        scope = scope_of[node]
+        while scope is not tree:
+            name = getattr(scope, "name", None) or _SCOPE_NAMES[type(scope)]
+            scope_tables = by_key.get((scope.lineno, name))
+            if scope_tables:
+                break
+            # List, set and dict comprehensions have no table of their own
+            # on Python 3.12+ (PEP 709); they are inlined into the enclosing one
+            scope = enclosing[scope]
+        if scope is tree or any(
+            _resolves_to_builtin(t, node.id) for t in scope_tables
+        ):
+            found.append((node.lineno, node.id))
+    return sorted(found)
+
+
+def _resolves_to_builtin(table: symtable.SymbolTable, name: str) -> bool:
+    try:
+        symbol = table.lookup(name)
+    except KeyError:
+        return False
+    return symbol.is_global() and not symbol.is_local()
@@ -0,0 +1,149 @@
+"""
+Parsed-module cache shared by the validator and the test generator.
+
+Each file is read and parsed once: entries hold the source and its AST,
+keyed by path, modification time and content hash. Files are decoded
+like the interpreter does, from the BOM or PEP 263 coding cookie. A file whose mtime
+changed but whose content did not is read again but not re-parsed.
+Entries are evicted least recently used first once the cached sources
+exceed a total size.
+"""
+
+import ast
+import hashlib
+import io
+import os
+import tokenize
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def decode_source(data: bytes) -> str:
+    """Decode source bytes by their BOM or coding cookie, with ``\\n`` newlines.
+
+    Raises SyntaxError for a bad coding cookie, UnicodeDecodeError if the
+    bytes do not match the encoding.
+    """
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    text = data.decode(encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+class ParsedModule:
+    """Source and AST of one file (``tree`` is None if it did not parse)."""
+
+    def __init__(
+        self,
+        file_path: str,
+        source: str,
+        digest: str,
+        tree: Optional[ast.Module] = None,
+        error: Optional[Exception] = None,
+        mtime_ns: Optional[int] = None,
+        size: Optional[int] = None,
+    ):
+        self.file_path = file_path
+        self.source = source
+        self.digest = digest
+        self.tree = tree
+        self.error = error
+        # Stat of the file when it was read; None for sources handed over
+        # in memory
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+
+class ParsedModuleCache:
+    """LRU cache of ParsedModule entries, bounded by total source size."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, ParsedModule]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "reads": 0,
+            "parses": 0,
+            "hits": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def _digest(source: str) -> str:
+        return hashlib.blake2b(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def get(self, file_path: str, source: Optional[str] = None) -> ParsedModule:
+        """Get the parsed module for a file, or for its source already in memory.
+
+        Raises OSError if the file cannot be read; decode and parse errors
+        are returned in ``ParsedModule.error``.
+        """
+        key = os.path.abspath(file_path)
+        entry = self._entries.get(key)
+        mtime_ns = size = None
+
+        if source is None:
+            stat = os.stat(file_path)
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+            if entry is not None and (entry.mtime_ns, entry.size) == (mtime_ns, size):
+                return self._hit(key, entry)
+            with open(file_path, "rb") as f:
+                data = f.read()
+            self.stats["reads"] += 1
+            try:
+                source = decode_source(data)
+            except (SyntaxError, UnicodeDecodeError) as e:
+                # Would not compile either; keyed by the bytes, which can
+                # only match an earlier read of the same undecodable file
+                module = ParsedModule(
+                    file_path,
+                    "",
+                    hashlib.blake2b(data).hexdigest(),
+                    error=e,
+                    mtime_ns=mtime_ns,
+                    size=size,
+                )
+                self._store(key, module)
+                return module
+
+        digest = self._digest(source)
+        if entry is not None and entry.digest == digest:
+            if mtime_ns is not None:
+                entry.mtime_ns, entry.size = mtime_ns, size
+            return self._hit(key, entry)
+
+        module = ParsedModule(file_path, source, digest, mtime_ns=mtime_ns, size=size)
+        try:
+            module.tree = ast.parse(source)
+        except (SyntaxError, ValueError) as e:
+            module.error = e
+        self.stats["parses"] += 1
+        self._store(key, module)
+        return module
+
+    def _hit(self, key: str, entry: ParsedModule) -> ParsedModule:
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry
+
+    def _store(self, key: str, module: ParsedModule):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= len(old.source)
+        self._entries[key] = module
+        self.total_bytes += len(module.source)
+        # Keep at least the entry just stored
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted.source)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, file_path: str):
+        """Forget a file, e.g. after it was rewritten within the same mtime tick."""
+        old = self._entries.pop(os.path.abspath(file_path), None)
+        if old is not None:
+            self.total_bytes -= len(old.source)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,156 @@
+"""
+Persistent cache of validation results.
+
+Revalidating a large tree after a small re-conversion repeats the same
+work for every file that did not change. ``ValidationResultCache`` keeps
+the static checks' outcome (syntax, imports, leftover builtins) in a
+SQLite database in the cache directory, keyed by the file's path and
+content hash, the validator version and the import-resolution index
+fingerprint. The fingerprint covers the interpreter and the mtimes of
+the ``sys.path`` entries, so installing or removing a package
+invalidates every entry.
+
+An entry also records what each of the file's project imports resolved
+to (the content hash of the imported module, a package directory, or
+nothing), since a result depends on the modules it imports. It is only
+used while they all still resolve the same way; a hit skips reading the
+file into the parsed-module cache and parsing it. Entries not used for
+the longest time are dropped beyond ``max_entries``.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .import_index import default_cache_dir
+
+_RESULT_FIELDS = (
+    "syntax_valid",
+    "imports_valid",
+    "syntax_error",
+    "import_errors",
+    "builtin_errors",
+)
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data).hexdigest()
+
+
+class ValidationResultCache:
+    """Validation results on disk, bounded by entry count."""
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_entries: int = 200_000
+    ):
+        cache_dir = cache_dir or default_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "validation-results.sqlite3")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, result TEXT, depends TEXT, used REAL)"
+        )
+        # Digests of project files, by path and stat
+        self._digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._pending = 0
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def key(file_path: str, digest: str, validator_version: int, fingerprint: str):
+        parts = (os.path.abspath(file_path), digest, str(validator_version), fingerprint)
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def file_digest(self, file_path: str) -> Optional[str]:
+        """Content hash of a project file, read again only when its stat changed."""
+        try:
+            stat = os.stat(file_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            known = self._digests.get(file_path)
+            if known is not None and known[0] == signature:
+                return known[1]
+            with open(file_path, "rb") as f:
+                digest = content_digest(f.read())
+        except OSError:
+            return None
+        self._digests[file_path] = (signature, digest)
+        return digest
+
+    def resolution(self, graph, name: str) -> Optional[str]:
+        """What a project module name resolves to right now."""
+        path = graph.modules.get(name)
+        if path is not None:
+            return self.file_digest(path)
+        return "package" if graph.is_package_dir(name) else None
+
+    def get(self, key: str, graph) -> Optional[Dict]:
+        """Cached result fields and imports, if every import resolves as before."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result, depends FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is not None:
+            depends = json.loads(row[1])
+            if graph is None or all(
+                self.resolution(graph, name) == state for name, state in depends.items()
+            ):
+                with self._lock:
+                    self._db.execute(
+                        "UPDATE results SET used = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._pending += 1
+                self.stats["hits"] += 1
+                entry = json.loads(row[0])
+                entry["imports"] = set(depends)
+                return entry
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, result, graph, imports):
+        """Store a result with the current resolution of the file's imports."""
+        fields = {name: getattr(result, name) for name in _RESULT_FIELDS}
+        depends = (
+            {name: self.resolution(graph, name) for name in imports}
+            if graph is not None
+            else {}
+        )
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, json.dumps(fields), json.dumps(depends), time.time()),
+            )
+            self._pending += 1
+        self.stats["stored"] += 1
+        if self._pending >= 1000:
+            self.flush()
+
+    def flush(self):
+        """Commit pending writes and drop the least recently used entries."""
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY used LIMIT ?)",
+                    (excess,),
+                )
+                self.stats["evicted"] += excess
+            self._db.commit()
+            self._pending = 0
+
+    def close(self):
+        self.flush()
+        self._db.close()
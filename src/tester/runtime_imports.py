@@ -0,0 +1,267 @@
+"""
+Runtime import check for converted modules.
+
+Static checks miss modules that only fail when they run: renamed stdlib
+attributes (``string.letters``), bytes/str mixups at module level and
+the like. ``RuntimeImportChecker`` imports each converted module in a
+pool of reusable worker subprocesses, one JSON object per line on the
+worker's stdin and stdout:
+
+    {"module": "utils.string_helper", "path": ["/project", "/project/utils"]}
+    {"ok": false, "elapsed": 0.004, "traceback": "...", "recycle": false}
+
+Workers run isolated (``python -I -B``, so no ``__pycache__`` is written
+into the project) in a scratch directory, with stdin and stdout of the
+imported code pointed at /dev/null and an address space limit where
+``resource`` is available. After each import the
+worker drops the project modules it loaded, so the next import starts
+clean; an import that changed interpreter state (``sys.path``, import
+hooks, builtins, the environment, running threads, ...) makes the worker
+exit after answering, and the pool starts a fresh one. Imports that run
+past the timeout or crash the worker are reported as failures.
+"""
+
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MEMORY_LIMIT = 1024 * 1024 * 1024
+# Bounds what leaks from imports that look clean
+MAX_IMPORTS_PER_WORKER = 200
+
+
+class ImportCheck:
+    """Outcome of importing one module."""
+
+    def __init__(
+        self,
+        file_path: str,
+        module: str,
+        ok: bool,
+        elapsed: float = 0.0,
+        traceback: str = "",
+    ):
+        self.file_path = file_path
+        self.module = module
+        self.ok = ok
+        self.elapsed = elapsed
+        self.traceback = traceback
+
+
+class _Worker:
+    """One worker subprocess and the thread reading its replies."""
+
+    def __init__(self, memory_limit: Optional[int], scratch_dir: str):
+        env = {}
+        if memory_limit:
+            env["CC_PY2TO3_MEMORY_LIMIT"] = str(memory_limit)
+        # -I implies -E, which ignores PYTHONDONTWRITEBYTECODE
+        self.process = subprocess.Popen(
+            [sys.executable, "-I", "-B", os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=scratch_dir,
+            env={**os.environ, **env},
+        )
+        self.imports = 0
+        self.replies: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.replies.put(line)
+        self.replies.put(None)
+
+    def request(self, message: Dict, timeout: float) -> Optional[Dict]:
+        """Send one request; None if the worker timed out or died."""
+        try:
+            self.process.stdin.write(json.dumps(message).encode() + b"\n")
+            self.process.stdin.flush()
+            line = self.replies.get(timeout=timeout)
+        except (OSError, queue.Empty):
+            return None
+        self.imports += 1
+        return json.loads(line) if line else None
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class RuntimeImportChecker:
+    """Import converted modules in a pool of sandboxed worker processes."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout: float = DEFAULT_TIMEOUT,
+        memory_limit: Optional[int] = DEFAULT_MEMORY_LIMIT,
+        max_imports_per_worker: int = MAX_IMPORTS_PER_WORKER,
+    ):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.max_imports_per_worker = max_imports_per_worker
+        self.scratch_dir = tempfile.mkdtemp(prefix="cc-py2to3-imports-")
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.stats = {"imports": 0, "failures": 0, "timeouts": 0, "recycled": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _acquire(self) -> _Worker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return _Worker(self.memory_limit, self.scratch_dir)
+
+    def check(self, file_path: str, module: str, search_path: List[str]) -> ImportCheck:
+        """Import ``module`` with ``search_path`` in front of sys.path."""
+        worker = self._acquire()
+        reply = worker.request({"module": module, "path": search_path}, self.timeout)
+        self._count("imports")
+
+        if reply is None:
+            code = worker.process.poll()
+            if code is None:
+                self._count("timeouts")
+                message = f"Import timed out after {self.timeout:g}s"
+            else:
+                message = f"Import worker exited with code {code}"
+            worker.close()
+            self._count("failures")
+            return ImportCheck(file_path, module, False, self.timeout, message)
+
+        if reply["recycle"] or worker.imports >= self.max_imports_per_worker:
+            self._count("recycled")
+            worker.close()
+        else:
+            self._idle.put(worker)
+        if not reply["ok"]:
+            self._count("failures")
+        return ImportCheck(
+            file_path, module, reply["ok"], reply["elapsed"], reply["traceback"]
+        )
+
+    def check_files(
+        self, files: Iterable[Tuple[str, str, List[str]]]
+    ) -> Iterator[ImportCheck]:
+        """Check (file_path, module, search_path) triples on all workers.
+
+        Results come back in input order.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            yield from pool.map(lambda item: self.check(*item), files)
+
+
+def _interpreter_state() -> Tuple:
+    """State an import should not change, apart from sys.modules."""
+    import builtins
+
+    return (
+        tuple(sys.path),
+        [id(finder) for finder in sys.meta_path],
+        [id(hook) for hook in sys.path_hooks],
+        dict(os.environ),
+        os.getcwd(),
+        {name: id(value) for name, value in vars(builtins).items()},
+        threading.active_count(),
+        sys.getrecursionlimit(),
+        id(sys.stdin),
+        id(sys.stdout),
+        id(sys.stderr),
+    )
+
+
+def _worker_main():
+    """Serve import requests until stdin closes."""
+    import importlib
+    import traceback
+
+    limit = os.environ.get("CC_PY2TO3_MEMORY_LIMIT")
+    if limit:
+        try:
+            import resource
+
+            resource.setrlimit(resource.RLIMIT_AS, (int(limit), int(limit)))
+        except (ImportError, ValueError, OSError):
+            pass
+
+    # Keep the protocol streams for ourselves; imported code sees /dev/null
+    requests = os.fdopen(os.dup(0), "rb")
+    replies = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    sys.stdin = open(os.devnull, "r")
+    sys.stdout = open(os.devnull, "w")
+
+    base_path = list(sys.path)
+    for line in requests:
+        request = json.loads(line)
+        search_path = [os.path.abspath(p) for p in request["path"]]
+        sys.path[:] = search_path + base_path
+        before_modules = {name: id(m) for name, m in sys.modules.items()}
+        before = _interpreter_state()
+
+        start = time.perf_counter()
+        ok, error = True, ""
+        try:
+            importlib.import_module(request["module"])
+        except BaseException:
+            ok, error = False, traceback.format_exc()
+        elapsed = time.perf_counter() - start
+
+        recycle = _interpreter_state() != before or any(
+            id(sys.modules.get(name)) != module_id
+            for name, module_id in before_modules.items()
+        )
+        # Forget the project's modules so the next import runs them afresh
+        for name in set(sys.modules) - set(before_modules):
+            location = getattr(sys.modules[name], "__file__", None) or ""
+            if any(location.startswith(p + os.sep) for p in search_path):
+                del sys.modules[name]
+        sys.path[:] = base_path
+        importlib.invalidate_caches()
+
+        reply = {"ok": ok, "elapsed": elapsed, "traceback": error, "recycle": recycle}
+        replies.write(json.dumps(reply).encode() + b"\n")
+        replies.flush()
+        if recycle:
+            break
+
+
+if __name__ == "__main__":
+    _worker_main()
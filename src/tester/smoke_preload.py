@@ -0,0 +1,159 @@
+"""
+Runner process for the smoke tests.
+
+``SmokeTestRunner`` starts this module as a subprocess for each run and
+writes one JSON line to its stdin:
+
+    {"preload": ["calc"], "workers": 4,
+     "test_files": ["/project/generated_tests/test_calc.py", ...]}
+
+The runner imports common standard library modules and the preloaded
+project modules once, then forks one process per test module from
+itself, up to ``workers`` at a time, so every test process starts with
+them loaded. A preloaded module that fails to import is skipped; its
+test will report the failure. Each finished module is answered with one
+JSON line on stdout:
+
+    {"test_file": "...", "status": "passed", "duration": 0.03, ...}
+
+Being a process of its own, the runner leaves the multiprocessing
+settings of the caller alone. Where ``fork`` is not available the test
+processes are spawned instead, without the preloaded modules. Closing
+stdin stops the runner and its test processes.
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+import traceback
+import unittest
+
+# PYTHONPATH before SmokeTestRunner extended it, if it was set
+PYTHONPATH_ENV = "CC_PY2TO3_PYTHONPATH"
+
+STDLIB_PRELOAD = (
+    "collections",
+    "datetime",
+    "decimal",
+    "functools",
+    "io",
+    "itertools",
+    "json",
+    "logging",
+    "os",
+    "pathlib",
+    "re",
+    "tempfile",
+    "typing",
+    "unittest",
+    "unittest.mock",
+)
+
+
+def _run_test_module(test_file: str, conn):
+    """Run one test module in a test process and send back its counts."""
+    output = io.StringIO()
+    reply = {"status": "error"}
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            name = os.path.splitext(os.path.basename(test_file))[0]
+            spec = importlib.util.spec_from_file_location(name, test_file)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+            suite = unittest.defaultTestLoader.loadTestsFromModule(module)
+            result = unittest.TextTestRunner(stream=output, verbosity=0).run(suite)
+            reply = {
+                "status": "passed" if result.wasSuccessful() else "failed",
+                "tests_run": result.testsRun,
+                "failures": len(result.failures),
+                "errors": len(result.errors),
+                "skipped": len(result.skipped),
+            }
+        except BaseException:
+            traceback.print_exc(file=output)
+    reply["output"] = output.getvalue()
+    conn.send(reply)
+    conn.close()
+
+
+def _preload(names):
+    # Test processes see the PYTHONPATH of the caller
+    original = os.environ.pop(PYTHONPATH_ENV, None)
+    if original is None:
+        os.environ.pop("PYTHONPATH", None)
+    else:
+        os.environ["PYTHONPATH"] = original
+    for name in STDLIB_PRELOAD:
+        __import__(name)
+    for name in names:
+        try:
+            __import__(name, fromlist=["_"])
+        except BaseException:
+            continue
+
+
+def _serve():
+    """Run the test modules of one job, answering as they finish."""
+    # Keep the protocol streams for ourselves; test code sees /dev/null
+    requests = os.fdopen(os.dup(0), "rb")
+    replies = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    sys.stdin = open(os.devnull, "r")
+    sys.stdout = open(os.devnull, "w")
+
+    job = json.loads(requests.readline())
+    _preload(job["preload"])
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    # Only pipes can be waited on together with connections on Windows
+    stop = [requests] if os.name == "posix" else []
+
+    todo = list(job["test_files"])
+    running = {}
+    try:
+        while todo or running:
+            while todo and len(running) < job["workers"]:
+                test_file = todo.pop(0)
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=_run_test_module, args=(test_file, sender)
+                )
+                process.start()
+                sender.close()
+                running[receiver] = (process, test_file, time.perf_counter())
+
+            ready = multiprocessing.connection.wait(list(running) + stop)
+            if requests in ready:
+                # The caller went away
+                return
+            for receiver in ready:
+                process, test_file, started = running.pop(receiver)
+                try:
+                    reply = receiver.recv()
+                except EOFError:
+                    reply = {"status": "error"}
+                receiver.close()
+                process.join()
+                if "output" not in reply:
+                    reply["output"] = f"Test process exited with code {process.exitcode}"
+                reply["test_file"] = test_file
+                reply["duration"] = time.perf_counter() - started
+                replies.write(json.dumps(reply).encode() + b"\n")
+                replies.flush()
+    finally:
+        for process, *_ in running.values():
+            process.kill()
+            process.join()
+
+
+if __name__ == "__main__":
+    _serve()
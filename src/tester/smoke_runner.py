@@ -0,0 +1,213 @@
+"""
+Parallel runner for the generated smoke tests.
+
+``ConversionTestGenerator.run_tests`` runs pytest over the whole test
+directory in one process. ``SmokeTestRunner`` instead starts a runner
+process (see ``smoke_preload.py``) that imports unittest, common standard
+library modules and the project's modules once, forks one process per
+test module from itself and runs up to ``workers`` modules at a time.
+Results stream back as modules finish, each with its duration. The
+runner is a subprocess of its own, so the caller's multiprocessing
+start method and forkserver are left alone.
+
+A state file next to the tests remembers a hash of each test file and
+of the module it tests; a module that passed and whose hashes are
+unchanged is skipped on the next run (status ``"unchanged"``).
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+from .smoke_preload import PYTHONPATH_ENV
+
+
+class SmokeResult:
+    """Outcome of one test module.
+
+    ``status`` is "passed", "failed", "error" (the module could not be
+    loaded or its process died) or "unchanged" (skipped).
+    """
+
+    def __init__(
+        self,
+        test_file: str,
+        status: str,
+        duration: float = 0.0,
+        tests_run: int = 0,
+        failures: int = 0,
+        errors: int = 0,
+        skipped: int = 0,
+        output: str = "",
+    ):
+        self.test_file = test_file
+        self.status = status
+        self.duration = duration
+        self.tests_run = tests_run
+        self.failures = failures
+        self.errors = errors
+        self.skipped = skipped
+        self.output = output
+
+    @property
+    def success(self) -> bool:
+        return self.status in ("passed", "unchanged")
+
+
+class SmokeTestRunner:
+    """Run test modules in parallel, one forked process per module."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        preload: Sequence[str] = (),
+        source_root: Optional[str] = None,
+        state_file: Optional[str] = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        # Project modules to warm, importable from source_root
+        self.preload = list(preload)
+        self.source_root = source_root
+        self.state_file = state_file
+        self.stats = {"run": 0, "unchanged": 0, "failed": 0, "wall_time": 0.0}
+
+    def _start_runner(self, test_files: Sequence[str]) -> subprocess.Popen:
+        """Start the runner process and hand it the test modules to run."""
+        # This package and the project go on PYTHONPATH; the runner
+        # restores the variable before any test runs
+        package_root = os.path.dirname(os.path.abspath(__file__))
+        for _ in __package__.split("."):
+            package_root = os.path.dirname(package_root)
+        paths = [package_root]
+        if self.source_root:
+            paths.append(os.path.abspath(self.source_root))
+        env = dict(os.environ)
+        env.pop(PYTHONPATH_ENV, None)
+        if "PYTHONPATH" in os.environ:
+            env[PYTHONPATH_ENV] = os.environ["PYTHONPATH"]
+            paths.append(os.environ["PYTHONPATH"])
+        env["PYTHONPATH"] = os.pathsep.join(paths)
+
+        runner = subprocess.Popen(
+            [sys.executable, "-m", f"{__package__}.smoke_preload"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+        )
+        job = {
+            "preload": self.preload,
+            "workers": self.workers,
+            "test_files": list(test_files),
+        }
+        # stdin stays open for the run; closing it stops the runner
+        runner.stdin.write(json.dumps(job).encode() + b"\n")
+        runner.stdin.flush()
+        return runner
+
+    @staticmethod
+    def _stop_runner(runner: subprocess.Popen):
+        try:
+            runner.stdin.close()
+        except OSError:
+            pass
+        try:
+            runner.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            runner.kill()
+            runner.wait()
+        runner.stdout.close()
+
+    @staticmethod
+    def _digest(paths: Iterable[Optional[str]]) -> str:
+        digest = hashlib.sha256()
+        for path in paths:
+            if path is None:
+                continue
+            try:
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(b"\0missing")
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _load_state(self) -> Dict[str, str]:
+        if self.state_file is None:
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, str]):
+        if self.state_file is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.state_file))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(temp_path, self.state_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def run(
+        self,
+        test_files: Sequence[str],
+        targets: Optional[Dict[str, str]] = None,
+    ) -> Iterator[SmokeResult]:
+        """Run test modules, yielding results as they finish.
+
+        ``targets`` maps test files to the source file each one tests;
+        both are hashed to decide whether a passing module can be skipped.
+        """
+        targets = targets or {}
+        start = time.perf_counter()
+        previous = self._load_state()
+        state: Dict[str, str] = {}
+        # Test file -> (state key, digest) of the modules to run
+        todo: Dict[str, tuple] = {}
+        for test_file in test_files:
+            key = os.path.abspath(test_file)
+            digest = self._digest([test_file, targets.get(test_file)])
+            if previous.get(key) == digest:
+                state[key] = digest
+                self.stats["unchanged"] += 1
+                yield SmokeResult(test_file, "unchanged")
+            else:
+                todo[test_file] = (key, digest)
+
+        runner = self._start_runner(todo) if todo else None
+        try:
+            while todo:
+                line = runner.stdout.readline()
+                if line:
+                    reply = json.loads(line)
+                    test_file = reply.pop("test_file")
+                else:
+                    # The runner died; report what it did not finish
+                    test_file = next(iter(todo))
+                    reply = {
+                        "status": "error",
+                        "output": f"Test runner exited with code {runner.wait()}",
+                    }
+                key, digest = todo.pop(test_file)
+                result = SmokeResult(test_file, **reply)
+                self.stats["run"] += 1
+                if result.success:
+                    state[key] = digest
+                else:
+                    self.stats["failed"] += 1
+                yield result
+        finally:
+            if runner is not None:
+                self._stop_runner(runner)
+            self.stats["wall_time"] += time.perf_counter() - start
+            self._save_state(state)
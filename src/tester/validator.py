@@ -1,11 +1,19 @@
 import ast
+import hashlib
 import subprocess
 import sys
 import tempfile
 import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
-import importlib.util
+from typing import List, Dict, Iterator, Set, Tuple, Optional
+
+from .import_graph import ProjectImportGraph
+from .import_index import ImportResolutionIndex, shared_import_index
+from .legacy_builtins import find_legacy_builtins
+from .module_cache import ParsedModuleCache, decode_source
+from .result_cache import ValidationResultCache, content_digest
+from .smoke_runner import SmokeResult, SmokeTestRunner
 
 
 class ValidationResult:
@@ -16,13 +24,49 @@ class ValidationResult:
         imports_valid: bool = False,
         syntax_error: str = "",
         import_errors: List[str] = None,
+        builtin_errors: List[str] = None,
     ):
         self.file_path = file_path
         self.syntax_valid = syntax_valid
         self.imports_valid = imports_valid
         self.syntax_error = syntax_error
         self.import_errors = import_errors or []
-        self.overall_valid = syntax_valid and imports_valid
+        # References to removed Python 2 builtins (cmp, unicode, ...)
+        self.builtin_errors = builtin_errors or []
+        self.builtins_valid = not self.builtin_errors
+        # Filled in by check_runtime_imports(); None if the module was not
+        # imported
+        self.import_time: Optional[float] = None
+        self.import_traceback = ""
+        self.runtime_valid = True
+        # Filled in by precompile_bytecode(); None if no pyc was written
+        self.compile_time: Optional[float] = None
+        self.compile_error = ""
+        self.compile_valid = True
+        self._update_overall()
+
+    def set_import_check(self, check):
+        """Record the outcome of really importing the module."""
+        self.import_time = check.elapsed
+        self.import_traceback = check.traceback
+        self.runtime_valid = check.ok
+        self._update_overall()
+
+    def set_compile_result(self, compiled):
+        """Record the outcome of compiling the file to bytecode."""
+        self.compile_time = None if compiled.skipped else compiled.elapsed
+        self.compile_error = compiled.error
+        self.compile_valid = compiled.ok
+        self._update_overall()
+
+    def _update_overall(self):
+        self.overall_valid = (
+            self.syntax_valid
+            and self.imports_valid
+            and self.builtins_valid
+            and self.runtime_valid
+            and self.compile_valid
+        )
 
     def __str__(self):
         status = "✓ VALID" if self.overall_valid else "✗ INVALID"
@@ -30,17 +74,49 @@ class ValidationResult:
 
 
 class ConvertedCodeValidator:
-    def __init__(self):
-        self.results: List[ValidationResult] = []
+    # Part of the result cache key; bump when the static checks change
+    VERSION = 1
 
-    def validate_syntax(self, file_path: str) -> Tuple[bool, str]:
-        """Validate Python 3 syntax of a file."""
+    def __init__(
+        self,
+        module_index=None,
+        module_cache=None,
+        import_index: Optional[ImportResolutionIndex] = None,
+        result_cache: Optional[ValidationResultCache] = None,
+    ):
+        self.results: List[ValidationResult] = []
+        # Running totals behind get_summary(), kept in step with results
+        self._counts = {
+            "total": 0,
+            "valid": 0,
+            "syntax_errors": 0,
+            "import_errors": 0,
+            "builtin_errors": 0,
+            "runtime_errors": 0,
+            "compile_errors": 0,
+        }
+        # ProjectModuleIndex of the converted project, for local imports
+        self.module_index = module_index
+        # Everything else resolves against the interpreter's sys.path index
+        self._import_index = import_index
+        # Sources and ASTs, shared with ConversionTestGenerator
+        if module_cache is None:
+            module_cache = ParsedModuleCache()
+        self.module_cache = module_cache
+        # Results of unchanged files from earlier runs (optional)
+        self.result_cache = result_cache
+        self._fingerprint: Optional[str] = None
+        # Imports between project modules, set by validate_directory
+        self.import_graph: Optional[ProjectImportGraph] = None
+
+    def validate_syntax(
+        self, file_path: str, source: Optional[str] = None
+    ) -> Tuple[bool, str]:
+        """Validate Python 3 syntax of a file (or of its already-read source)."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source = f.read()
-
-            # Try to parse with Python 3 AST
-            ast.parse(source)
+            module = self.module_cache.get(file_path, source)
+            if module.error is not None:
+                raise module.error
             return True, ""
 
         except SyntaxError as e:
@@ -49,24 +125,46 @@ class ConvertedCodeValidator:
         except Exception as e:
             return False, str(e)
 
-    def validate_imports(self, file_path: str) -> Tuple[bool, List[str]]:
+    def validate_imports(
+        self, file_path: str, source: Optional[str] = None
+    ) -> Tuple[bool, List[str]]:
         """Validate that all imports in the file can be resolved."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source = f.read()
+            module = self.module_cache.get(file_path, source)
+            if module.error is not None:
+                raise module.error
 
-            tree = ast.parse(source)
             import_errors = []
+            graph = self.import_graph
+            if graph is not None and graph.covers(file_path):
+                graph.update(file_path, module.tree)
+            else:
+                graph = None
 
-            for node in ast.walk(tree):
+            for node in ast.walk(module.tree):
                 if isinstance(node, ast.Import):
                     for alias in node.names:
-                        if not self._can_import_module(alias.name):
+                        if graph is not None and graph.resolve(alias.name, file_path):
+                            continue
+                        if not self._can_import(alias.name, file_path):
                             import_errors.append(f"Cannot import module: {alias.name}")
 
                 elif isinstance(node, ast.ImportFrom):
+                    if graph is not None:
+                        internal, missing = graph.check_import_from(node, file_path)
+                        source_module = "." * node.level + (node.module or "")
+                        import_errors.extend(
+                            f"Cannot import name {name} from {source_module}"
+                            for name in missing
+                        )
+                        if internal:
+                            continue
+                        if node.level:
+                            # Relative imports can only refer to project modules
+                            import_errors.append(f"Cannot import module: {source_module}")
+                            continue
                     if node.module:
-                        if not self._can_import_module(node.module):
+                        if not self._can_import(node.module, file_path):
                             import_errors.append(f"Cannot import module: {node.module}")
 
             return len(import_errors) == 0, import_errors
@@ -74,27 +172,69 @@ class ConvertedCodeValidator:
         except Exception as e:
             return False, [f"Error checking imports: {str(e)}"]
 
-    def _can_import_module(self, module_name: str) -> bool:
-        """Check if a module can be imported."""
+    def validate_builtins(
+        self, file_path: str, source: Optional[str] = None
+    ) -> Tuple[bool, List[str]]:
+        """Check for references to builtins Python 3 removed."""
         try:
-            # Skip relative imports and some known problematic modules
-            if module_name.startswith(".") or module_name in ["__main__"]:
-                return True
-
-            # Try to find the module spec
-            spec = importlib.util.find_spec(module_name)
-            return spec is not None
-
-        except (ImportError, ModuleNotFoundError, ValueError):
-            return False
-        except Exception:
-            # For any other exception, assume it's importable to avoid false positives
+            module = self.module_cache.get(file_path, source)
+            if module.error is not None:
+                # Reported by validate_syntax
+                return True, []
+            found = find_legacy_builtins(module.tree, module.source, file_path)
+            errors = [
+                f"Python 2 builtin {name} used at line {line}" for line, name in found
+            ]
+            return len(errors) == 0, errors
+
+        except Exception as e:
+            return False, [f"Error checking builtins: {str(e)}"]
+
+    def _can_import(self, module_name: str, file_path: str) -> bool:
+        """Check a project-local module against the index, others by spec."""
+        if (
+            self.module_index is not None
+            and self.module_index.covers(file_path)
+            and self.module_index.has_module(module_name, file_path)
+        ):
             return True
+        return self._can_import_module(module_name)
 
-    def validate_file(self, file_path: str) -> ValidationResult:
-        """Validate a single converted Python file."""
-        syntax_valid, syntax_error = self.validate_syntax(file_path)
-        imports_valid, import_errors = self.validate_imports(file_path)
+    @property
+    def import_index(self) -> ImportResolutionIndex:
+        """The import resolution index (loaded on first use)."""
+        if self._import_index is None:
+            self._import_index = shared_import_index()
+        return self._import_index
+
+    def _can_import_module(self, module_name: str) -> bool:
+        """Check if a module can be imported, without importing anything."""
+        # Skip relative imports and some known problematic modules
+        if module_name.startswith(".") or module_name in ["__main__"]:
+            return True
+
+        return self.import_index.can_import(module_name)
+
+    def validate_file(
+        self, file_path: str, source: Optional[str] = None
+    ) -> ValidationResult:
+        """Validate a single converted Python file.
+
+        Pass ``source`` when the converted text is already in memory (see
+        ``Python2to3Converter.get_converted_sources()``) to skip reading it.
+        Either way the file is read and parsed at most once (see
+        ``module_cache``).
+        """
+        cache_key = None
+        if self.result_cache is not None:
+            cached, cache_key, source = self._cached_result(file_path, source)
+            if cached is not None:
+                self._record(cached)
+                return cached
+
+        syntax_valid, syntax_error = self.validate_syntax(file_path, source)
+        imports_valid, import_errors = self.validate_imports(file_path, source)
+        _, builtin_errors = self.validate_builtins(file_path, source)
 
         result = ValidationResult(
             file_path=file_path,
@@ -102,14 +242,299 @@ class ConvertedCodeValidator:
             imports_valid=imports_valid,
             syntax_error=syntax_error,
             import_errors=import_errors,
+            builtin_errors=builtin_errors,
         )
 
-        self.results.append(result)
+        if cache_key is not None:
+            self._cache_result(cache_key, result)
+        self._record(result)
         return result
 
-    def validate_directory(self, directory: str) -> List[ValidationResult]:
-        """Validate all Python files in a directory."""
+    def _project_graph(self, file_path: str) -> Optional[ProjectImportGraph]:
+        graph = self.import_graph
+        return graph if graph is not None and graph.covers(file_path) else None
+
+    def _cached_result(
+        self, file_path: str, source: Optional[str]
+    ) -> Tuple[Optional[ValidationResult], Optional[str], Optional[str]]:
+        """Look a file up in the result cache.
+
+        Returns the cached result (None on a miss), the cache key (None if
+        the file cannot be read) and the source, which is read here so a
+        miss does not read it again. Files are keyed by their bytes, so
+        the key does not depend on their encoding.
+        """
+        if source is None:
+            try:
+                with open(file_path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None, None, None
+            try:
+                source = decode_source(data)
+            except (SyntaxError, UnicodeDecodeError):
+                # Left to the parsed-module cache, which reports it
+                source = None
+        else:
+            data = source.encode("utf-8", "surrogatepass")
+        if self._fingerprint is None:
+            self._fingerprint = self.import_index.fingerprint()
+        key = self.result_cache.key(
+            file_path, content_digest(data), self.VERSION, self._fingerprint
+        )
+
+        graph = self._project_graph(file_path)
+        entry = self.result_cache.get(key, graph)
+        if entry is None:
+            return None, key, source
+        if graph is not None:
+            graph.add_file(file_path)
+            graph.set_imports(file_path, entry.pop("imports"))
+        else:
+            entry.pop("imports")
+        return ValidationResult(file_path, **entry), key, source
+
+    def _cache_result(self, cache_key: str, result: ValidationResult):
+        graph = self._project_graph(result.file_path)
+        imports = set()
+        if graph is not None and result.syntax_valid:
+            imports = graph.imports.get(os.path.abspath(result.file_path), set())
+        self.result_cache.put(cache_key, result, graph, imports)
+
+    def _record(self, result: ValidationResult):
+        self.results.append(result)
+        self._count(result, 1)
+
+    def _count(self, result: ValidationResult, sign: int):
+        self._counts["total"] += sign
+        self._counts["valid"] += sign * result.overall_valid
+        self._counts["syntax_errors"] += sign * (not result.syntax_valid)
+        self._counts["import_errors"] += sign * (not result.imports_valid)
+        self._counts["builtin_errors"] += sign * (not result.builtins_valid)
+        self._counts["runtime_errors"] += sign * (not result.runtime_valid)
+        self._counts["compile_errors"] += sign * (not result.compile_valid)
+
+    def revalidate_file(
+        self, file_path: str, source: Optional[str] = None
+    ) -> ValidationResult:
+        """Validate a file again, replacing any earlier result for it."""
+        self._forget(file_path)
+        return self.validate_file(file_path, source)
+
+    def revalidate_changed(
+        self, changed_files: List[str], sources: Optional[Dict[str, str]] = None
+    ) -> List[ValidationResult]:
+        """Revalidate re-converted files and the project modules importing them.
+
+        Files that no longer exist lose their results; the files that
+        imported them are revalidated. Without an import graph (no
+        validate_directory run yet) only the changed files are validated.
+        Returns the new results, changed files first.
+        """
+        sources = sources or {}
+        graph = self.import_graph
+        dependents = set()
+        if graph is not None:
+            for file_path in changed_files:
+                if os.path.exists(file_path):
+                    graph.add_file(file_path)
+                else:
+                    graph.remove_file(file_path)
+            dependents = graph.dependents(changed_files)
+
         results = []
+        changed = {os.path.abspath(f) for f in changed_files}
+        for file_path in list(changed_files) + sorted(dependents - changed):
+            if os.path.exists(file_path):
+                results.append(self.revalidate_file(file_path, sources.get(file_path)))
+            else:
+                self._forget(file_path)
+        self._flush_result_cache()
+        return results
+
+    def _forget(self, file_path: str):
+        file_path = os.path.abspath(file_path)
+        kept = []
+        for result in self.results:
+            if os.path.abspath(result.file_path) == file_path:
+                self._count(result, -1)
+            else:
+                kept.append(result)
+        self.results = kept
+
+    def check_runtime_imports(
+        self, checker, results: Optional[List[ValidationResult]] = None
+    ) -> List[ValidationResult]:
+        """Import the modules behind results (default: all) in the checker's workers.
+
+        Only files that passed the static checks are imported. Their
+        results get the import time and traceback, and an import failure
+        makes them invalid. Returns the results that were checked.
+        """
+        graph = self.import_graph
+        todo = []
+        for result in self.results if results is None else results:
+            if not result.overall_valid:
+                continue
+            directory = os.path.dirname(os.path.abspath(result.file_path))
+            if graph is not None and graph.covers(result.file_path):
+                module = graph.module_name(result.file_path)
+                search_path = [graph.root, directory]
+            else:
+                module = Path(result.file_path).stem
+                search_path = [directory]
+            if module and module != "__init__":
+                todo.append((result, module, search_path))
+
+        checks = checker.check_files(
+            (result.file_path, module, search_path)
+            for result, module, search_path in todo
+        )
+        for (result, _, _), check in zip(todo, checks):
+            self._count(result, -1)
+            result.set_import_check(check)
+            self._count(result, 1)
+        return [result for result, _, _ in todo]
+
+    def precompile_bytecode(
+        self, compiler, results: Optional[List[ValidationResult]] = None
+    ) -> List[ValidationResult]:
+        """Write ``__pycache__`` files for results (default: all) with the compiler.
+
+        Files with syntax errors are skipped. The compile time (None when
+        the pyc was already current) and any error are stored on each
+        result; a failed compile makes it invalid. Returns the results
+        that were compiled.
+        """
+        todo = [
+            result
+            for result in (self.results if results is None else results)
+            if result.syntax_valid
+        ]
+        compiled = compiler.compile_files(result.file_path for result in todo)
+        for result, outcome in zip(todo, compiled):
+            self._count(result, -1)
+            result.set_compile_result(outcome)
+            self._count(result, 1)
+        return todo
+
+    def _parse_project_file(self, file_path: str) -> Optional[ast.Module]:
+        try:
+            return self.module_cache.get(file_path).tree
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def validate_directory(
+        self,
+        directory: str,
+        sources: Optional[Dict[str, str]] = None,
+        workers: int = 1,
+    ) -> List[ValidationResult]:
+        """Validate all Python files in a directory.
+
+        ``sources`` maps file paths to text already in memory; those files
+        are not read again. Imports between the files are resolved against
+        the project's import graph (kept in ``import_graph`` for
+        ``revalidate_changed``). With ``workers`` > 1 the files are
+        validated on a process pool and the results come back in completion
+        order (see ``iter_validate_directory``).
+        """
+        return list(self.iter_validate_directory(directory, sources, workers))
+
+    def iter_validate_directory(
+        self,
+        directory: str,
+        sources: Optional[Dict[str, str]] = None,
+        workers: int = 1,
+    ) -> Iterator[ValidationResult]:
+        """Validate all Python files in a directory, yielding each result.
+
+        Results are recorded (and counted by ``get_summary``) as they are
+        yielded, so a caller can report progress while workers run.
+        """
+        sources = dict(sources or {})
+        file_paths = self._project_files(directory)
+
+        # Register every module before resolving imports between them
+        self.import_graph = ProjectImportGraph(directory, self._parse_project_file)
+        for file_path in file_paths:
+            self.import_graph.add_file(file_path)
+
+        if workers <= 1 or len(file_paths) < 2:
+            for file_path in file_paths:
+                yield self.validate_file(file_path, sources.get(file_path))
+            self._flush_result_cache()
+            return
+
+        # Cached results come straight from this process
+        cache_keys: Dict[str, str] = {}
+        if self.result_cache is not None:
+            misses = []
+            for file_path in file_paths:
+                cached, key, source = self._cached_result(
+                    file_path, sources.get(file_path)
+                )
+                if cached is not None:
+                    self._record(cached)
+                    yield cached
+                    continue
+                if key is not None:
+                    cache_keys[file_path] = key
+                    sources[file_path] = source
+                misses.append(file_path)
+            file_paths = misses
+
+        # Workers get the project layout and the resolution indexes once
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_validation_worker,
+            initargs=(self.module_index, self.import_index, directory, file_paths),
+        ) as pool:
+            files = iter(file_paths)
+            pending: Set = set()
+            while True:
+                for file_path in files:
+                    pending.add(
+                        pool.submit(_validate_in_worker, file_path, sources.get(file_path))
+                    )
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result, imports = future.result()
+                    self.import_graph.set_imports(result.file_path, imports)
+                    if result.file_path in cache_keys:
+                        self._cache_result(cache_keys[result.file_path], result)
+                    self._record(result)
+                    yield result
+        self._flush_result_cache()
+
+    def _flush_result_cache(self):
+        if self.result_cache is not None:
+            self.result_cache.flush()
+
+    def build_import_graph(self, directory: str) -> ProjectImportGraph:
+        """Record the imports between a project's files without validating them.
+
+        Lets ``revalidate_changed`` find dependents when no
+        validate_directory run came first (watch mode).
+        """
+        file_paths = self._project_files(directory)
+        graph = ProjectImportGraph(directory, self._parse_project_file)
+        for file_path in file_paths:
+            graph.add_file(file_path)
+        for file_path in file_paths:
+            tree = self._parse_project_file(file_path)
+            if tree is not None:
+                graph.update(file_path, tree)
+        self.import_graph = graph
+        return graph
+
+    @staticmethod
+    def _project_files(directory: str) -> List[str]:
+        file_paths = []
         for root, dirs, files in os.walk(directory):
             # Skip common non-source directories
             dirs[:] = [
@@ -120,25 +545,21 @@ class ConvertedCodeValidator:
 
             for file in files:
                 if file.endswith(".py"):
-                    file_path = os.path.join(root, file)
-                    result = self.validate_file(file_path)
-                    results.append(result)
-
-        return results
+                    file_paths.append(os.path.join(root, file))
+        return file_paths
 
     def get_summary(self) -> Dict[str, int]:
         """Get validation summary statistics."""
-        total = len(self.results)
-        valid = sum(1 for r in self.results if r.overall_valid)
-        syntax_errors = sum(1 for r in self.results if not r.syntax_valid)
-        import_errors = sum(1 for r in self.results if not r.imports_valid)
-
+        counts = self._counts
         return {
-            "total": total,
-            "valid": valid,
-            "invalid": total - valid,
-            "syntax_errors": syntax_errors,
-            "import_errors": import_errors,
+            "total": counts["total"],
+            "valid": counts["valid"],
+            "invalid": counts["total"] - counts["valid"],
+            "syntax_errors": counts["syntax_errors"],
+            "import_errors": counts["import_errors"],
+            "builtin_errors": counts["builtin_errors"],
+            "runtime_errors": counts["runtime_errors"],
+            "compile_errors": counts["compile_errors"],
         }
 
     def get_failed_validations(self) -> List[ValidationResult]:
@@ -146,11 +567,57 @@ class ConvertedCodeValidator:
         return [r for r in self.results if not r.overall_valid]
 
 
-class ConversionTestGenerator:
-    """Generate basic tests for converted Python files."""
+# Validator of a process-pool worker (see iter_validate_directory)
+_worker_validator: Optional[ConvertedCodeValidator] = None
+
+
+def _init_validation_worker(
+    module_index, import_index, directory: str, file_paths: List[str]
+):
+    global _worker_validator
+    validator = ConvertedCodeValidator(module_index, import_index=import_index)
+    validator.import_graph = ProjectImportGraph(
+        directory, validator._parse_project_file
+    )
+    for file_path in file_paths:
+        validator.import_graph.add_file(file_path)
+    _worker_validator = validator
+
 
-    def __init__(self):
-        self.test_template = '''import unittest
+def _validate_in_worker(
+    file_path: str, source: Optional[str]
+) -> Tuple[ValidationResult, Set[str]]:
+    """Validate one file; returns the result and the file's graph imports."""
+    validator = _worker_validator
+    result = validator.validate_file(file_path, source)
+    validator._forget(file_path)
+    imports = validator.import_graph.imports.get(os.path.abspath(file_path), set())
+    return result, imports
+
+
+class ConversionTestGenerator:
+    """Generate basic tests for converted Python files.
+
+    Pass the validator's ``module_cache`` to reuse the sources and ASTs it
+    has already parsed. Each test file starts with a signature of the
+    module's public functions and classes; a test file is only rewritten
+    when that signature changes, so unchanged tests keep their mtime and
+    pytest's cached bytecode.
+    """
+
+    # Part of the API signature; bump when the template changes
+    VERSION = 1
+    SIGNATURE_PREFIX = "# api-signature: "
+
+    def __init__(self, module_cache: Optional[ParsedModuleCache] = None):
+        if module_cache is None:
+            module_cache = ParsedModuleCache()
+        self.module_cache = module_cache
+        self.stats = {"written": 0, "unchanged": 0}
+        # Test file -> (module file, dotted name) it tests
+        self.targets: Dict[str, Tuple[str, str]] = {}
+        self.test_template = '''{signature_line}
+import unittest
 import sys
 import os
 
@@ -158,7 +625,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    import {module_name}
+    {import_line}
 except ImportError as e:
     print(f"Cannot import {module_name}: {{e}}")
     {module_name} = None
@@ -188,22 +655,33 @@ if __name__ == '__main__':
 '''
 
     def generate_test_for_file(
-        self, file_path: str, test_dir: str = "tests"
+        self, file_path: str, test_dir: str = "tests", module_name: Optional[str] = None
     ) -> Optional[str]:
-        """Generate a basic test file for a Python module."""
+        """Generate a basic test file for a Python module.
+
+        ``module_name`` is the dotted name to import (default: the file's
+        stem); it also names the test file, so same-named modules of
+        different packages get separate tests. The file is left alone if
+        its signature still matches the module's API.
+        """
         try:
             # Create test directory if it doesn't exist
             test_path = Path(test_dir)
             test_path.mkdir(exist_ok=True)
 
             # Parse the module to understand its structure
-            with open(file_path, "r", encoding="utf-8") as f:
-                source = f.read()
-
-            tree = ast.parse(source)
+            module = self.module_cache.get(file_path)
+            if module.error is not None:
+                raise module.error
+            tree = module.tree
 
             # Extract module information
-            module_name = Path(file_path).stem
+            import_name = module_name or Path(file_path).stem
+            package, _, module_name = import_name.rpartition(".")
+            if package:
+                import_line = f"from {package} import {module_name}"
+            else:
+                import_line = f"import {module_name}"
             class_name = module_name.replace("_", " ").title().replace(" ", "")
 
             # Find functions and classes
@@ -216,6 +694,13 @@ if __name__ == '__main__':
                 elif isinstance(node, ast.ClassDef):
                     classes.append(node.name)
 
+            signature = self.api_signature(tree, import_name)
+            test_file_path = test_path / self.test_file_name(import_name)
+            self.targets[str(test_file_path)] = (file_path, import_name)
+            if self._read_signature(test_file_path) == signature:
+                self.stats["unchanged"] += 1
+                return str(test_file_path)
+
             # Generate additional tests based on found elements
             additional_tests = []
 
@@ -246,27 +731,70 @@ if __name__ == '__main__':
 
             # Generate the test file content
             test_content = self.test_template.format(
+                signature_line=self.SIGNATURE_PREFIX + signature,
+                import_line=import_line,
                 module_name=module_name,
                 class_name=class_name,
                 additional_tests="".join(additional_tests),
             )
 
-            # Write test file
-            test_file_path = test_path / f"test_{module_name}.py"
-            with open(test_file_path, "w", encoding="utf-8") as f:
-                f.write(test_content)
-
+            self._write_atomic(test_file_path, test_content)
+            self.stats["written"] += 1
             return str(test_file_path)
 
         except Exception as e:
             print(f"Failed to generate test for {file_path}: {e}")
             return None
 
+    @staticmethod
+    def test_file_name(import_name: str) -> str:
+        """Test file for a dotted module name (``pkg.mod`` -> ``test_pkg_mod.py``)."""
+        return f"test_{import_name.replace('.', '_')}.py"
+
+    def api_signature(self, tree: ast.Module, import_name: str) -> str:
+        """Hash of the public functions and classes the generated test covers."""
+        parts = [str(self.VERSION), import_name]
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
+                # ast.dump() instead of ast.unparse(), which needs Python 3.9
+                parts.append(f"def {node.name}({ast.dump(node.args)})")
+            elif isinstance(node, ast.ClassDef):
+                bases = ", ".join(ast.dump(base) for base in node.bases)
+                parts.append(f"class {node.name}({bases})")
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+
+    def _read_signature(self, test_file_path: Path) -> Optional[str]:
+        try:
+            with open(test_file_path, "r", encoding="utf-8") as f:
+                first_line = f.readline().rstrip("\n")
+        except (OSError, UnicodeDecodeError):
+            return None
+        if first_line.startswith(self.SIGNATURE_PREFIX):
+            return first_line[len(self.SIGNATURE_PREFIX):]
+        return None
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str):
+        """Replace a file in one step, so a reader never sees it half written."""
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
     def generate_tests_for_directory(
         self, source_dir: str, test_dir: str = "tests"
     ) -> List[str]:
-        """Generate test files for all Python files in a directory."""
+        """Generate test files for all Python files in a directory.
+
+        Modules are imported by their dotted name below ``source_dir``;
+        only test files whose module API changed are rewritten.
+        """
         generated_tests = []
+        used_names: Set[str] = set()
 
         for root, dirs, files in os.walk(source_dir):
             # Skip test directories and common non-source directories
@@ -277,6 +805,7 @@ if __name__ == '__main__':
                 not in {
                     "tests",
                     "test",
+                    "generated_tests",
                     ".git",
                     "__pycache__",
                     ".pytest_cache",
@@ -288,12 +817,54 @@ if __name__ == '__main__':
             for file in files:
                 if file.endswith(".py") and not file.startswith("test_"):
                     file_path = os.path.join(root, file)
-                    test_file = self.generate_test_for_file(file_path, test_dir)
+                    module_name = self._dotted_name(source_dir, file_path)
+                    test_name = self.test_file_name(module_name)
+                    if test_name in used_names:
+                        # Only a_b.c and a.b_c map to the same file
+                        print(f"Skipping test for {file_path}: {test_name} is taken")
+                        continue
+                    used_names.add(test_name)
+                    test_file = self.generate_test_for_file(
+                        file_path, test_dir, module_name
+                    )
                     if test_file:
                         generated_tests.append(test_file)
 
         return generated_tests
 
+    @staticmethod
+    def _dotted_name(source_dir: str, file_path: str) -> str:
+        parts = os.path.relpath(file_path, source_dir)[: -len(".py")].split(os.sep)
+        if parts[-1] == "__init__" and len(parts) > 1:
+            parts.pop()
+        return ".".join(parts)
+
+    def run_smoke_tests(
+        self, test_dir: str = "generated_tests", workers: Optional[int] = None
+    ) -> Iterator[SmokeResult]:
+        """Run the generated tests in parallel, yielding results as they finish.
+
+        The modules under test are preloaded in a runner process; tests whose
+        file and module are unchanged since they last passed are skipped.
+        """
+        test_files = sorted(
+            str(path) for path in Path(test_dir).glob("test_*.py")
+        )
+        known = [self.targets.get(test_file) for test_file in test_files]
+        runner = SmokeTestRunner(
+            workers=workers,
+            preload=[target[1] for target in known if target is not None],
+            # Where the generated tests import their modules from
+            source_root=os.path.dirname(os.path.abspath(test_dir)),
+            state_file=os.path.join(test_dir, ".smoke-state.json"),
+        )
+        targets = {
+            test_file: target[0]
+            for test_file, target in zip(test_files, known)
+            if target is not None
+        }
+        return runner.run(test_files, targets)
+
     def run_tests(self, test_dir: str = "tests") -> Dict[str, any]:
         """Run the generated tests and return results."""
         try:
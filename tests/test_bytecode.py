@@ -0,0 +1,85 @@
+import unittest
+import importlib.util
+import marshal
+import os
+import shutil
+import tempfile
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tester.bytecode import BytecodeCompiler
+from tester.validator import ConvertedCodeValidator
+
+
+class TestBytecodeCompiler(unittest.TestCase):
+    def setUp(self):
+        """Create valid modules, one the compiler rejects and one that won't parse."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.create_file("shapes.py", "def area(w, h):\n    return w * h\n")
+        self.create_file("pkg/__init__.py", "NAME = 'pkg'\n")
+        # Parses, but compile() rejects it
+        self.create_file("scoping.py", "def f():\n    nonlocal x\n")
+        self.create_file("broken.py", "def broken(\n")
+        self.validator = ConvertedCodeValidator()
+        self.validator.validate_directory(self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_file(self, relative_path, content):
+        path = os.path.join(self.temp_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def results_by_name(self, results):
+        return {os.path.basename(r.file_path): r for r in results}
+
+    def test_precompile_reuses_parsed_modules(self):
+        """Test writing loadable pycs from the validator's ASTs."""
+        parses = self.validator.module_cache.stats["parses"]
+        compiler = BytecodeCompiler(self.validator.module_cache)
+
+        compiled = self.results_by_name(self.validator.precompile_bytecode(compiler))
+
+        self.assertEqual(self.validator.module_cache.stats["parses"], parses)
+        self.assertNotIn("broken.py", compiled)
+        self.assertIsNotNone(compiled["shapes.py"].compile_time)
+        self.assertTrue(compiled["shapes.py"].overall_valid)
+        self.assertFalse(compiled["scoping.py"].overall_valid)
+        self.assertIn("nonlocal", compiled["scoping.py"].compile_error)
+        self.assertEqual(self.validator.get_summary()["compile_errors"], 1)
+        self.assertEqual(compiler.stats["compiled"], 2)
+
+        shapes = os.path.join(self.temp_dir, "shapes.py")
+        with open(importlib.util.cache_from_source(shapes), "rb") as f:
+            data = f.read()
+        self.assertEqual(data[:4], importlib.util.MAGIC_NUMBER)
+        namespace = {}
+        exec(marshal.loads(data[16:]), namespace)
+        self.assertEqual(namespace["area"](2, 3), 6)
+
+    def test_current_pycs_are_skipped(self):
+        """Test that a second run only compiles files that changed."""
+        file_paths = [r.file_path for r in self.validator.results]
+        list(BytecodeCompiler().compile_files(file_paths))
+        # Same mtime second, different size
+        changed = self.create_file("shapes.py", "def area(w, h):\n    return h * w\n\n")
+
+        compiler = BytecodeCompiler(workers=2)
+        results = self.results_by_name(compiler.compile_files(file_paths))
+
+        self.assertFalse(results["shapes.py"].skipped)
+        self.assertTrue(results["__init__.py"].skipped)
+        self.assertEqual(compiler.stats["compiled"], 1)
+        self.assertEqual(compiler.stats["failed"], 2)
+        self.assertTrue(os.path.exists(importlib.util.cache_from_source(changed)))
+
+
+if __name__ == "__main__":
+    unittest.main()
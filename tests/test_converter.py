@@ -9,7 +9,12 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from converter.engine import Python2to3Converter, ConversionResult
+from converter.engine import (
+    ConversionResult,
+    Python2to3Converter,
+    is_free_threaded,
+    resolve_executor,
+)
 
 
 class TestPython2to3Converter(unittest.TestCase):
@@ -115,6 +120,59 @@ def broken_function(
         self.assertFalse(result.success)
         self.assertIn("error", result.error.lower())
 
+    def test_parse_failure_recovery(self):
+        """Test that files 2to3 cannot parse are retried after preprocessing."""
+        mixed_content = """import sys
+print "converting", `sys.argv`
+print("done", file=sys.stderr)
+exec "x = 0777" in {}
+mode = 0755
+"""
+        result = self.converter.convert_source(mixed_content, "mixed.py")
+
+        self.assertTrue(result.success, f"Conversion failed: {result.error}")
+        self.assertTrue(result.recovered)
+        self.assertIn("Recovered from 2to3 conversion error: ParseError", result.error)
+        self.assertEqual(
+            result.output,
+            """import sys
+print("converting", repr(sys.argv))
+print("done", file=sys.stderr)
+exec("x = 0777", {})
+mode = 0o755
+""",
+        )
+
+        broken = self.converter.convert_source("def broken(\n", "broken.py")
+        self.assertFalse(broken.success)
+        self.assertIn("recovery failed", broken.error)
+        self.assertEqual(
+            self.converter.get_recovery_stats(),
+            {
+                "attempted": 2,
+                "recovered": 1,
+                "still_failing": 1,
+                "recovery_rate": 0.5,
+            },
+        )
+
+    def test_convert_source_matches_convert_file(self):
+        """Test that in-memory conversion gives the same output as convert_file."""
+        py2_content = """import urllib2
+d = {}
+for k, v in d.iteritems():
+    print k, v
+"""
+        file_path = self.create_test_file("test_source.py", py2_content)
+
+        in_memory = self.converter.convert_source(py2_content, file_path)
+        on_disk = self.converter.convert_file(file_path, backup=False)
+
+        self.assertTrue(in_memory.success, f"Conversion failed: {in_memory.error}")
+        with open(file_path, "r") as f:
+            self.assertEqual(in_memory.output, f.read())
+        self.assertEqual(in_memory.changes_made, on_disk.changes_made)
+
     def test_find_python_files(self):
         """Test finding Python files in directory."""
         # Create test files
@@ -160,6 +218,50 @@ def broken_function(
         self.assertEqual(summary["successful"], 2)
         self.assertEqual(summary["failed"], 0)
 
+    def test_convert_directory_in_pool(self):
+        """Test converting on thread and process pools gives the serial result."""
+        sources = {
+            "a.py": 'print "a"\n',
+            "b.py": "for k in d.iterkeys():\n    pass\n",
+            "c.py": 'print "c"\nprint("c", end="")\n',
+            "d.py": 'print("d")\n',
+        }
+        expected = {
+            name: self.converter.convert_source(source, name).output
+            for name, source in sources.items()
+        }
+
+        for executor in ("thread", "process"):
+            with self.subTest(executor=executor):
+                for name, source in sources.items():
+                    self.create_test_file(name, source)
+                converter = Python2to3Converter()
+
+                results = converter.convert_directory(
+                    self.temp_dir, backup=False, workers=2, executor=executor
+                )
+
+                self.assertEqual(len(results), len(sources))
+                for result in results:
+                    name = os.path.basename(result.file_path)
+                    self.assertTrue(result.success, result.error)
+                    self.assertEqual(result.output, expected[name])
+                    with open(result.file_path, "r") as f:
+                        self.assertEqual(f.read(), expected[name])
+                self.assertEqual(converter.executor_metrics["Executor"], executor)
+                self.assertEqual(converter.executor_metrics["Workers"], 2)
+                # Worker counters are merged into the parent converter
+                self.assertEqual(converter.get_recovery_stats()["recovered"], 1)
+                self.assertEqual(sum(converter.get_fast_lane_stats().values()), 4)
+
+    def test_resolve_executor(self):
+        """Test that auto only picks threads on a free-threaded build."""
+        expected = "thread" if is_free_threaded() else "process"
+        self.assertEqual(resolve_executor("auto"), expected)
+        self.assertEqual(resolve_executor("process"), "process")
+        with self.assertRaises(ValueError):
+            resolve_executor("fibers")
+
     def test_restore_backups(self):
         """Test restoring backup files."""
         py2_content = 'print "Original content"'
@@ -184,6 +286,114 @@ def broken_function(
             restored_content = f.read()
         self.assertEqual(restored_content, py2_content)
 
+    def test_latin1_file_round_trip(self):
+        """Test that a latin-1 file with a coding cookie is written back as latin-1."""
+        file_path = os.path.join(self.temp_dir, "latin1.py")
+        source = '# -*- coding: latin-1 -*-\nprint "caf\xe9"\n'
+        with open(file_path, "wb") as f:
+            f.write(source.encode("latin-1"))
+
+        result = self.converter.convert_file(file_path, backup=False)
+
+        self.assertTrue(result.success, result.error)
+        with open(file_path, "rb") as f:
+            self.assertEqual(
+                f.read(),
+                '# -*- coding: latin-1 -*-\nprint("caf\xe9")\n'.encode("latin-1"),
+            )
+
+    def test_line_endings_and_bom_preserved(self):
+        """Test that CRLF line endings and a UTF-8 BOM survive conversion."""
+        file_path = os.path.join(self.temp_dir, "windows.py")
+        with open(file_path, "wb") as f:
+            f.write(b'\xef\xbb\xbfimport os\r\nprint "hi"\r\n')
+
+        result = self.converter.convert_file(file_path)
+
+        self.assertTrue(result.success, result.error)
+        self.assertEqual(result.output, 'import os\nprint("hi")\n')
+        with open(file_path, "rb") as f:
+            self.assertEqual(f.read(), b'\xef\xbb\xbfimport os\r\nprint("hi")\r\n')
+        with open(f"{file_path}.py2bak", "rb") as f:
+            self.assertEqual(f.read(), b'\xef\xbb\xbfimport os\r\nprint "hi"\r\n')
+
+    def test_undecodable_file_reports_error(self):
+        """Test that a file that does not match its encoding fails cleanly."""
+        file_path = os.path.join(self.temp_dir, "bad.py")
+        with open(file_path, "wb") as f:
+            f.write(b'print "caf\xe9"\n')
+
+        result = self.converter.convert_file(file_path)
+
+        self.assertFalse(result.success)
+        self.assertIn("Error converting", result.error)
+        with open(file_path, "rb") as f:
+            self.assertEqual(f.read(), b'print "caf\xe9"\n')
+
+    def test_check_file_stops_at_first_hit(self):
+        """Test that checking reports one fixer and leaves the file alone."""
+        py2_content = 'print "a"\nprint "b"\nx = 10L\n'
+        file_path = self.create_test_file("test_check.py", py2_content)
+
+        result = self.converter.check_file(file_path)
+
+        self.assertTrue(result.needs_conversion)
+        self.assertEqual(len(result.fixer_hits), 1)
+        self.assertEqual(sum(result.fixer_hits.values()), 1)
+        with open(file_path, "r") as f:
+            self.assertEqual(f.read(), py2_content)
+        self.assertFalse(os.path.exists(f"{file_path}.py2bak"))
+
+    def test_check_source_counts_all_hits(self):
+        """Test that a full check counts every fixer hit."""
+        result = self.converter.check_source(
+            'print "a"\nprint "b"\nx = 10L\n', stop_at_first_hit=False
+        )
+
+        self.assertEqual(result.fixer_hits["fix_print"], 2)
+        self.assertEqual(result.fixer_hits["fix_numliterals"], 1)
+
+    def test_check_source_python3_code(self):
+        """Test that Python 3 code does not need conversion."""
+        result = self.converter.check_source('print("ok")\n')
+
+        self.assertFalse(result.needs_conversion)
+        self.assertEqual(result.error, "")
+
+    def test_check_source_print_function_calls(self):
+        """Test that converted print calls with keywords pass the check."""
+        result = self.converter.check_source(
+            'import sys\nprint("a", end="")\nprint(1, file=sys.stderr)\n'
+        )
+
+        self.assertEqual(result.error, "")
+        self.assertFalse(result.needs_conversion)
+
+        # Leftover Python 2 syntax in such a file still needs conversion
+        result = self.converter.check_source(
+            'print("a", end="")\nprint "b"\nx = 10L\n', stop_at_first_hit=False
+        )
+        self.assertEqual(result.error, "")
+        self.assertEqual(result.fixer_hits["recovery_preprocessor"], 1)
+        self.assertEqual(result.fixer_hits["fix_numliterals"], 1)
+
+    def test_check_directory_plan(self):
+        """Test checking a directory in worker processes and building a plan."""
+        self.create_test_file("old.py", 'print "old"\n')
+        self.create_test_file("new.py", 'print("new")\n')
+        self.create_test_file("broken.py", "def broken(\n")
+
+        results = self.converter.check_directory(
+            self.temp_dir, workers=2, stop_at_first_hit=False
+        )
+        plan = self.converter.get_check_plan(results, workers=2)
+
+        self.assertEqual(plan["files_checked"], 3)
+        self.assertEqual(plan["files_needing_conversion"], 1)
+        self.assertEqual(plan["files_with_errors"], 1)
+        self.assertEqual(plan["fixer_hits"], {"fix_print": 1})
+        self.assertIn(os.path.join(self.temp_dir, "old.py"), plan["files"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import tempfile
+import os
+import shutil
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter import daemon as daemon_module
+from converter.daemon import ConversionDaemon, DaemonClient, request_conversion
+from converter.plugins import FixerPlugin
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class TestConversionDaemon(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Start one daemon for all tests; warming converters is slow."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.socket_path = os.path.join(cls.temp_dir, "daemon.sock")
+        cls.daemon = ConversionDaemon(cls.socket_path, workers=2)
+        cls.thread = cls.daemon.serve_in_background()
+        cls.client = DaemonClient(cls.socket_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the daemon and clean up."""
+        cls.daemon.shutdown()
+        cls.thread.join(5)
+        shutil.rmtree(cls.temp_dir)
+
+    def test_convert_request(self):
+        """Test converting source through the daemon."""
+        response = self.client.request(
+            {"command": "convert", "source": 'print "hi"\n', "path": "hi.py"}
+        )
+
+        self.assertTrue(response["success"])
+        self.assertTrue(response["changes_made"])
+        self.assertEqual(response["output"], 'print("hi")\n')
+        self.assertGreaterEqual(response["latency_ms"], 0)
+
+    def test_check_request_has_no_output(self):
+        """Test that check requests only report whether conversion is needed."""
+        response = self.client.request(
+            {"command": "check", "source": 'print("ok")\n', "path": "ok.py"}
+        )
+
+        self.assertTrue(response["success"])
+        self.assertFalse(response["changes_made"])
+        self.assertNotIn("output", response)
+
+    def test_check_request_names_first_fixer(self):
+        """Test that check requests name the first fixer that applies."""
+        response = self.client.request(
+            {"command": "check", "source": 'print "old"\n', "path": "old.py"}
+        )
+
+        self.assertTrue(response["success"])
+        self.assertTrue(response["changes_made"])
+        self.assertEqual(response["fixer"], "fix_print")
+
+    def test_concurrent_requests(self):
+        """Test that concurrent clients all get their own results."""
+
+        def convert(i):
+            return self.client.request(
+                {"command": "convert", "source": f"x = {i}L\n", "path": f"m{i}.py"}
+            )
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            responses = list(pool.map(convert, range(12)))
+
+        for i, response in enumerate(responses):
+            self.assertEqual(response["output"], f"x = {i}\n")
+
+    def test_unknown_command(self):
+        """Test that unknown commands return an error response."""
+        response = self.client.request({"command": "explode"})
+
+        self.assertFalse(response["success"])
+        self.assertIn("Unknown command", response["error"])
+
+    def test_thin_client_uses_daemon(self):
+        """Test that request_conversion talks to a running daemon."""
+        response = request_conversion("x = 1L\n", socket_path=self.socket_path)
+
+        self.assertTrue(response["daemon"])
+        self.assertEqual(response["output"], "x = 1\n")
+
+
+class TestThinClientFallback(unittest.TestCase):
+    def test_falls_back_without_daemon(self):
+        """Test in-process conversion when no daemon is listening."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            response = request_conversion(
+                'print "hi"\n', socket_path=os.path.join(temp_dir, "none.sock")
+            )
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertFalse(response["daemon"])
+        self.assertTrue(response["success"])
+        self.assertEqual(response["output"], 'print("hi")\n')
+
+    def test_fallback_uses_converter_options(self):
+        """Test that the in-process fallback honours the converter options."""
+        from fissix import fixer_base
+        from fissix.fixer_util import Name
+
+        class FixSetWrapper(fixer_base.BaseFix):
+            BM_compatible = True
+            PATTERN = "power< name='Set' trailer< '(' [any] ')' > >"
+
+            def transform(self, node, results):
+                name = results["name"]
+                name.replace(Name("set", prefix=name.prefix))
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            response = request_conversion(
+                "items = Set([1])\n",
+                socket_path=os.path.join(temp_dir, "none.sock"),
+                fixer_plugins=[FixerPlugin("fix_set_wrapper", FixSetWrapper)],
+            )
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertFalse(response["daemon"])
+        self.assertEqual(response["output"], "items = set([1])\n")
+
+    def test_daemon_needs_unix_sockets(self):
+        """Test a clear error where Unix socket servers are unavailable."""
+        server_class = getattr(daemon_module.socketserver, "UnixStreamServer", None)
+        if server_class is not None:
+            del daemon_module.socketserver.UnixStreamServer
+        try:
+            with self.assertRaisesRegex(RuntimeError, "Unix sockets not supported"):
+                ConversionDaemon(workers=1).start()
+        finally:
+            if server_class is not None:
+                daemon_module.socketserver.UnixStreamServer = server_class
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import os
+import glob
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.engine import Python2to3Converter
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+FAST_LANE_SOURCES = [
+    'print "a",\n',
+    'print >>f, "a", b,\n',
+    "print >>f\n",
+    "print\n",
+    'print ("a", 1)\n',
+    'print("a")\n',
+    "print -1\n",
+    "print x.y, None\n",
+    'print "a" % (1,\n   2)\n',
+    'print  "a"  # c\n',
+    'print "x"; print "y"\n',
+    'if x: print "a", ; y = 1\n',
+    'print """\nprint x\n"""\n',
+    "x = d.iteritems()\n",
+    "for k, v in d.iteritems():\n    pass\n",
+    "y = [k for k in self.d.iterkeys() if k]\n",
+    "z = list(d.itervalues()), iter(d.itervalues())\n",
+    "if d.has_key(k) and not e.has_key(u'k'):\n    pass\n",
+    "try:\n    pass\nexcept (A, B), e:\n    pass\nexcept E,e:\n    pass\n",
+    "c = a <> b\n",
+    's = ur"\\d" + u"y" + "\\u00e9"\n',
+    "import os\nprint os.sep\n",
+]
+
+
+class TestFastLane(unittest.TestCase):
+    def setUp(self):
+        """Set up a converter with and one without the fast lane."""
+        self.fast = Python2to3Converter()
+        self.full = Python2to3Converter(fast_lane=False)
+
+    def assertSameConversion(self, source, name="module.py"):
+        expected = self.full.convert_source(source, name)
+        actual = self.fast.convert_source(source, name)
+        self.assertEqual(actual.output, expected.output)
+        self.assertEqual(actual.success, expected.success)
+        self.assertEqual(actual.error, expected.error)
+
+    def test_fast_lane_matches_full_engine(self):
+        """Test that fast-lane files convert exactly like the full engine."""
+        for source in FAST_LANE_SOURCES:
+            with self.subTest(source=source):
+                self.assertSameConversion(source)
+
+        stats = self.fast.get_fast_lane_stats()
+        self.assertEqual(stats["fast_lane"], len(FAST_LANE_SOURCES))
+        self.assertEqual(stats["full_engine"], 0)
+
+    def test_other_fixers_use_full_engine(self):
+        """Test that files needing any other fixer take the full engine."""
+        sources = [
+            "for i in xrange(3):\n    print i\n",
+            "import urllib2\n",
+            "x = 10L\n",
+            "print `x`\n",
+            "raise E, 'message'\n",
+            "x = 1 + d.has_key(k)\n",
+            "print(1, end='')\n",
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                self.assertSameConversion(source)
+
+        self.assertEqual(self.fast.get_fast_lane_stats()["full_engine"], len(sources))
+
+    def test_sample_projects(self):
+        """Test that the sample projects convert exactly like the full engine."""
+        pattern = os.path.join(ROOT, "test-py2-*", "**", "*.py")
+        files = sorted(glob.glob(pattern, recursive=True))
+        self.assertTrue(files)
+
+        for file_path in files:
+            with open(file_path, "r", encoding="utf-8") as f:
+                source = f.read()
+            self.assertSameConversion(source, file_path)
+            for line in source.splitlines():
+                # Single statements exercise more of the fast lane
+                line = line.strip()
+                if line.startswith(("print ", "except ")) or "has_key" in line:
+                    self.assertSameConversion(line + "\n", file_path)
+
+        self.assertGreater(self.fast.get_fast_lane_stats()["fast_lane"], 0)
+
+    def test_plugins_disable_fast_lane(self):
+        """Test that plugin fixers always get the full engine."""
+        converter = Python2to3Converter(fixer_plugins=[object()])
+        self.assertIsNone(converter.fast_lane)
+        self.assertEqual(converter.get_fast_lane_stats(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
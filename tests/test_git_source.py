@@ -0,0 +1,130 @@
+import unittest
+import tempfile
+import os
+import shutil
+import subprocess
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.git_source import GitBlobReader, GitChangeConverter
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class TestGitChangeConverter(unittest.TestCase):
+    def setUp(self):
+        """Set up a small repository with one committed Python 2 file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.git("init", "-q")
+        self.create_test_file("old.py", 'print "old"\n')
+        self.create_test_file("notes.txt", "not python\n")
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "initial")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def git(self, *args):
+        subprocess.run(
+            [
+                "git",
+                "-c",
+                "user.name=Test",
+                "-c",
+                "user.email=test@example.com",
+                *args,
+            ],
+            cwd=self.temp_dir,
+            check=True,
+            capture_output=True,
+        )
+
+    def create_test_file(self, filename, content):
+        """Create a test file in the repository."""
+        file_path = os.path.join(self.temp_dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def test_blob_reader_reuses_process(self):
+        """Test reading several blobs through one cat-file process."""
+        with GitBlobReader(self.temp_dir) as reader:
+            self.assertEqual(reader.read_blob("HEAD:old.py"), b'print "old"\n')
+            process = reader._process
+            self.assertEqual(reader.read_blob("HEAD:notes.txt"), b"not python\n")
+            self.assertIs(reader._process, process)
+
+    def test_staged_changes_only(self):
+        """Test that only staged Python files are converted."""
+        self.create_test_file("new.py", 'print "new"\n')
+        self.create_test_file("unstaged.py", 'print "unstaged"\n')
+        self.git("add", "new.py")
+
+        git_converter = GitChangeConverter(self.temp_dir)
+        results = git_converter.convert_changes(staged=True)
+
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].file_path.endswith("new.py"))
+        self.assertEqual(results[0].output, 'print("new")\n')
+
+    def test_revision_range_to_worktree(self):
+        """Test converting a commit range and writing into the worktree."""
+        file_path = self.create_test_file("second.py", 'd = {}\nd.has_key("x")\n')
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "second")
+
+        git_converter = GitChangeConverter(self.temp_dir)
+        results = git_converter.convert_changes("HEAD~1..HEAD")
+        written = git_converter.write_to_worktree(results)
+
+        self.assertEqual(written, [file_path])
+        with open(file_path, "r") as f:
+            self.assertEqual(f.read(), 'd = {}\n"x" in d\n')
+
+    def test_worktree_edits_are_kept(self):
+        """Test that files edited since the converted blob are not overwritten."""
+        self.create_test_file("second.py", 'd = {}\nd.has_key("x")\n')
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "second")
+        file_path = self.create_test_file("second.py", "edited in worktree\n")
+
+        git_converter = GitChangeConverter(self.temp_dir)
+        results = git_converter.convert_changes("HEAD~1..HEAD")
+        written = git_converter.write_to_worktree(results)
+
+        self.assertEqual(written, [])
+        self.assertEqual(git_converter.skipped, [file_path])
+        with open(file_path, "r") as f:
+            self.assertEqual(f.read(), "edited in worktree\n")
+
+    def test_single_revision_reads_worktree(self):
+        """Test that a single revision converts the worktree files changed since."""
+        file_path = self.create_test_file("old.py", 'print "edited"\n')
+
+        git_converter = GitChangeConverter(self.temp_dir)
+        results = git_converter.convert_changes("HEAD")
+        written = git_converter.write_to_worktree(results)
+
+        self.assertEqual([r.output for r in results], ['print("edited")\n'])
+        self.assertEqual(written, [file_path])
+
+    def test_patch_applies_cleanly(self):
+        """Test that the generated patch applies with git apply."""
+        self.create_test_file("old.py", 'print "old"\nprint "changed"')
+        self.git("add", "old.py")
+
+        git_converter = GitChangeConverter(self.temp_dir)
+        patch = git_converter.make_patch(git_converter.convert_changes(staged=True))
+
+        self.assertIn("--- a/old.py", patch)
+        patch_path = os.path.join(self.temp_dir, "convert.patch")
+        with open(patch_path, "w") as f:
+            f.write(patch)
+        self.git("apply", "--check", "--cached", patch_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
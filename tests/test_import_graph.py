@@ -0,0 +1,122 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tester.validator import ConvertedCodeValidator
+
+
+class TestProjectImportGraph(unittest.TestCase):
+    def setUp(self):
+        """Create a project where main imports utils, which imports a package."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.validator = ConvertedCodeValidator()
+        self.main = self.create_file(
+            "main.py",
+            "from utils.string_helper import format_name\n"
+            "import utils.string_helper\n",
+        )
+        self.helper = self.create_file(
+            "utils/string_helper.py",
+            "from .constants import SEPARATOR\n\ndef format_name(n):\n    return n\n",
+        )
+        self.constants = self.create_file("utils/constants.py", "SEPARATOR = '-'\n")
+        self.script = self.create_file("scripts/run.py", "import json\n")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_file(self, relative_path, content):
+        path = os.path.join(self.temp_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def errors_by_file(self, results):
+        return {
+            os.path.relpath(r.file_path, self.temp_dir): r.import_errors
+            for r in results
+        }
+
+    def test_internal_imports_resolve(self):
+        """Test resolving project imports, including relative and namespace ones."""
+        results = self.validator.validate_directory(self.temp_dir)
+
+        self.assertTrue(all(r.overall_valid for r in results))
+        graph = self.validator.import_graph
+        self.assertEqual(graph.module_name(self.helper), "utils.string_helper")
+        self.assertEqual(
+            graph.dependents([self.constants]), {self.helper, self.main}
+        )
+
+    def test_missing_name_in_project_module(self):
+        """Test that names imported from a project module must exist there."""
+        self.create_file("broken.py", "from utils.constants import MISSING\n")
+
+        self.validator.validate_directory(self.temp_dir)
+
+        failed = self.validator.get_failed_validations()
+        self.assertEqual(
+            self.errors_by_file(failed),
+            {"broken.py": ["Cannot import name MISSING from utils.constants"]},
+        )
+
+    def test_revalidate_changed_and_dependents(self):
+        """Test that only changed files and their importers are revalidated."""
+        self.validator.validate_directory(self.temp_dir)
+        self.create_file("utils/constants.py", "OTHER = '-'\n")
+
+        results = self.validator.revalidate_changed([self.constants])
+
+        self.assertEqual(results[0].file_path, self.constants)
+        self.assertEqual(
+            {r.file_path for r in results[1:]}, {self.helper, self.main}
+        )
+        self.assertEqual(
+            self.errors_by_file(self.validator.get_failed_validations()),
+            {
+                os.path.join("utils", "string_helper.py"): [
+                    "Cannot import name SEPARATOR from .constants"
+                ]
+            },
+        )
+        self.assertEqual(self.validator.get_summary()["total"], 4)
+
+    def test_deleted_and_added_modules(self):
+        """Test that importers follow a module being deleted and added back."""
+        self.validator.validate_directory(self.temp_dir)
+        os.remove(self.constants)
+
+        results = self.validator.revalidate_changed([self.constants])
+
+        self.assertEqual({r.file_path for r in results}, {self.helper, self.main})
+        self.assertEqual(self.validator.get_summary()["total"], 3)
+        self.assertEqual(
+            self.errors_by_file(self.validator.get_failed_validations()),
+            {os.path.join("utils", "string_helper.py"): [
+                "Cannot import module: .constants"
+            ]},
+        )
+
+        self.create_file("utils/constants.py", "SEPARATOR = '-'\n")
+        self.validator.revalidate_changed([self.constants])
+        self.assertEqual(self.validator.get_summary()["invalid"], 0)
+
+    def test_build_graph_without_validating(self):
+        """Test that watch mode can find dependents before any validation."""
+        graph = self.validator.build_import_graph(self.temp_dir)
+
+        self.assertEqual(self.validator.results, [])
+        self.assertEqual(graph.dependents([self.helper]), {self.main})
+        self.assertEqual(graph.dependents([self.script]), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import importlib.machinery
+import os
+import shutil
+import tempfile
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tester.import_index import ImportResolutionIndex
+from tester.validator import ConvertedCodeValidator
+
+
+class TestImportResolutionIndex(unittest.TestCase):
+    def setUp(self):
+        """Create a search path with a package, a module and a namespace package."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.site = os.path.join(self.temp_dir, "site")
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.create_file("flat_mod.py")
+        self.create_file("fastext" + importlib.machinery.EXTENSION_SUFFIXES[0])
+        # Importing this package would fail, so any import shows up
+        self.create_file("noisy_pkg/__init__.py", "raise RuntimeError('imported')\n")
+        self.create_file("noisy_pkg/sub/__init__.py")
+        self.create_file("noisy_pkg/sub/leaf.py")
+        self.create_file("ns_pkg/part.py")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_file(self, relative_path, content=""):
+        path = os.path.join(self.site, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def load(self):
+        return ImportResolutionIndex.load(self.cache_dir, [self.site])
+
+    def test_lookups_without_imports(self):
+        """Test resolving dotted names from directory listings only."""
+        index = self.load()
+        expected = {
+            "flat_mod": True,
+            "flat_mod.anything": True,
+            "noisy_pkg": True,
+            "noisy_pkg.sub.leaf": True,
+            "noisy_pkg.missing": False,
+            "ns_pkg.part": True,
+            "ns_pkg.other": False,
+            "fastext": True,
+            "no_such_module": False,
+            "json": True,
+        }
+        if hasattr(sys, "stdlib_module_names"):
+            # Standard library modules of other platforms (Python 3.10+)
+            expected["winreg"] = True
+        for name, importable in expected.items():
+            with self.subTest(name=name):
+                self.assertEqual(index.can_import(name), importable)
+
+        self.assertNotIn("noisy_pkg", sys.modules)
+        self.assertTrue(index.can_import("noisy_pkg.sub"))
+        self.assertEqual(index.stats["memoized"], 0)
+        index.can_import("noisy_pkg.sub")
+        self.assertEqual(index.stats["memoized"], 1)
+
+    def test_index_is_persisted(self):
+        """Test that a second load reads the saved index until sys.path changes."""
+        self.assertFalse(self.load().stats["loaded"])
+        warm = self.load()
+        self.assertTrue(warm.stats["loaded"])
+        self.assertTrue(warm.can_import("flat_mod"))
+
+        # Installing a module changes the directory mtime and the fingerprint
+        self.create_file("new_mod.py")
+        os.utime(self.site, ns=(0, os.stat(self.site).st_mtime_ns + 10**9))
+        rebuilt = self.load()
+        self.assertFalse(rebuilt.stats["loaded"])
+        self.assertTrue(rebuilt.can_import("new_mod"))
+
+    def test_validator_uses_index(self):
+        """Test that the validator resolves imports through the index."""
+        source_path = os.path.join(self.temp_dir, "user.py")
+        with open(source_path, "w") as f:
+            f.write("import noisy_pkg.sub\nimport ns_pkg.other\n")
+        validator = ConvertedCodeValidator(import_index=self.load())
+
+        valid, errors = validator.validate_imports(source_path)
+
+        self.assertFalse(valid)
+        self.assertEqual(errors, ["Cannot import module: ns_pkg.other"])
+        self.assertNotIn("noisy_pkg", sys.modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
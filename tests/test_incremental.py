@@ -0,0 +1,121 @@
+import unittest
+import os
+import glob
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.engine import Python2to3Converter
+from converter.incremental import ChunkCache
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+MODULE = '''import urllib2
+import os
+
+
+def fetch(url):
+    print "fetching", url
+    return urllib2.urlopen(url).read()
+
+
+def names(d):
+    return d.keys()
+
+
+class Legacy(object):
+    def run(self):
+        for i in xrange(3):
+            print i
+'''
+
+
+class TestIncrementalConversion(unittest.TestCase):
+    def setUp(self):
+        """Set up a full and an incremental converter."""
+        self.full = Python2to3Converter()
+        self.cache = ChunkCache()
+        self.incremental = Python2to3Converter(chunk_cache=self.cache)
+
+    def assertSameConversion(self, source, name="module.py"):
+        expected = self.full.convert_source(source, name)
+        actual = self.incremental.convert_source(source, name)
+        self.assertEqual(actual.output, expected.output)
+        self.assertEqual(actual.success, expected.success)
+        self.assertEqual(actual.error, expected.error)
+
+    def test_edited_chunk_only_is_refactored(self):
+        """Test that an edit to one function reuses the other chunks."""
+        self.assertSameConversion(MODULE)
+        self.assertEqual(self.cache.stats["full"], 2)
+
+        self.assertSameConversion(MODULE.replace('"fetching"', '"loading"'))
+
+        self.assertEqual(self.cache.stats["full"], 2)
+        self.assertEqual(self.cache.stats["incremental"], 2)
+        self.assertGreater(self.cache.stats["chunk_hits"], 0)
+
+    def test_usages_follow_cached_imports(self):
+        """Test that module renames reach edited chunks whose import is cached."""
+        self.assertSameConversion(MODULE)
+        edited = MODULE.replace("urllib2.urlopen(url)", "urllib2.urlopen(url, None)")
+
+        self.assertSameConversion(edited)
+        self.assertIn(
+            "urllib.request.urlopen(url, None)",
+            self.incremental.convert_source(edited, "module.py").output,
+        )
+
+    def test_import_insertion_falls_back_to_full(self):
+        """Test that a fixer adding a module import forces a full conversion."""
+        self.assertSameConversion(MODULE)
+
+        self.assertSameConversion(
+            MODULE.replace("return d.keys()", "return reduce(max, d.keys())")
+        )
+        self.assertEqual(self.cache.stats["incremental"], 0)
+
+    def test_new_names_fall_back_to_full(self):
+        """Test that edits needing fresh identifiers convert the whole file."""
+        self.assertSameConversion(MODULE)
+
+        self.assertSameConversion(
+            MODULE.replace("def names(d):", "def names(d, (a, b)):")
+        )
+
+    def test_sample_projects_line_edits(self):
+        """Test byte-identical output after single-line edits of the samples."""
+        pattern = os.path.join(ROOT, "test-py2-*", "**", "*.py")
+        files = sorted(glob.glob(pattern, recursive=True))
+        self.assertTrue(files)
+
+        for file_path in files:
+            with open(file_path, "r", encoding="utf-8") as f:
+                source = f.read()
+            self.assertSameConversion(source, file_path)
+
+            lines = source.splitlines(True)
+            for i in range(0, len(lines), max(1, len(lines) // 4)):
+                edited = lines[:]
+                edited[i] = lines[i].replace('"', "'").replace("print ", "print  ")
+                self.assertSameConversion("".join(edited), file_path)
+
+        self.assertGreater(self.cache.stats["incremental"], 0)
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used chunks are evicted."""
+        cache = ChunkCache(max_bytes=10)
+        cache.put(("a",), "12345")
+        cache.put(("b",), "12345")
+        cache.get(("a",))
+        cache.put(("c",), "12345")
+
+        self.assertIsNotNone(cache.get(("a",)))
+        self.assertIsNone(cache.get(("b",)))
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import tempfile
+import os
+import shutil
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.mirror import MirrorConverter, link_or_copy
+
+
+class TestMirrorConverter(unittest.TestCase):
+    def setUp(self):
+        """Set up a source tree and an output location."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "src")
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        os.makedirs(os.path.join(self.source_dir, "pkg"))
+        self.mirror = MirrorConverter()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_test_file(self, filename, content):
+        """Create a file in the source tree."""
+        file_path = os.path.join(self.source_dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def read_output(self, filename):
+        with open(os.path.join(self.output_dir, filename), "r") as f:
+            return f.read()
+
+    def test_source_tree_untouched(self):
+        """Test that conversion happens only in the mirror."""
+        source_file = self.create_test_file("pkg/legacy.py", 'print "legacy"\n')
+
+        results = self.mirror.convert_tree(self.source_dir, self.output_dir)
+
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].success)
+        self.assertEqual(
+            results[0].file_path, os.path.join(self.output_dir, "pkg", "legacy.py")
+        )
+        self.assertEqual(self.read_output("pkg/legacy.py"), 'print("legacy")\n')
+        with open(source_file, "r") as f:
+            self.assertEqual(f.read(), 'print "legacy"\n')
+        self.assertFalse(os.path.exists(source_file + ".py2bak"))
+
+    def test_unchanged_files_are_linked(self):
+        """Test that unchanged Python files and assets share the source inode."""
+        modern = self.create_test_file("modern.py", 'print("modern")\n')
+        asset = self.create_test_file("pkg/data.json", "{}\n")
+        self.create_test_file("legacy.py", 'print "legacy"\n')
+
+        self.mirror.convert_tree(self.source_dir, self.output_dir)
+
+        for src, rel in ((modern, "modern.py"), (asset, "pkg/data.json")):
+            dst = os.path.join(self.output_dir, rel)
+            self.assertTrue(os.path.samefile(src, dst))
+        self.assertEqual(self.mirror.stats["hardlinked"], 2)
+        self.assertEqual(self.mirror.stats["written"], 1)
+
+    def test_rerun_does_not_write_through_links(self):
+        """Test that a converted file replacing a hardlink leaves the source alone."""
+        source_file = self.create_test_file("module.py", 'print("ok")\n')
+        self.mirror.convert_tree(self.source_dir, self.output_dir)
+
+        self.create_test_file("module.py", 'print "now legacy"\n')
+        self.mirror.convert_tree(self.source_dir, self.output_dir)
+
+        self.assertEqual(self.read_output("module.py"), 'print("now legacy")\n')
+        with open(source_file, "r") as f:
+            self.assertEqual(f.read(), 'print "now legacy"\n')
+
+    def test_copy_without_hardlinks(self):
+        """Test falling back to reflink or copy when hardlinks are disabled."""
+        asset = self.create_test_file("notes.txt", "notes\n")
+        dst = os.path.join(self.temp_dir, "notes_copy.txt")
+
+        method = link_or_copy(asset, dst, hardlink=False)
+
+        self.assertIn(method, ("reflinked", "copied"))
+        self.assertFalse(os.path.samefile(asset, dst))
+
+
+if __name__ == "__main__":
+    unittest.main()
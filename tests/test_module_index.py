@@ -0,0 +1,126 @@
+import unittest
+import tempfile
+import os
+import shutil
+from unittest import mock
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.engine import Python2to3Converter
+from converter.module_index import ProjectModuleIndex
+from tester.validator import ConvertedCodeValidator
+
+SOURCE = """import sibling
+import subpackage
+import extension
+import missing
+import os
+from sibling import helper
+"""
+
+
+class TestProjectModuleIndex(unittest.TestCase):
+    def setUp(self):
+        """Create a package with sibling modules of every kind."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.package = os.path.join(self.temp_dir, "package")
+        os.makedirs(os.path.join(self.package, "subpackage"))
+        for name in ["__init__.py", "sibling.py", "extension.so"]:
+            self.create_test_file(os.path.join("package", name), "")
+        self.module = self.create_test_file(os.path.join("package", "main.py"), SOURCE)
+        self.script = self.create_test_file("script.py", SOURCE)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_test_file(self, filename, content):
+        """Create a test file with given content."""
+        file_path = os.path.join(self.temp_dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def test_matches_filesystem_probing(self):
+        """Test that the index makes the same decisions as fix_import."""
+        index = ProjectModuleIndex.scan(self.temp_dir)
+
+        self.assertTrue(index.probably_a_local_import(self.module, "sibling"))
+        self.assertTrue(index.probably_a_local_import(self.module, "subpackage"))
+        self.assertTrue(index.probably_a_local_import(self.module, "extension"))
+        self.assertFalse(index.probably_a_local_import(self.module, "missing"))
+        self.assertFalse(index.probably_a_local_import(self.module, ".sibling"))
+        # Not inside a package: never a relative import
+        self.assertFalse(index.probably_a_local_import(self.script, "package"))
+
+    def test_conversion_output_unchanged(self):
+        """Test that indexed conversion output equals probing conversion output."""
+        probing = Python2to3Converter()
+        expected = [
+            probing.convert_source(SOURCE, path).output
+            for path in (self.module, self.script)
+        ]
+
+        indexed = Python2to3Converter()
+        self.assertEqual(len(indexed.find_python_files(self.temp_dir)), 4)
+        actual = [
+            indexed.convert_source(SOURCE, path).output
+            for path in (self.module, self.script)
+        ]
+
+        self.assertEqual(actual, expected)
+        self.assertIn("from . import sibling", actual[0])
+        self.assertIn("import missing", actual[0])
+
+    def test_no_filesystem_probing_while_fixing(self):
+        """Test that fix_import does not stat files when an index is set."""
+        converter = Python2to3Converter()
+        converter.find_python_files(self.temp_dir)
+        converter.engine.warm_up()
+
+        fix_import_modules = {
+            sys.modules[type(fixer).__module__]
+            for tool in (
+                converter.engine.stage_one_tool(),
+                converter.engine.stage_two_tool(),
+            )
+            for fixer in tool.pre_order + tool.post_order
+            if type(fixer).__module__.endswith("fix_import")
+        }
+        self.assertTrue(fix_import_modules)
+
+        probed = AssertionError("fix_import probed the filesystem")
+        patches = [
+            mock.patch.object(module, "exists", side_effect=probed)
+            for module in fix_import_modules
+        ]
+        for patch in patches:
+            patch.start()
+        try:
+            result = converter.convert_source(SOURCE, self.module)
+        finally:
+            for patch in patches:
+                patch.stop()
+
+        self.assertTrue(result.success, result.error)
+        self.assertIn("from . import sibling", result.output)
+
+    def test_validator_resolves_project_modules(self):
+        """Test that project-local imports validate against the index."""
+        self.create_test_file("uses_package.py", "import package.sibling\n")
+        path = os.path.join(self.temp_dir, "uses_package.py")
+
+        without_index = ConvertedCodeValidator().validate_file(path)
+        with_index = ConvertedCodeValidator(
+            ProjectModuleIndex.scan(self.temp_dir)
+        ).validate_file(path)
+
+        self.assertFalse(without_index.imports_valid)
+        self.assertTrue(with_index.imports_valid)
+
+
+if __name__ == "__main__":
+    unittest.main()
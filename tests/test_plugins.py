@@ -0,0 +1,97 @@
+import unittest
+import tempfile
+import os
+import shutil
+import textwrap
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.engine import Python2to3Converter
+from converter.plugins import FIXER_PATH_ENV, discover_plugins, load_path_plugins
+
+SET_WRAPPER_FIXER = '''
+from fissix import fixer_base
+from fissix.fixer_util import Name
+
+
+class FixSetWrapper(fixer_base.BaseFix):
+    """Replace the in-house Set wrapper with the builtin set."""
+
+    BM_compatible = True
+    PATTERN = "power< name='Set' trailer< '(' [any] ')' > >"
+
+    def transform(self, node, results):
+        name = results["name"]
+        name.replace(Name("set", prefix=name.prefix))
+'''
+
+
+class TestFixerPlugins(unittest.TestCase):
+    def setUp(self):
+        """Set up a plugin directory with one custom fixer."""
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, "fix_set_wrapper.py"), "w") as f:
+            f.write(textwrap.dedent(SET_WRAPPER_FIXER))
+        # Modules that are not fixers are ignored
+        with open(os.path.join(self.temp_dir, "helpers.py"), "w") as f:
+            f.write("VALUE = 1\n")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_load_plugins_from_directory(self):
+        """Test loading fix_*.py modules from a directory."""
+        plugins = load_path_plugins(self.temp_dir)
+
+        self.assertEqual([p.name for p in plugins], ["fix_set_wrapper"])
+        self.assertEqual(plugins[0].fixer_class.__name__, "FixSetWrapper")
+
+    def test_plugins_from_environment(self):
+        """Test that the environment variable adds plugin paths."""
+        os.environ[FIXER_PATH_ENV] = self.temp_dir
+        try:
+            plugins = discover_plugins(use_entry_points=False)
+        finally:
+            del os.environ[FIXER_PATH_ENV]
+
+        self.assertEqual(len(plugins), 1)
+
+    def test_plugin_runs_with_stock_fixers(self):
+        """Test that plugin fixers run next to the stock fixers and are timed."""
+        converter = Python2to3Converter(
+            fixer_plugins=load_path_plugins(self.temp_dir)
+        )
+
+        result = converter.convert_source(
+            'items = Set([1, 2])\nprint "done"\n', "module.py"
+        )
+
+        self.assertTrue(result.success, f"Conversion failed: {result.error}")
+        self.assertEqual(result.output, 'items = set([1, 2])\nprint("done")\n')
+        self.assertIn("fix_set_wrapper", converter.get_plugin_timings())
+
+    def test_compiled_pattern_is_cached(self):
+        """Test that a second tool reuses the compiled plugin pattern."""
+        plugins = load_path_plugins(self.temp_dir)
+
+        def plugin_fixer(converter):
+            tool = converter.engine.stage_two_tool()
+            return next(
+                f
+                for f in tool.pre_order + tool.post_order
+                if type(f).__name__ == "FixSetWrapper"
+            )
+
+        first = plugin_fixer(Python2to3Converter(fixer_plugins=plugins))
+        second = plugin_fixer(Python2to3Converter(fixer_plugins=plugins))
+
+        self.assertIsNot(first, second)
+        self.assertIs(first.pattern, second.pattern)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+import os
+import shutil
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.engine import Python2to3Converter
+from converter.prefetch import PrefetchingReader
+from tester.validator import ConvertedCodeValidator
+
+
+class TestPrefetchingReader(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_test_file(self, filename, content):
+        """Create a test file with given content."""
+        file_path = os.path.join(self.temp_dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def test_files_yielded_in_scan_order(self):
+        """Test that files come back in order with their bytes and stat."""
+        paths = [self.create_test_file(f"m{i}.py", f"x = {i}\n") for i in range(10)]
+
+        with PrefetchingReader(paths, max_workers=4, window=3) as reader:
+            files = list(reader)
+
+        self.assertEqual([f.path for f in files], paths)
+        self.assertEqual(files[7].data, b"x = 7\n")
+        self.assertEqual(files[7].stat.st_size, 6)
+        self.assertEqual(reader.stats["files_read"], 10)
+        self.assertEqual(reader.stats["bytes_read"], 60)
+        self.assertIn("Pipeline I/O wait", reader.get_metrics())
+
+    def test_read_errors_are_returned(self):
+        """Test that a missing file is reported instead of raised."""
+        missing = os.path.join(self.temp_dir, "missing.py")
+
+        with PrefetchingReader([missing]) as reader:
+            files = list(reader)
+
+        self.assertIsInstance(files[0].error, FileNotFoundError)
+
+    def test_convert_directory_backups_keep_metadata(self):
+        """Test that backups written from prefetched bytes match the original."""
+        file_path = self.create_test_file("legacy.py", 'print "legacy"\n')
+        os.utime(file_path, (1000000000, 1000000000))
+
+        converter = Python2to3Converter()
+        results = converter.convert_directory(self.temp_dir)
+
+        self.assertTrue(results[0].changes_made)
+        backup_path = f"{file_path}.py2bak"
+        with open(backup_path, "r") as f:
+            self.assertEqual(f.read(), 'print "legacy"\n')
+        self.assertEqual(os.stat(backup_path).st_mtime, 1000000000)
+        self.assertIn("Files read", converter.io_metrics)
+
+    def test_validator_uses_converted_sources(self):
+        """Test that validation reuses converted text instead of the file."""
+        file_path = self.create_test_file("legacy.py", 'print "legacy"\n')
+
+        converter = Python2to3Converter()
+        converter.convert_directory(self.temp_dir, backup=False)
+        sources = converter.get_converted_sources()
+        self.assertEqual(sources[file_path], 'print("legacy")\n')
+
+        # Overwrite the file: the in-memory text must be what gets validated
+        self.create_test_file("legacy.py", "def broken(\n")
+        results = ConvertedCodeValidator().validate_directory(self.temp_dir, sources)
+
+        self.assertTrue(results[0].syntax_valid)
+
+
+if __name__ == "__main__":
+    unittest.main()
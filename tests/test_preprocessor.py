@@ -0,0 +1,131 @@
+import unittest
+import os
+import tempfile
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.preprocessor import Python2SyntaxPreprocessor
+
+
+class TestPython2SyntaxPreprocessor(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.preprocessor = Python2SyntaxPreprocessor()
+
+    def test_print_statements(self):
+        """Test print statement forms, including print >>f and a trailing comma."""
+        cases = {
+            'print "a", b\n': 'print("a", b)\n',
+            "print\n": "print()\n",
+            "print x,\n": "print(x, end=' ')\n",
+            'print >>sys.stderr, "a", b\n': 'print("a", b, file=sys.stderr)\n',
+            "print >>f\n": "print(file=f)\n",
+            "print x  # comment\n": "print(x)  # comment\n",
+            'if x: print "a"; print\n': 'if x: print("a"); print()\n',
+            'print("already a call")\n': 'print("already a call")\n',
+            "print = log\nprint.x\n": "print = log\nprint.x\n",
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                result = self.preprocessor.preprocess(source)
+                self.assertEqual(result, expected)
+                self.assertTrue(self.preprocessor.can_parse_as_python3(result))
+
+    def test_continuation_lines(self):
+        """Test statements continued by brackets or a backslash."""
+        source = "print >>f, (1,\n           2), x\nprint a, \\\n    b\n"
+        expected = "print((1,\n           2), x, file=f)\nprint(a, \\\n    b)\n"
+        self.assertEqual(self.preprocessor.preprocess(source), expected)
+
+    def test_strings_are_not_changed(self):
+        """Test that text inside triple-quoted strings is left alone."""
+        source = 'def f():\n    """\n    print x\n    except E, e:\n    """\n    print x\n'
+        expected = 'def f():\n    """\n    print x\n    except E, e:\n    """\n    print(x)\n'
+        self.assertEqual(self.preprocessor.preprocess(source), expected)
+        self.assertEqual(self.preprocessor.lines_rewritten, 1)
+
+    def test_except_clauses(self):
+        """Test old except syntax conversion."""
+        source = "try:\n    pass\nexcept (A, B), e:\n    pass\nexcept C,e:\n    pass\n"
+        result = self.preprocessor.preprocess_except_clauses(source)
+        self.assertIn("except (A, B) as e:", result)
+        self.assertIn("except C as e:", result)
+        # A tuple of exceptions without a target is left alone
+        source = "try:\n    pass\nexcept (A, B):\n    pass\n"
+        self.assertEqual(self.preprocessor.preprocess(source), source)
+
+    def test_recovery_rewrites(self):
+        """Test the wider rewrites used to recover unparseable files."""
+        cases = {
+            'exec "x = 1" in ns\n': 'exec("x = 1", ns)\n',
+            "exec code in g, l\n": "exec(code, g, l)\n",
+            "x = `y` + `a.b`\n": "x = repr(y) + repr(a.b)\n",
+            'raise E, "v"\n': 'raise E("v")\n',
+            "raise E, (1, 2), tb\n": "raise E(1, 2).with_traceback(tb)\n",
+            "x = 0777 + 0777L + 00\n": "x = 0o777 + 0o777 + 00\n",
+            "if x:\n        a = 1\n\tb = 2\n": "if x:\n        a = 1\n        b = 2\n",
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                result = self.preprocessor.recover(source)
+                self.assertEqual(result, expected)
+                self.assertTrue(self.preprocessor.can_parse_as_python3(result))
+
+        # Tab-only indentation and plain preprocessing are left alone
+        source = "if x:\n\ta = `b`\n"
+        self.assertEqual(self.preprocessor.recover(source), "if x:\n\ta = repr(b)\n")
+        self.assertEqual(self.preprocessor.preprocess(source), source)
+
+        # Strings and comments are left alone, including continued strings
+        source = (
+            'x = "`a` 0777" + `b`  # `c` 0777\n'
+            's = """\n\t`d` 0777\n"""\n'
+            "if x:\n        a = 0777\n\tb = 2\n"
+        )
+        self.assertEqual(
+            self.preprocessor.recover(source),
+            'x = "`a` 0777" + repr(b)  # `c` 0777\n'
+            's = """\n\t`d` 0777\n"""\n'
+            "if x:\n        a = 0o777\n        b = 2\n",
+        )
+
+    def test_untokenizable_rest_is_unchanged(self):
+        """Test that lines after a tokenize error are passed through."""
+        source = "print x\ny = (\nprint z\n"
+        self.assertEqual(self.preprocessor.preprocess(source), "print(x)\ny = (\nprint z\n")
+
+    def test_lines_are_streamed(self):
+        """Test that output starts before the whole input has been read."""
+        consumed = []
+
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield "print %d\n" % i
+
+        output = self.preprocessor.preprocess_lines(lines())
+        self.assertEqual(next(output), "print(0)\n")
+        self.assertLess(len(consumed), 5)
+
+    def test_write_preprocessed_file(self):
+        """Test streaming a preprocessed copy in the file's own encoding."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "module.py")
+            output_path = os.path.join(temp_dir, "module_out.py")
+            with open(source_path, "w", encoding="latin-1") as f:
+                f.write('# -*- coding: latin-1 -*-\nprint "caf\xe9"\nx = 1\n')
+
+            rewritten = self.preprocessor.write_preprocessed_file(
+                source_path, output_path
+            )
+
+            self.assertEqual(rewritten, 1)
+            with open(output_path, "r", encoding="latin-1") as f:
+                self.assertEqual(f.read().splitlines()[1], 'print("caf\xe9")')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tester.import_index import ImportResolutionIndex
+from tester.result_cache import ValidationResultCache
+from tester.validator import ConvertedCodeValidator
+
+
+class TestValidationResultCache(unittest.TestCase):
+    def setUp(self):
+        """Create a small project, a site directory and a cache directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.project = os.path.join(self.temp_dir, "project")
+        self.site = os.path.join(self.temp_dir, "site")
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        os.makedirs(self.site)
+        self.create_file("main.py", "import json\nfrom helper import run\n")
+        self.helper = self.create_file("helper.py", "def run(): pass\n")
+        self.create_file("broken.py", "def broken(\n")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_file(self, relative_path, content):
+        path = os.path.join(self.project, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def validate(self, max_entries=100):
+        """Validate the project with a fresh validator sharing the cache directory."""
+        index = ImportResolutionIndex.load(self.cache_dir, sys.path + [self.site])
+        with ValidationResultCache(self.cache_dir, max_entries) as cache:
+            validator = ConvertedCodeValidator(import_index=index, result_cache=cache)
+            results = validator.validate_directory(self.project)
+        return validator, cache, {os.path.basename(r.file_path): r for r in results}
+
+    def test_unchanged_files_skip_parsing(self):
+        """Test that a second run reuses every result without parsing."""
+        _, cold, first = self.validate()
+        validator, warm, second = self.validate()
+
+        self.assertEqual(cold.stats["stored"], 3)
+        self.assertEqual(warm.stats["hits"], 3)
+        self.assertEqual(validator.module_cache.stats["parses"], 0)
+        for name, result in first.items():
+            with self.subTest(name=name):
+                self.assertEqual(result.overall_valid, second[name].overall_valid)
+                self.assertEqual(result.syntax_error, second[name].syntax_error)
+        # The import graph is restored from the cached entries
+        self.assertEqual(
+            validator.import_graph.dependents([self.helper]),
+            {os.path.join(self.project, "main.py")},
+        )
+
+    def test_changed_dependency_invalidates_importers(self):
+        """Test that editing an imported module revalidates its importers."""
+        self.validate()
+        self.create_file("helper.py", "def walk(): pass\n")
+
+        _, cache, results = self.validate()
+
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(
+            results["main.py"].import_errors, ["Cannot import name run from helper"]
+        )
+
+    def test_non_utf8_files_are_cached(self):
+        """Test that files in other encodings, and their importers, get hits."""
+        with open(self.helper, "wb") as f:
+            f.write(b"# -*- coding: latin-1 -*-\ndef run(): return '\xe9'\n")
+        _, cold, _ = self.validate()
+        validator, warm, results = self.validate()
+
+        self.assertEqual(cold.stats["stored"], 3)
+        self.assertEqual(warm.stats["hits"], 3)
+        self.assertEqual(validator.module_cache.stats["parses"], 0)
+        self.assertTrue(results["helper.py"].overall_valid)
+        self.assertTrue(results["main.py"].overall_valid)
+
+    def test_installed_packages_invalidate(self):
+        """Test that a change on sys.path invalidates all entries."""
+        self.validate()
+        with open(os.path.join(self.site, "new_package.py"), "w") as f:
+            f.write("")
+        os.utime(self.site, ns=(0, os.stat(self.site).st_mtime_ns + 10**9))
+
+        _, cache, _ = self.validate()
+
+        self.assertEqual(cache.stats["hits"], 0)
+
+    def test_entries_are_bounded(self):
+        """Test that least recently used entries are evicted."""
+        _, cache, _ = self.validate(max_entries=2)
+
+        self.assertEqual(cache.stats["evicted"], 1)
+        _, cache, _ = self.validate(max_entries=2)
+        self.assertEqual(cache.stats["hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tester.runtime_imports import RuntimeImportChecker
+from tester.validator import ConvertedCodeValidator
+
+
+class TestRuntimeImportChecker(unittest.TestCase):
+    def setUp(self):
+        """Create modules that import cleanly, fail, hang or change state."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.create_file("pkg/__init__.py", "")
+        self.create_file("pkg/good.py", "from pkg import helper\nVALUE = helper.twice(2)\n")
+        self.create_file("pkg/helper.py", "def twice(x):\n    return 2 * x\n")
+        self.create_file("letters.py", "import string\nLETTERS = string.letters\n")
+        self.create_file("chatty.py", "print('hello')\nNAME = input() if False else ''\n")
+        self.create_file("hangs.py", "import time\ntime.sleep(30)\n")
+        self.create_file("path_hack.py", "import sys\nsys.path.append('/nowhere')\n")
+        self.checker = RuntimeImportChecker(workers=2, timeout=5)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.checker.close()
+        shutil.rmtree(self.temp_dir)
+
+    def create_file(self, relative_path, content):
+        path = os.path.join(self.temp_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def check(self, module):
+        return self.checker.check(module + ".py", module, [self.temp_dir])
+
+    def test_imports_in_reused_workers(self):
+        """Test successful and failing imports on the same worker."""
+        good = self.check("pkg.good")
+        letters = self.check("letters")
+        chatty = self.check("chatty")
+
+        self.assertTrue(good.ok, good.traceback)
+        self.assertGreater(good.elapsed, 0)
+        self.assertFalse(letters.ok)
+        self.assertIn("AttributeError", letters.traceback)
+        self.assertIn("letters", letters.traceback)
+        self.assertTrue(chatty.ok, chatty.traceback)
+        self.assertEqual(self.checker.stats["recycled"], 0)
+        # Project modules are dropped, so a second import runs them again
+        self.assertTrue(self.check("pkg.good").ok)
+        # Nothing is written into the project
+        for root, dirs, _ in os.walk(self.temp_dir):
+            self.assertNotIn("__pycache__", dirs, root)
+
+    def test_state_changes_recycle_worker(self):
+        """Test that a worker is replaced after an import changes sys.path."""
+        self.assertTrue(self.check("path_hack").ok)
+        self.assertEqual(self.checker.stats["recycled"], 1)
+        self.assertTrue(self.check("pkg.good").ok)
+
+    def test_timeout(self):
+        """Test that a hanging import is reported and its worker killed."""
+        self.checker.timeout = 0.5
+
+        result = self.check("hangs")
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.traceback, "Import timed out after 0.5s")
+        self.assertEqual(self.checker.stats["timeouts"], 1)
+        self.checker.timeout = 5
+        self.assertTrue(self.check("pkg.helper").ok)
+
+    def test_validator_stage(self):
+        """Test recording import times and tracebacks in validation results."""
+        os.remove(os.path.join(self.temp_dir, "hangs.py"))
+        validator = ConvertedCodeValidator()
+        validator.validate_directory(self.temp_dir)
+
+        checked = validator.check_runtime_imports(self.checker)
+
+        by_name = {os.path.basename(r.file_path): r for r in checked}
+        self.assertTrue(by_name["__init__.py"].runtime_valid)
+        self.assertIsNotNone(by_name["good.py"].import_time)
+        self.assertTrue(by_name["good.py"].overall_valid)
+        self.assertFalse(by_name["letters.py"].overall_valid)
+        self.assertIn("AttributeError", by_name["letters.py"].import_traceback)
+        summary = validator.get_summary()
+        self.assertEqual(summary["runtime_errors"], 1)
+        self.assertEqual(summary["invalid"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import os
+from unittest import mock
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter import shared_buffers
+from converter.shared_buffers import (
+    MIN_SEGMENT_SIZE,
+    SharedBufferPool,
+    attach,
+    write_texts,
+)
+
+
+class TestSharedBufferPool(unittest.TestCase):
+    def setUp(self):
+        """Set up a buffer pool."""
+        self.buffers = SharedBufferPool(max_free=2)
+
+    def tearDown(self):
+        """Unlink all segments."""
+        self.buffers.close()
+
+    def test_texts_round_trip(self):
+        """Test writing texts into a segment and reading them back."""
+        texts = ["print('café')\n", "print 'café'\n", ""]
+        segment = self.buffers.lease(1024)
+
+        layout = write_texts(attach(segment.name), texts)
+
+        self.assertEqual(self.buffers.read_texts(segment, layout), texts)
+        self.assertEqual(self.buffers.stats["bytes_shared"], sum(n for _, n in layout))
+
+    def test_no_resource_tracker_outside_posix(self):
+        """Test that the pool works where the resource tracker cannot start."""
+        tracker = mock.Mock()
+        tracker.ensure_running.side_effect = ImportError("_posixsubprocess")
+        with mock.patch.object(shared_buffers.os, "name", "nt"), mock.patch.object(
+            shared_buffers, "resource_tracker", tracker
+        ):
+            buffers = SharedBufferPool()
+        try:
+            segment = buffers.lease(10)
+            buffers.release(segment)
+        finally:
+            buffers.close()
+        tracker.ensure_running.assert_not_called()
+
+    def test_texts_that_do_not_fit(self):
+        """Test that texts larger than the segment are not written."""
+        segment = self.buffers.lease(10)
+        self.assertIsNone(write_texts(segment, ["x" * (segment.size + 1)]))
+
+    def test_segments_are_recycled(self):
+        """Test that released segments are reused and the free list is bounded."""
+        small = self.buffers.lease(100)
+        self.assertEqual(small.size, MIN_SEGMENT_SIZE)
+        self.buffers.release(small)
+
+        again = self.buffers.lease(200)
+        self.assertEqual(again.name, small.name)
+        large = self.buffers.lease(MIN_SEGMENT_SIZE + 1)
+        self.assertEqual(large.size, 2 * MIN_SEGMENT_SIZE)
+        third = self.buffers.lease(100)
+        for segment in (again, large, third):
+            self.buffers.release(segment)
+
+        self.assertEqual(self.buffers.stats["created"], 3)
+        self.assertEqual(self.buffers.stats["reused"], 1)
+        # The smallest free segment was dropped
+        self.assertEqual(len(self.buffers._free), 2)
+        self.assertIn(large, self.buffers._free)
+
+
+if __name__ == "__main__":
+    unittest.main()
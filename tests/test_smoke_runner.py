@@ -0,0 +1,94 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+# Add src to path
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from tester.smoke_runner import SmokeTestRunner
+from tester.validator import ConversionTestGenerator
+
+
+class TestSmokeTestRunner(unittest.TestCase):
+    def setUp(self):
+        """Create a small project with generated tests."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_dir = os.path.join(self.temp_dir, "generated_tests")
+        self.create_file("calc.py", "def add(a, b):\n    return a + b\n")
+        self.create_file("pkg/__init__.py", "")
+        self.create_file("pkg/shapes.py", "class Square:\n    pass\n")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_file(self, relative_path, content):
+        path = os.path.join(self.temp_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def run_smoke(self):
+        """Regenerate the tests and run them with a fresh generator."""
+        generator = ConversionTestGenerator()
+        generator.generate_tests_for_directory(self.temp_dir, self.test_dir)
+        results = list(generator.run_smoke_tests(self.test_dir, workers=2))
+        return {os.path.basename(r.test_file): r for r in results}
+
+    def test_modules_run_in_parallel_processes(self):
+        """Test that every generated test module runs and reports its duration."""
+        results = self.run_smoke()
+
+        self.assertEqual(
+            set(results),
+            {"test_calc.py", "test_pkg.py", "test_pkg_shapes.py"},
+        )
+        for name, result in results.items():
+            with self.subTest(name=name):
+                self.assertEqual(result.status, "passed", result.output)
+                self.assertGreater(result.tests_run, 0)
+                self.assertGreater(result.duration, 0)
+
+    def test_unchanged_modules_are_skipped(self):
+        """Test that only tests of changed modules run again."""
+        self.run_smoke()
+        self.create_file("calc.py", "def add(a, b):\n    return b + a\n")
+
+        results = self.run_smoke()
+
+        self.assertEqual(results["test_calc.py"].status, "passed")
+        self.assertEqual(results["test_pkg_shapes.py"].status, "unchanged")
+        self.assertEqual(results["test_pkg.py"].status, "unchanged")
+
+    def test_failures_are_reported_and_rerun(self):
+        """Test that failing and crashing modules are reported and not skipped."""
+        failing = self.create_file(
+            "generated_tests/test_failing.py",
+            "import unittest\n\n"
+            "class TestFailing(unittest.TestCase):\n"
+            "    def test_fails(self):\n"
+            "        self.assertEqual(1, 2)\n",
+        )
+        crashing = self.create_file(
+            "generated_tests/test_crashing.py", "import os\nos._exit(3)\n"
+        )
+        state_file = os.path.join(self.test_dir, ".smoke-state.json")
+
+        for _ in range(2):
+            runner = SmokeTestRunner(workers=2, state_file=state_file)
+            results = {r.test_file: r for r in runner.run([failing, crashing])}
+
+            self.assertEqual(results[failing].status, "failed")
+            self.assertEqual(results[failing].failures, 1)
+            self.assertIn("AssertionError", results[failing].output)
+            self.assertEqual(results[crashing].status, "error")
+            self.assertIn("exited with code 3", results[crashing].output)
+            self.assertEqual(runner.stats["failed"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
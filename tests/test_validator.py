@@ -9,6 +9,7 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
+from tester.module_cache import ParsedModuleCache
 from tester.validator import (
     ConvertedCodeValidator,
     ValidationResult,
@@ -143,6 +144,75 @@ def test_function():
         self.assertEqual(summary["invalid"], 1)
         self.assertEqual(summary["syntax_errors"], 1)
 
+    def test_legacy_builtins(self):
+        """Test flagging free references to removed Python 2 builtins."""
+        file_path = self.create_test_file(
+            "legacy.py",
+            """try:
+    unicode
+except NameError:
+    unicode = str
+
+def compare(a, b, file=None):
+    text = unicode(a)
+    return cmp(a, b) or [reduce(f, x) for x in xrange(3)]
+
+def shadowed(cmp):
+    return cmp(1, 2)
+
+class Table:
+    rows = [unichr(i) for i in range(3)]
+
+names = {long for long in range(3)} | {raw_input(p) for p in ()}
+""",
+        )
+
+        result = self.validator.validate_file(file_path)
+
+        self.assertTrue(result.syntax_valid and result.imports_valid)
+        self.assertFalse(result.overall_valid)
+        self.assertEqual(
+            result.builtin_errors,
+            [
+                "Python 2 builtin cmp used at line 8",
+                "Python 2 builtin reduce used at line 8",
+                "Python 2 builtin xrange used at line 8",
+                "Python 2 builtin unichr used at line 14",
+                "Python 2 builtin raw_input used at line 16",
+            ],
+        )
+        self.assertEqual(self.validator.get_summary()["builtin_errors"], 1)
+
+    def test_validate_directory_in_pool(self):
+        """Test that pool validation matches serial validation."""
+        self.create_test_file("valid.py", "import os\nfrom helper import run")
+        self.create_test_file("helper.py", "def run(): pass")
+        self.create_test_file("missing.py", "from helper import walk")
+        self.create_test_file("invalid.py", "def broken(\npass")
+        serial = ConvertedCodeValidator()
+        serial.validate_directory(self.temp_dir)
+
+        streamed = list(
+            self.validator.iter_validate_directory(
+                self.temp_dir, {os.path.join(self.temp_dir, "valid.py"): "import os"},
+                workers=2,
+            )
+        )
+
+        self.assertEqual(len(streamed), 4)
+        self.assertEqual(self.validator.get_summary(), serial.get_summary())
+        errors = {os.path.basename(r.file_path): r.import_errors for r in streamed}
+        self.assertEqual(errors["missing.py"], ["Cannot import name walk from helper"])
+        # The workers' imports make it into this validator's graph
+        helper = os.path.join(self.temp_dir, "helper.py")
+        self.assertEqual(
+            self.validator.import_graph.dependents([helper]),
+            {os.path.join(self.temp_dir, "missing.py")},
+        )
+
+        self.validator.revalidate_file(helper)
+        self.assertEqual(self.validator.get_summary()["total"], 4)
+
 
 class TestTestGenerator(unittest.TestCase):
     def setUp(self):
@@ -235,6 +305,129 @@ DATABASE_URL = "sqlite:///test.db"
         self.assertIn("import config", test_content)
         self.assertIn("test_module_imports", test_content)
 
+    def test_same_stem_in_different_packages(self):
+        """Test that same-named modules of different packages get their own tests."""
+        for package in ("core", "utils"):
+            os.makedirs(os.path.join(self.temp_dir, package))
+            self.create_test_file(os.path.join(package, "__init__.py"), "")
+            self.create_test_file(os.path.join(package, "helper.py"), "def run(): pass")
+
+        self.generator.generate_tests_for_directory(self.temp_dir, self.test_dir)
+
+        self.assertEqual(
+            sorted(os.listdir(self.test_dir)),
+            ["test_core.py", "test_core_helper.py", "test_utils.py", "test_utils_helper.py"],
+        )
+        with open(os.path.join(self.test_dir, "test_utils_helper.py")) as f:
+            self.assertIn("from utils import helper", f.read())
+
+    def test_only_changed_apis_are_rewritten(self):
+        """Test that test files are rewritten only when the module API changes."""
+        self.create_test_file("stable.py", "def keep(a): pass")
+        changing = self.create_test_file("changing.py", "def old(a): pass")
+        self.generator.generate_tests_for_directory(self.temp_dir, self.test_dir)
+        stable_test = os.path.join(self.test_dir, "test_stable.py")
+        os.utime(stable_test, ns=(0, 0))
+
+        # A body-only edit keeps the signature
+        self.create_test_file("stable.py", "def keep(a):\n    return a\n")
+        with open(changing, "a") as f:
+            f.write("\ndef new(b): pass\n")
+        generator = ConversionTestGenerator()
+        generator.generate_tests_for_directory(self.temp_dir, self.test_dir)
+
+        self.assertEqual(generator.stats, {"written": 1, "unchanged": 1})
+        self.assertEqual(os.stat(stable_test).st_mtime_ns, 0)
+        with open(os.path.join(self.test_dir, "test_changing.py")) as f:
+            self.assertIn("test_new_exists", f.read())
+        self.assertFalse(any(f.endswith(".tmp") for f in os.listdir(self.test_dir)))
+
+
+class TestParsedModuleCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ParsedModuleCache()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_test_file(self, filename, content):
+        """Create a test Python file."""
+        file_path = os.path.join(self.temp_dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def test_one_read_and_parse_across_consumers(self):
+        """Test that the validator and test generator share one parse."""
+        file_path = self.create_test_file("shapes.py", "import os\ndef area(): pass\n")
+        validator = ConvertedCodeValidator(module_cache=self.cache)
+        generator = ConversionTestGenerator(validator.module_cache)
+
+        self.assertTrue(validator.validate_file(file_path).overall_valid)
+        test_file = generator.generate_test_for_file(
+            file_path, os.path.join(self.temp_dir, "tests")
+        )
+
+        self.assertIsNotNone(test_file)
+        self.assertEqual(self.cache.stats["reads"], 1)
+        self.assertEqual(self.cache.stats["parses"], 1)
+        # Import and builtin checks, then the test generator
+        self.assertEqual(self.cache.stats["hits"], 3)
+
+    def test_changed_files_are_parsed_again(self):
+        """Test that only content changes cause a new parse."""
+        file_path = self.create_test_file("module.py", "x = 1\n")
+        first = self.cache.get(file_path)
+
+        # Same content, new mtime: read again, not parsed again
+        os.utime(file_path, ns=(0, first.mtime_ns + 10**9))
+        self.assertIs(self.cache.get(file_path), first)
+        self.assertEqual(self.cache.stats["parses"], 1)
+
+        with open(file_path, "w") as f:
+            f.write("x = (\n")
+        changed = self.cache.get(file_path)
+        self.assertIsNone(changed.tree)
+        self.assertIsInstance(changed.error, SyntaxError)
+        self.assertEqual(self.cache.stats["parses"], 2)
+
+        # Source in memory with the same content as the cached entry
+        self.assertIs(self.cache.get(file_path, "x = (\n"), changed)
+
+    def test_files_are_decoded_by_coding_cookie(self):
+        """Test that non-UTF-8 sources are decoded and undecodable ones reported."""
+        file_path = os.path.join(self.temp_dir, "latin.py")
+        with open(file_path, "wb") as f:
+            f.write(b"# -*- coding: latin-1 -*-\r\nname = '\xe9t\xe9'\r\n")
+        validator = ConvertedCodeValidator(module_cache=self.cache)
+
+        self.assertEqual(validator.validate_syntax(file_path), (True, ""))
+        self.assertIn("name = 'été'\n", self.cache.get(file_path).source)
+
+        with open(file_path, "wb") as f:
+            f.write(b"name = '\xe9t\xe9'\n")
+        module = self.cache.get(file_path)
+        self.assertIsNone(module.tree)
+        self.assertIsInstance(module.error, SyntaxError)
+        self.assertFalse(validator.validate_syntax(file_path)[0])
+
+    def test_eviction_by_source_bytes(self):
+        """Test that least recently used entries go first when over budget."""
+        cache = ParsedModuleCache(max_bytes=25)
+        cache.get("a.py", "a = 1\n" * 2)
+        cache.get("b.py", "b = 1\n" * 2)
+        cache.get("a.py", "a = 1\n" * 2)
+        cache.get("c.py", "c = 1\n" * 2)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.total_bytes, 24)
+        self.assertEqual(cache.stats["evictions"], 1)
+        cache.get("a.py", "a = 1\n" * 2)
+        self.assertEqual(cache.stats["parses"], 3)
+
 
 if __name__ == "__main__":
     unittest.main()
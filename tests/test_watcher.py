@@ -0,0 +1,155 @@
+import unittest
+import tempfile
+import os
+import shutil
+import sys
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from converter.mirror import MirrorConverter
+from converter.watcher import FileWatcher, WatchSession
+from tester.validator import ConvertedCodeValidator
+
+
+class TestWatchSession(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.validator = ConvertedCodeValidator()
+        self.session = WatchSession(
+            self.temp_dir, validator=self.validator, backup=False
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def create_test_file(self, filename, content):
+        """Create a test Python file."""
+        file_path = os.path.join(self.temp_dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def test_changed_file_is_converted_and_validated(self):
+        """Test converting and validating a single changed file in place."""
+        file_path = self.create_test_file("module.py", 'import os\nprint "hi"\n')
+
+        result = self.session.process_file(file_path)
+
+        self.assertTrue(result.success)
+        with open(file_path, "r") as f:
+            self.assertEqual(f.read(), 'import os\nprint("hi")\n')
+        self.assertEqual(len(self.validator.results), 1)
+        self.assertTrue(self.validator.results[0].overall_valid)
+
+    def test_own_write_is_ignored(self):
+        """Test that the event caused by writing the converted file is skipped."""
+        file_path = self.create_test_file("module.py", 'print "a", 1\n')
+
+        self.session.process_file(file_path)
+        second = self.session.process_file(file_path)
+
+        self.assertIsNone(second)
+        with open(file_path, "r") as f:
+            self.assertEqual(f.read(), 'print(("a", 1))\n')
+
+    def test_revalidation_replaces_earlier_result(self):
+        """Test that editing a file again does not duplicate validation results."""
+        file_path = self.create_test_file("module.py", 'print "one"\n')
+        self.session.process_file(file_path)
+        self.create_test_file("module.py", 'print "two"\n')
+        self.session.process_file(file_path)
+
+        self.assertEqual(self.validator.get_summary()["total"], 1)
+
+    def test_output_directory(self):
+        """Test writing converted files into a mirror directory."""
+        output_dir = os.path.join(self.temp_dir, "out")
+        session = WatchSession(self.temp_dir, output_dir=output_dir)
+        file_path = self.create_test_file("module.py", 'print "hi"\n')
+
+        session.process_file(file_path)
+
+        with open(os.path.join(output_dir, "module.py"), "r") as f:
+            self.assertEqual(f.read(), 'print("hi")\n')
+        with open(file_path, "r") as f:
+            self.assertEqual(f.read(), 'print "hi"\n')
+
+    def test_output_directory_built_by_mirror(self):
+        """Test that files hardlinked by a mirror run are not written through."""
+        source_dir = os.path.join(self.temp_dir, "src")
+        output_dir = os.path.join(self.temp_dir, "out")
+        os.makedirs(source_dir)
+        file_path = os.path.join(source_dir, "a.py")
+        with open(file_path, "w") as f:
+            f.write("x = 1\n")
+        MirrorConverter().convert_tree(source_dir, output_dir)
+        # Edited in place, so the mirror's hardlink sees the edit too
+        with open(file_path, "w") as f:
+            f.write('print "hi"\n')
+
+        WatchSession(source_dir, output_dir=output_dir).process_file(file_path)
+
+        with open(os.path.join(output_dir, "a.py"), "r") as f:
+            self.assertEqual(f.read(), 'print("hi")\n')
+        with open(file_path, "r") as f:
+            self.assertEqual(f.read(), 'print "hi"\n')
+
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.changed = []
+        self.event = threading.Event()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def on_change(self, path):
+        self.changed.append(path)
+        self.event.set()
+
+    def check_backend(self, use_inotify):
+        watcher = FileWatcher(
+            self.temp_dir,
+            self.on_change,
+            debounce=0.2,
+            use_inotify=use_inotify,
+            poll_interval=0.1,
+        )
+        watcher.start()
+        try:
+            file_path = os.path.join(self.temp_dir, "module.py")
+            # A burst of writes should produce a single callback
+            for i in range(5):
+                with open(file_path, "w") as f:
+                    f.write(f"x = {i}\n")
+                time.sleep(0.01)
+            with open(os.path.join(self.temp_dir, "notes.txt"), "w") as f:
+                f.write("ignored\n")
+
+            self.assertTrue(self.event.wait(5), "No change was reported")
+            time.sleep(0.5)
+        finally:
+            watcher.stop()
+
+        self.assertEqual(self.changed, [file_path])
+
+    def test_polling_backend(self):
+        """Test change detection by polling."""
+        self.check_backend(use_inotify=False)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_backend(self):
+        """Test change detection with inotify."""
+        self.check_backend(use_inotify=True)
+
+
+if __name__ == "__main__":
+    unittest.main()